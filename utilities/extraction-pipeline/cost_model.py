@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+BMAD Extraction Cost Model
+Predicts the duration and I/O volume of extraction plan operations from the
+per-operation timings recorded in past executions' run logs
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from execution_log import iter_log_records
+
+DEFAULT_LOG_DIR = ".ai/execution-logs"
+
+# Costs used for operation types with no recorded executions: (fixed ms, ms per byte written)
+DEFAULT_COSTS: Dict[str, Tuple[float, float]] = {
+    'ADD': (1.0, 1e-5),
+    'CREATE': (1.0, 1e-5),
+    'MODIFY': (1.5, 2e-5),        # The whole file is read and rewritten
+    'DELETE': (0.5, 0.0),
+    'RESTRUCTURE': (0.1, 0.0),    # Not implemented by the executor; fails immediately
+    'BACKUP': (2.0, 2e-5),        # Copies every existing target before the operations run
+}
+UNKNOWN_COST = (1.0, 1e-5)
+
+
+@dataclass
+class OperationCost:
+    """Linear cost of one operation type: fixed_ms + ms_per_byte * bytes written"""
+    fixed_ms: float
+    ms_per_byte: float
+    samples: int = 0  # Recorded operations the cost was fitted to; 0 for the defaults
+    
+    def predict(self, bytes_written: int) -> float:
+        return self.fixed_ms + self.ms_per_byte * bytes_written
+
+
+@dataclass
+class OperationEstimate:
+    """Predicted cost of one operation"""
+    operation_id: str
+    operation: str
+    target: str
+    target_bytes: int   # Current size of the target, 0 if it does not exist
+    bytes_read: int
+    bytes_written: int
+    duration_ms: float
+    calibrated: bool
+
+
+@dataclass
+class PlanEstimate:
+    """Predicted cost of executing a plan"""
+    operations: List[OperationEstimate] = field(default_factory=list)
+    
+    @property
+    def duration_ms(self) -> float:
+        return sum(op.duration_ms for op in self.operations)
+    
+    @property
+    def bytes_read(self) -> int:
+        return sum(op.bytes_read for op in self.operations)
+    
+    @property
+    def bytes_written(self) -> int:
+        return sum(op.bytes_written for op in self.operations)
+    
+    @property
+    def calibrated(self) -> bool:
+        return bool(self.operations) and all(op.calibrated for op in self.operations)
+
+
+class CostModel:
+    """
+    Per-operation-type cost model calibrated from run logs
+    
+    Each operation type gets a least-squares fit of duration against bytes
+    written over its successful recorded operations, so the prediction for
+    a plan scales with the content it adds and with the size of the files
+    it rewrites or backs up. Types without records use DEFAULT_COSTS.
+    """
+    
+    def __init__(self, costs: Optional[Dict[str, OperationCost]] = None):
+        self.costs = costs or {}
+    
+    @classmethod
+    def from_execution_logs(cls, log_dir: str = DEFAULT_LOG_DIR, max_logs: int = 50) -> "CostModel":
+        """Calibrate from the max_logs most recent run logs in log_dir"""
+        log_path = Path(log_dir)
+        run_logs = sorted(log_path.glob("*-run-log.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True) \
+            if log_path.is_dir() else []
+        return cls.from_records(record for run_log in run_logs[:max_logs] for record in iter_log_records(str(run_log)))
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "CostModel":
+        samples: Dict[str, List[Tuple[int, float]]] = {}
+        for record in records:
+            if record.get('event') == 'operation' and record.get('outcome') == 'success':
+                samples.setdefault(record['operation'], []).append(
+                    (record.get('bytes_written', 0), record['duration_ms']))
+        return cls({operation: _fit(points) for operation, points in samples.items()})
+    
+    @property
+    def samples(self) -> int:
+        return sum(cost.samples for cost in self.costs.values())
+    
+    def cost(self, operation: str) -> OperationCost:
+        operation = operation.upper()
+        if operation in self.costs:
+            return self.costs[operation]
+        return OperationCost(*DEFAULT_COSTS.get(operation, UNKNOWN_COST))
+    
+    def estimate_operation(self, op: Dict, operation_id: str) -> OperationEstimate:
+        """Predict one parsed or generated plan operation against the current state of its target"""
+        op_type = op.get('operation', 'UNKNOWN').upper()
+        target = op.get('target_location', '')
+        target_bytes = _file_size(target)
+        bytes_read = bytes_written = 0
+        
+        if op_type in ('ADD', 'CREATE'):
+            bytes_written = len(op.get('content_to_add', '').encode('utf-8'))
+            if op_type == 'ADD' and target_bytes and bytes_written:
+                bytes_written += 1  # Appended after a newline
+        elif op_type == 'MODIFY' and target_bytes:
+            bytes_read = target_bytes
+            current = len(op.get('current_content', '').encode('utf-8'))
+            proposed = len(op.get('proposed_content', '').encode('utf-8'))
+            bytes_written = max(target_bytes - current + proposed, 0)
+        
+        cost = self.cost(op_type)
+        return OperationEstimate(operation_id, op_type, target, target_bytes, bytes_read, bytes_written,
+                                 cost.predict(bytes_written), cost.samples > 0)
+    
+    def estimate_backups(self, operations: List[Dict]) -> OperationEstimate:
+        """Predict the backup copy of every existing target, as the executor makes before running"""
+        copied = sum(_file_size(op.get('target_location', '')) for op in operations)
+        cost = self.cost('BACKUP')
+        return OperationEstimate('backup', 'BACKUP', '', copied, copied, copied,
+                                 cost.predict(copied), cost.samples > 0)
+    
+    def estimate_plan(self, operations: List[Dict], prefix: str = "op") -> PlanEstimate:
+        """Predict a plan's operations in execution order, including the backups taken first"""
+        estimate = PlanEstimate([self.estimate_backups(operations)])
+        for position, op in enumerate(operations, 1):
+            operation_id = f"{prefix}-{op.get('operation_number', position)}"
+            estimate.operations.append(self.estimate_operation(op, operation_id))
+        return estimate
+
+
+def _fit(points: List[Tuple[int, float]]) -> OperationCost:
+    """Least-squares line through (bytes, ms), clamped so neither coefficient is negative"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance if variance else 0.0
+    if slope <= 0:
+        return OperationCost(mean_y, 0.0, n)
+    intercept = mean_y - slope * mean_x
+    if intercept < 0:
+        # Force the line through the origin instead
+        slope = sum(x * y for x, y in points) / sum(x * x for x, _ in points)
+        intercept = 0.0
+    return OperationCost(intercept, slope, n)
+
+
+def _file_size(path: str) -> int:
+    if not path:
+        return 0
+    try:
+        return os.stat(path).st_size if os.path.isfile(path) else 0
+    except OSError:
+        return 0
+
+
+def format_bytes(size: float) -> str:
+    if size < 1024:
+        return f"{size:.0f} bytes"
+    for unit in ('KB', 'MB', 'GB'):
+        size /= 1024
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}"
+
+
+def format_duration(duration_ms: float) -> str:
+    if duration_ms < 10:
+        return f"{duration_ms:.1f} ms"
+    if duration_ms < 1000:
+        return f"{duration_ms:.0f} ms"
+    seconds = duration_ms / 1000
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes} min"
@@ -9,30 +9,43 @@ import sys
 import json
 import hashlib
 import shutil
+import time
 import datetime
 import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+UTILITIES_DIR = Path(__file__).resolve().parent.parent
+if str(UTILITIES_DIR) not in sys.path:
+    sys.path.insert(0, str(UTILITIES_DIR))
+from instrumentation import annotate, count, span, timed
+
+from cost_model import CostModel, DEFAULT_LOG_DIR, PlanEstimate, format_bytes, format_duration
+from execution_log import ExecutionLogger, iter_log_records
+
 class ExtractionPlanExecutor:
     """Executes extraction plans with safety checks and logging"""
     
-    def __init__(self, plan_file: str):
+    def __init__(self, plan_file: str, dry_run: bool = False):
         self.plan_file = Path(plan_file)
+        self.dry_run = dry_run  # Only parse, validate and simulate; no file is created or changed
         self.backup_dir = Path(".ai/backups")
-        self.execution_logs_dir = Path(".ai/execution-logs")
+        self.execution_logs_dir = Path(DEFAULT_LOG_DIR)
         
         # Create necessary directories
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
-        self.execution_logs_dir.mkdir(parents=True, exist_ok=True)
+        if not dry_run:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            self.execution_logs_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate timestamp for this execution
         self.timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.execution_id = f"{self.plan_file.stem}_{self.timestamp}"
         
-        # Initialize logging
+        # Initialize logging: structured records stream to the run log, the Markdown log is a summary
         self.log_file = self.execution_logs_dir / f"{self.execution_id}-execution-log.md"
-        self.log_entries = []
+        self.run_log_file = self.execution_logs_dir / f"{self.execution_id}-run-log.jsonl"
+        self.logger = ExecutionLogger(None if dry_run else str(self.run_log_file))
+        self._bytes_written = 0  # Bytes written by the operation currently executing
         
     def parse_plan_file(self) -> Dict[str, Any]:
         """Parse extraction plan markdown file"""
@@ -83,7 +96,8 @@ class ExtractionPlanExecutor:
         # Process each operation (skip first empty part)
         for i in range(1, len(op_parts), 2):
             op_num = int(op_parts[i])
-            op_content = op_parts[i + 1] if i + 1 < len(op_parts) else ""
+            # The split consumed the Target Location label; restore it so the field is parsed
+            op_content = "**Target Location**:" + (op_parts[i + 1] if i + 1 < len(op_parts) else "")
             
             operation = self._parse_single_operation(op_content, is_safe)
             if operation:
@@ -169,10 +183,12 @@ class ExtractionPlanExecutor:
     
     def create_backups(self, operations: List[Dict[str, Any]]) -> str:
         """Create backups of files that will be modified"""
+        start = time.perf_counter()
         backup_timestamp_dir = self.backup_dir / self.timestamp
         backup_timestamp_dir.mkdir(exist_ok=True)
         
         backed_up_files = []
+        bytes_copied = 0
         
         for op in operations:
             target_location = op.get('target_location', '')
@@ -190,6 +206,7 @@ class ExtractionPlanExecutor:
                 try:
                     shutil.copy2(target_path, backup_path)
                     backed_up_files.append(str(target_path))
+                    bytes_copied += backup_path.stat().st_size
                     self.log(f"✓ Backed up: {target_path} -> {backup_path}")
                 except Exception as e:
                     self.log(f"❌ Backup failed for {target_path}: {e}")
@@ -209,6 +226,9 @@ class ExtractionPlanExecutor:
         rollback_script.chmod(0o755)  # Make executable
         
         self.log(f"✓ Created rollback script: {rollback_script}")
+        # Recorded like an operation so the cost model can calibrate backup time against bytes copied
+        self.logger.operation('backup', 'BACKUP', str(backup_timestamp_dir), 'success',
+                              (time.perf_counter() - start) * 1000, bytes_copied)
         return str(backup_timestamp_dir)
     
     def execute_safe_operations(self, safe_operations: List[Dict[str, Any]]) -> int:
@@ -218,17 +238,9 @@ class ExtractionPlanExecutor:
         self.log("### Executing Safe Operations")
         
         for op in safe_operations:
-            try:
-                self.log(f"Executing operation {op.get('operation_number', '?')}: {op.get('operation', 'UNKNOWN')}")
-                
-                if self._execute_single_operation(op):
-                    success_count += 1
-                    self.log(f"✅ Operation {op.get('operation_number', '?')} completed successfully")
-                else:
-                    self.log(f"❌ Operation {op.get('operation_number', '?')} failed")
-                    
-            except Exception as e:
-                self.log(f"❌ Error executing operation {op.get('operation_number', '?')}: {e}")
+            self.log(f"Executing operation {op.get('operation_number', '?')}: {op.get('operation', 'UNKNOWN')}")
+            if self._run_operation(op, 'safe'):
+                success_count += 1
         
         return success_count
     
@@ -238,27 +250,50 @@ class ExtractionPlanExecutor:
         
         self.log("### Executing Approved Operations")
         
-        approved_ops = [op for op in risky_operations if op.get('approval_status', '').upper() == 'APPROVED']
+        approved_ops = self._approved_operations(risky_operations)
         
         if not approved_ops:
             self.log("No approved operations to execute")
             return 0
         
         for op in approved_ops:
-            try:
-                self.log(f"Executing approved operation {op.get('operation_number', '?')}: {op.get('operation', 'UNKNOWN')}")
-                
-                if self._execute_single_operation(op):
-                    success_count += 1
-                    self.log(f"✅ Operation {op.get('operation_number', '?')} completed successfully")
-                else:
-                    self.log(f"❌ Operation {op.get('operation_number', '?')} failed")
-                    
-            except Exception as e:
-                self.log(f"❌ Error executing operation {op.get('operation_number', '?')}: {e}")
+            self.log(f"Executing approved operation {op.get('operation_number', '?')}: {op.get('operation', 'UNKNOWN')}")
+            if self._run_operation(op, 'risky'):
+                success_count += 1
         
         return success_count
     
+    def _run_operation(self, op: Dict[str, Any], kind: str) -> bool:
+        """Execute one operation and record its duration, bytes written and outcome in the run log"""
+        self._bytes_written = 0
+        error = None
+        start = time.perf_counter()
+        try:
+            succeeded = self._execute_single_operation(op)
+        except Exception as e:
+            succeeded = False
+            error = str(e)
+        duration_ms = (time.perf_counter() - start) * 1000
+        
+        if succeeded:
+            self.log(f"✅ Operation {op.get('operation_number', '?')} completed successfully")
+        elif error:
+            self.log(f"❌ Error executing operation {op.get('operation_number', '?')}: {error}")
+        else:
+            self.log(f"❌ Operation {op.get('operation_number', '?')} failed")
+        
+        self.logger.operation(
+            f"{kind}-{op.get('operation_number', '?')}",
+            op.get('operation', 'UNKNOWN').upper(),
+            op.get('target_location', ''),
+            'success' if succeeded else ('error' if error else 'failed'),
+            duration_ms,
+            self._bytes_written,
+            error
+        )
+        return succeeded
+    
+    @timed('execute_operation', document=lambda self, operation: operation.get('target_location'))
     def _execute_single_operation(self, operation: Dict[str, Any]) -> bool:
         """Execute a single operation"""
         op_type = operation.get('operation', '').upper()
@@ -269,6 +304,8 @@ class ExtractionPlanExecutor:
             return False
         
         target_path = Path(target_location)
+        annotate(operation=op_type, operation_number=operation.get('operation_number'))
+        count(f"operations_{op_type.lower() or 'unknown'}")
         
         try:
             if op_type in ['ADD', 'CREATE']:
@@ -302,11 +339,13 @@ class ExtractionPlanExecutor:
             # Create new file
             with open(target_path, 'w', encoding='utf-8') as f:
                 f.write(content_to_add)
+            self._bytes_written += len(content_to_add.encode('utf-8'))
             self.log(f"✓ Created file: {target_path}")
         else:
             # Append to existing file
             with open(target_path, 'a', encoding='utf-8') as f:
                 f.write('\n' + content_to_add)
+            self._bytes_written += len(content_to_add.encode('utf-8')) + 1
             self.log(f"✓ Added content to: {target_path}")
         
         return True
@@ -330,6 +369,7 @@ class ExtractionPlanExecutor:
             
             with open(target_path, 'w', encoding='utf-8') as f:
                 f.write(updated_content)
+            self._bytes_written += len(updated_content.encode('utf-8'))
             
             self.log(f"✓ Modified content in: {target_path}")
             return True
@@ -359,11 +399,8 @@ class ExtractionPlanExecutor:
         return False
     
     def log(self, message: str):
-        """Add entry to execution log"""
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.log_entries.append(log_entry)
-        print(log_entry)
+        """Print a message and add it to the run log"""
+        self.logger.message(message)
     
     def save_execution_log(self, plan_data: Dict[str, Any], backup_dir: str, 
                           safe_success: int, risky_success: int) -> str:
@@ -381,27 +418,77 @@ class ExtractionPlanExecutor:
 - **Risky Operations**: {len(plan_data['risky_operations'])} ({risky_success} successful)
 
 ## Execution Log
+Structured run log: {self.run_log_file}
+
 """
         
-        for entry in self.log_entries:
-            log_content += f"{entry}\n"
-        
-        log_content += f"\n## Summary\n"
-        log_content += f"- Total operations executed: {safe_success + risky_success}\n"
-        log_content += f"- Safe operations success rate: {safe_success}/{len(plan_data['safe_operations'])}\n"
-        log_content += f"- Risky operations success rate: {risky_success}/{len(plan_data['risky_operations'])}\n"
+        summary = f"\n## Summary\n"
+        summary += f"- Total operations executed: {safe_success + risky_success}\n"
+        summary += f"- Safe operations success rate: {safe_success}/{len(plan_data['safe_operations'])}\n"
+        summary += f"- Risky operations success rate: {risky_success}/{len(plan_data['risky_operations'])}\n"
         
+        # Entries are streamed from the run log rather than held in memory
+        self.logger.flush()
         with open(self.log_file, 'w', encoding='utf-8') as f:
             f.write(log_content)
+            if self.run_log_file.exists():
+                for record in iter_log_records(str(self.run_log_file)):
+                    timestamp = record['ts'][:19].replace('T', ' ')
+                    if record['event'] == 'message':
+                        f.write(f"[{timestamp}] {record['message']}\n")
+                    elif record['event'] == 'operation':
+                        f.write(f"[{timestamp}] {record['operation_id']} {record['operation']} {record['target']}: "
+                                f"{record['outcome']} ({record['duration_ms']:.1f} ms, {record['bytes_written']} bytes)\n")
+            f.write(summary)
         
         return str(self.log_file)
     
+    def simulate_plan(self, plan_data: Dict[str, Any], cost_model: Optional[CostModel] = None) -> PlanEstimate:
+        """
+        Predict the duration and I/O volume of executing the plan without touching any file
+        
+        Only the operations a real run would execute are simulated: safe
+        operations and approved risky ones, preceded by the backups. Costs
+        come from the run logs of past executions unless cost_model is given.
+        """
+        if cost_model is None:
+            cost_model = CostModel.from_execution_logs(str(self.execution_logs_dir))
+        
+        operations = self._operations_to_execute(plan_data)
+        estimate = PlanEstimate([cost_model.estimate_backups(operations)])
+        for op in operations:
+            # Same ids as the run log records, so predictions can be compared with actuals
+            operation_id = f"{'safe' if op.get('is_safe') else 'risky'}-{op.get('operation_number', '?')}"
+            estimate.operations.append(cost_model.estimate_operation(op, operation_id))
+        return estimate
+    
+    def _approved_operations(self, risky_operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [op for op in risky_operations if op.get('approval_status', '').upper() == 'APPROVED']
+    
+    def _operations_to_execute(self, plan_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return plan_data['safe_operations'] + self._approved_operations(plan_data['risky_operations'])
+    
+    @timed('execute_plan', document=lambda self: str(self.plan_file))
     def execute_plan(self) -> Dict[str, Any]:
-        """Main execution method"""
+        """Main execution method; the run log is flushed and closed however the run ends"""
+        self.logger.event('run_start', plan_file=str(self.plan_file), execution_id=self.execution_id)
+        try:
+            result = self._execute_plan()
+        except Exception as e:
+            self.logger.event('run_end', success=False, error=str(e))
+            raise
+        else:
+            self.logger.event('run_end', success=result['success'])
+            return result
+        finally:
+            self.logger.close()
+    
+    def _execute_plan(self) -> Dict[str, Any]:
         self.log(f"Starting execution of extraction plan: {self.plan_file}")
         
         # Phase 1: Parse and validate plan
-        plan_data = self.parse_plan_file()
+        with span('parse_plan', self.plan_file):
+            plan_data = self.parse_plan_file()
         self.log(f"Parsed plan with {len(plan_data['safe_operations'])} safe and {len(plan_data['risky_operations'])} risky operations")
         
         # Phase 2: Validate plan
@@ -412,22 +499,20 @@ class ExtractionPlanExecutor:
             return {
                 'success': False,
                 'issues': issues,
-                'log_file': str(self.log_file)
+                'log_file': str(self.run_log_file)
             }
         
         # Phase 3: Create backups
-        all_operations = plan_data['safe_operations'] + [
-            op for op in plan_data['risky_operations'] 
-            if op.get('approval_status', '').upper() == 'APPROVED'
-        ]
-        backup_dir = self.create_backups(all_operations)
+        with span('create_backups', self.plan_file):
+            backup_dir = self.create_backups(self._operations_to_execute(plan_data))
         
         # Phase 4: Execute operations
         safe_success = self.execute_safe_operations(plan_data['safe_operations'])
         risky_success = self.execute_approved_operations(plan_data['risky_operations'])
         
         # Phase 5: Generate execution log
-        log_file = self.save_execution_log(plan_data, backup_dir, safe_success, risky_success)
+        with span('save_execution_log', self.plan_file):
+            log_file = self.save_execution_log(plan_data, backup_dir, safe_success, risky_success)
         
         self.log("✅ Extraction plan execution completed")
         
@@ -436,7 +521,8 @@ class ExtractionPlanExecutor:
             'safe_operations_executed': safe_success,
             'risky_operations_executed': risky_success,
             'backup_directory': backup_dir,
-            'log_file': log_file
+            'log_file': log_file,
+            'run_log_file': str(self.run_log_file)
         }
 
 def main():
@@ -446,21 +532,40 @@ def main():
     parser = argparse.ArgumentParser(description='Execute BMAD extraction plan')
     parser.add_argument('plan_file', help='Path to extraction plan file')
     parser.add_argument('--dry-run', action='store_true', 
-                       help='Validate plan without executing operations')
+                       help='Validate plan and predict its duration and I/O without touching any file')
+    parser.add_argument('--log-dir', default=DEFAULT_LOG_DIR,
+                       help='Execution logs whose recorded timings calibrate the dry-run prediction')
     
     args = parser.parse_args()
     
     try:
-        executor = ExtractionPlanExecutor(args.plan_file)
+        executor = ExtractionPlanExecutor(args.plan_file, dry_run=args.dry_run)
         
         if args.dry_run:
             plan_data = executor.parse_plan_file()
             issues = executor.validate_plan(plan_data)
+            cost_model = CostModel.from_execution_logs(args.log_dir)
+            estimate = executor.simulate_plan(plan_data, cost_model)
             
             print(f"✅ Plan validation completed")
             print(f"   Safe operations: {len(plan_data['safe_operations'])}")
             print(f"   Risky operations: {len(plan_data['risky_operations'])}")
             
+            print(f"\n📊 Predicted execution (nothing was written):")
+            for op in estimate.operations:
+                if op.operation == 'BACKUP' and not op.bytes_written:
+                    continue
+                print(f"   {op.operation_id:<10} {op.operation:<12} {op.target or 'existing targets':<40} "
+                      f"{format_bytes(op.bytes_written):>10} written  {format_duration(op.duration_ms):>10}")
+            print(f"   I/O volume: {format_bytes(estimate.bytes_read)} read, {format_bytes(estimate.bytes_written)} written")
+            print(f"   Duration: {format_duration(estimate.duration_ms)}")
+            if cost_model.samples:
+                print(f"   Calibrated from {cost_model.samples} recorded operations in {args.log_dir}"
+                      f"{'' if estimate.calibrated else '; default costs for operation types never run'}")
+            else:
+                print(f"   ⚠️ No recorded executions in {args.log_dir}; using default costs")
+            print()
+            
             if issues:
                 print(f"❌ Issues found:")
                 for issue in issues:
@@ -476,6 +581,7 @@ def main():
                 print(f"   Risky operations: {result['risky_operations_executed']}")
                 print(f"   Backup directory: {result['backup_directory']}")
                 print(f"   Execution log: {result['log_file']}")
+                print(f"   Run log: {result['run_log_file']}")
             else:
                 print(f"❌ Extraction plan execution failed")
                 for issue in result.get('issues', []):
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+BMAD Extraction Execution Log
+Buffered structured JSONL run log for extraction plan executions
+"""
+
+import os
+import json
+import time
+import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class ExecutionLogger:
+    """
+    Appends structured records to a JSONL run log in batches
+    
+    Records are buffered and written when flush_every records are pending
+    or flush_interval seconds have passed since the last write, so a crash
+    loses at most the last few records and memory stays constant however
+    many operations a plan has. Each record is one JSON object per line;
+    the file is created on the first write. With log_path None, messages
+    are only echoed and nothing is written, as for dry runs.
+    """
+    
+    def __init__(self, log_path: Optional[str], flush_every: int = 20, flush_interval: float = 1.0, echo: bool = True):
+        self.log_path = Path(log_path) if log_path else None
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.echo = echo
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._file = None
+    
+    def message(self, message: str, level: str = "info"):
+        """Record a free-form status message"""
+        timestamp = datetime.datetime.now()
+        if self.echo:
+            print(f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+        self._append({'ts': timestamp.isoformat(timespec='milliseconds'), 'event': 'message',
+                      'level': level, 'message': message})
+    
+    def operation(
+        self,
+        operation_id: str,
+        operation: str,
+        target: str,
+        outcome: str,
+        duration_ms: float,
+        bytes_written: int,
+        error: Optional[str] = None
+    ):
+        """Record the result of one plan operation"""
+        record = {
+            'ts': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'event': 'operation',
+            'operation_id': operation_id,
+            'operation': operation,
+            'target': target,
+            'outcome': outcome,
+            'duration_ms': round(duration_ms, 3),
+            'bytes_written': bytes_written,
+        }
+        if error:
+            record['error'] = error
+        self._append(record)
+    
+    def event(self, event: str, **fields: Any):
+        """Record any other structured event, e.g. run start and end"""
+        self._append({'ts': datetime.datetime.now().isoformat(timespec='milliseconds'), 'event': event, **fields})
+    
+    def _append(self, record: Dict[str, Any]):
+        if self.log_path is None:
+            return
+        self._buffer.append(json.dumps(record, ensure_ascii=False, default=str))
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+    
+    def flush(self):
+        if self._buffer:
+            if self._file is None:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.log_path, 'a', encoding='utf-8')
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._file.flush()
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+    
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def iter_log_records(log_path: str) -> Iterator[Dict[str, Any]]:
+    """Read a run log back, skipping a line cut short by a crash"""
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
@@ -13,11 +13,18 @@ import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 
+from cost_model import CostModel, DEFAULT_LOG_DIR, format_bytes, format_duration
+
+PRD_PROCESSOR_DIR = Path(__file__).resolve().parent.parent / 'prd-template-processor'
+
 class ExtractionPlanGenerator:
     """Generates extraction plans for BMAD data ingestion workflow"""
     
-    def __init__(self, source_document: str, target_directory: str = ".ai/extraction-plans"):
+    def __init__(self, source_document: str, target_directory: str = ".ai/extraction-plans",
+                 section: Optional[str] = None, corpus_dir: Optional[str] = None):
         self.source_document = Path(source_document)
+        self.section = section  # Heading path or "#anchor"; the whole document when None
+        self.corpus_dir = corpus_dir  # Checked for near-duplicates of the source when set
         self.target_directory = Path(target_directory)
         self.target_directory.mkdir(parents=True, exist_ok=True)
         
@@ -25,6 +32,7 @@ class ExtractionPlanGenerator:
         document_name = self.source_document.stem
         self.plan_file = self.target_directory / f"{document_name}-extraction-plan.md"
         self.backup_dir = Path(".ai/backups")
+        self.execution_logs_dir = DEFAULT_LOG_DIR
         
     def analyze_source_document(self) -> Dict[str, Any]:
         """Analyze source document and identify key data elements"""
@@ -32,8 +40,11 @@ class ExtractionPlanGenerator:
             raise FileNotFoundError(f"Source document not found: {self.source_document}")
         
         try:
-            with open(self.source_document, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if self.section:
+                content = self._read_section()
+            else:
+                with open(self.source_document, 'r', encoding='utf-8') as f:
+                    content = f.read()
         except Exception as e:
             raise Exception(f"Failed to read source document: {e}")
         
@@ -44,11 +55,48 @@ class ExtractionPlanGenerator:
             'key_elements': self._identify_key_elements(content),
             'content_length': len(content),
             'line_count': len(content.split('\n')),
-            'sections': self._identify_sections(content)
+            'sections': self._identify_sections(content),
+            'redundant_content': self._find_redundant_content() if self.corpus_dir else []
         }
         
         return analysis
     
+    def _read_section(self) -> str:
+        """Read only the requested section through the persistent section index"""
+        if str(PRD_PROCESSOR_DIR) not in sys.path:
+            sys.path.insert(0, str(PRD_PROCESSOR_DIR))
+        from section_index import get_section
+        
+        content = get_section(str(self.source_document), self.section)
+        if content is None:
+            raise ValueError(f"Section not found: {self.section}")
+        return content
+    
+    def _find_redundant_content(self) -> List[Dict[str, Any]]:
+        """Find sections of the source that near-duplicate content kept elsewhere in the corpus"""
+        if str(PRD_PROCESSOR_DIR) not in sys.path:
+            sys.path.insert(0, str(PRD_PROCESSOR_DIR))
+        from near_duplicates import NearDuplicateDetector
+        
+        detector = NearDuplicateDetector()
+        detector.add_corpus([self.corpus_dir])
+        source = self.source_document.resolve()
+        if not any(Path(s.source_file).resolve() == source for s in detector.sections):
+            detector.add_file(str(self.source_document))
+        
+        redundant = []
+        for group in detector.clusters():
+            keep = group[0]
+            for section in group[1:]:
+                if Path(section.source_file).resolve() == source and Path(keep.source_file).resolve() != source:
+                    redundant.append({
+                        'heading': section.heading or '(preamble)',
+                        'anchor': section.anchor,
+                        'duplicate_of': f"{keep.source_file}#{keep.anchor}",
+                        'similarity': detector.similarity(keep, section)
+                    })
+        return redundant
+    
     def _identify_document_type(self, content: str) -> str:
         """Identify the type of document based on content analysis"""
         content_lower = content.lower()
@@ -260,6 +308,12 @@ class ExtractionPlanGenerator:
         for element in analysis['key_elements']:
             plan_content += f"  - {element}\n"
         
+        if analysis.get('redundant_content'):
+            plan_content += "\n## Redundant Content\nSections already present elsewhere in the corpus; skip them during extraction:\n"
+            for item in analysis['redundant_content']:
+                plan_content += (f"  - {item['heading']} (#{item['anchor']}) duplicates "
+                                 f"{item['duplicate_of']} ({item['similarity']:.0%} similar)\n")
+        
         plan_content += "\n## Proposed Extractions\n\n"
         
         # Safe operations section
@@ -314,17 +368,13 @@ python3 utilities/extraction-pipeline/execute_extraction_plan.py {self.plan_file
         return plan_content
     
     def _estimate_completion_time(self, safe_ops: List[Dict], risky_ops: List[Dict]) -> str:
-        """Estimate completion time for operations"""
-        total_ops = len(safe_ops) + len(risky_ops)
-        
-        if total_ops <= 3:
-            return "2-5 minutes"
-        elif total_ops <= 6:
-            return "5-10 minutes"  
-        elif total_ops <= 10:
-            return "10-20 minutes"
-        else:
-            return "20+ minutes"
+        """Estimate execution time from the timings of past executions, assuming every operation is approved"""
+        cost_model = CostModel.from_execution_logs(self.execution_logs_dir)
+        estimate = cost_model.estimate_plan(safe_ops + risky_ops)
+        basis = (f"calibrated from {cost_model.samples} recorded operations" if cost_model.samples
+                 else "default costs, no recorded executions")
+        return (f"{format_duration(estimate.duration_ms)} "
+                f"({format_bytes(estimate.bytes_written)} written; {basis})")
     
     def save_plan_file(self, plan_content: str) -> str:
         """Save extraction plan to file"""
@@ -342,6 +392,8 @@ python3 utilities/extraction-pipeline/execute_extraction_plan.py {self.plan_file
         # Phase 1: Analyze source document
         analysis = self.analyze_source_document()
         print(f"Document type identified: {analysis['document_type']}")
+        if analysis['redundant_content']:
+            print(f"Found {len(analysis['redundant_content'])} sections duplicated elsewhere in the corpus")
         
         # Phase 2: Generate operations
         safe_ops, risky_ops = self.generate_extraction_operations(analysis)
@@ -365,11 +417,15 @@ def main():
     parser.add_argument('source_document', help='Path to source document')
     parser.add_argument('--target-dir', default='.ai/extraction-plans', 
                        help='Target directory for extraction plans')
+    parser.add_argument('--section',
+                       help='Plan extraction of one section only: heading path ("Parent > Child") or "#anchor"')
+    parser.add_argument('--corpus-dir',
+                       help='Flag sections that near-duplicate content in this directory of converted documents')
     
     args = parser.parse_args()
     
     try:
-        generator = ExtractionPlanGenerator(args.source_document, args.target_dir)
+        generator = ExtractionPlanGenerator(args.source_document, args.target_dir, args.section, args.corpus_dir)
         plan_file = generator.generate_extraction_plan()
         
         print(f"\n✅ Extraction plan ready for review:")
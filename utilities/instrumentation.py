@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Pipeline Instrumentation
+Shared timing spans, counters and optional cProfile/tracemalloc profiling for
+the utilities, emitted as JSONL records per stage and document
+
+Instrumentation is off unless configured, either by calling configure() or
+through the environment, which also reaches converter subprocesses and
+worker processes:
+
+    BMAD_TIMINGS=.ai/timings.jsonl    JSONL file that span records are appended to
+    BMAD_PROFILE=cpu,memory           cProfile the process and/or record tracemalloc peaks
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import inspect
+import functools
+import threading
+import statistics
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+TIMINGS_ENV = "BMAD_TIMINGS"
+PROFILE_ENV = "BMAD_PROFILE"
+
+
+class _NullSpan:
+    """Span used while instrumentation is off; entering and leaving it costs next to nothing"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+    
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed stage; written as a JSONL record when it ends"""
+    
+    def __init__(self, instrumentation: "Instrumentation", stage: str, document: Optional[str], fields: Dict[str, Any]):
+        self._instrumentation = instrumentation
+        self.stage = stage
+        self.document = document
+        self.fields = fields
+        self.counters: Counter = Counter()
+        self.child_peak = 0
+    
+    def set(self, **fields):
+        """Attach extra fields to the record, e.g. bytes written"""
+        self.fields.update(fields)
+    
+    def __enter__(self):
+        stack = self._instrumentation._stack()
+        self.parent = stack[-1] if stack else None
+        if self._instrumentation.profile_memory:
+            import tracemalloc
+            if self.parent is not None:
+                # Keep the parent's peak before resetting it for this span
+                self.parent.child_peak = max(self.parent.child_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        cpu = time.process_time() - self._cpu_start
+        self._instrumentation._stack().pop()
+        
+        record = {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'stage': self.stage,
+            'document': self.document,
+            'parent': self.parent.stage if self.parent else None,
+            'duration_ms': round(duration * 1000, 3),
+            'cpu_ms': round(cpu * 1000, 3),
+            'status': 'error' if exc_type else 'ok',
+            'pid': os.getpid(),
+        }
+        if exc_type:
+            record['error'] = exc_type.__name__
+        if self.counters:
+            record['counters'] = dict(self.counters)
+        if self._instrumentation.profile_memory:
+            import tracemalloc
+            peak = max(self.child_peak, tracemalloc.get_traced_memory()[1])
+            record['peak_kb'] = round(peak / 1024, 1)
+            if self.parent is not None:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+        record.update(self.fields)
+        self._instrumentation._write(record)
+        return False
+
+
+class Instrumentation:
+    """
+    Per-process collector of spans and counters
+    
+    Spans nest per thread; each record names its parent stage. Counters are
+    kept for the whole process and attributed to the innermost open span.
+    With profile_cpu, a process-wide cProfile is dumped next to the timings
+    file on close; with profile_memory, each span records its tracemalloc
+    peak.
+    """
+    
+    def __init__(self, timings_file: Optional[str] = None, profile_cpu: bool = False, profile_memory: bool = False):
+        self.timings_file = timings_file
+        self.profile_cpu = profile_cpu
+        self.profile_memory = profile_memory
+        self.counters: Counter = Counter()
+        self.enabled = bool(timings_file or profile_cpu or profile_memory)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._handle = None
+        self._handle_pid = None
+        self._profiler = None
+        
+        if profile_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        if profile_cpu:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+    
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def span(self, stage: str, document: Optional[str] = None, **fields):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, stage, str(document) if document is not None else None, fields)
+    
+    def count(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        self.counters[name] += value
+        stack = self._stack()
+        if stack:
+            stack[-1].counters[name] += value
+    
+    def annotate(self, **fields):
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack:
+            stack[-1].set(**fields)
+    
+    def _write(self, record: Dict[str, Any]):
+        if not self.timings_file:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._handle is None or self._handle_pid != os.getpid():
+                # Forked workers open their own handle; appends of single lines interleave safely
+                directory = os.path.dirname(self.timings_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._handle = open(self.timings_file, 'a', encoding='utf-8', buffering=1)
+                self._handle_pid = os.getpid()
+            self._handle.write(line)
+    
+    def close(self):
+        """Write the process counter totals and the CPU profile, then stop collecting"""
+        if not self.enabled:
+            return
+        if self.counters:
+            self._write({
+                'ts': datetime.now().isoformat(timespec='milliseconds'),
+                'stage': 'process_counters',
+                'pid': os.getpid(),
+                'counters': dict(self.counters),
+            })
+        if self._profiler is not None:
+            self._profiler.disable()
+            base = os.path.splitext(self.timings_file)[0] if self.timings_file else "bmad-profile"
+            self._profiler.dump_stats(f"{base}-{os.getpid()}.prof")
+            self._profiler = None
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+        self.enabled = False
+
+
+_instrumentation = Instrumentation()
+
+
+def configure(timings_file: Optional[str] = None, profile: str = "") -> Instrumentation:
+    """
+    Replace the process-wide instrumentation
+    
+    Args:
+        timings_file: JSONL file for span records, or None to only count
+        profile: Comma-separated "cpu" and/or "memory"
+    """
+    global _instrumentation
+    _instrumentation.close()
+    modes = {mode.strip() for mode in profile.split(',') if mode.strip()}
+    _instrumentation = Instrumentation(timings_file, 'cpu' in modes, 'memory' in modes)
+    return _instrumentation
+
+
+def span(stage: str, document: Optional[str] = None, **fields):
+    """Context manager timing one stage, optionally for one document"""
+    return _instrumentation.span(stage, document, **fields)
+
+
+def count(name: str, value: int = 1):
+    """Increment a counter in the current process and span"""
+    _instrumentation.count(name, value)
+
+
+def annotate(**fields):
+    """Attach fields to the innermost open span of this thread, e.g. outcome or bytes written"""
+    _instrumentation.annotate(**fields)
+
+
+def timed(stage: str, document: Union[str, Callable, None] = None):
+    """
+    Decorator running a function inside a span
+    
+    Args:
+        stage: Stage name of the span
+        document: Name of the parameter holding the document path, or a
+            callable receiving the call's arguments and returning it
+    """
+    def decorator(func):
+        position = None
+        if isinstance(document, str):
+            position = list(inspect.signature(func).parameters).index(document)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _instrumentation.enabled:
+                return func(*args, **kwargs)
+            if callable(document):
+                doc = document(*args, **kwargs)
+            elif position is not None:
+                doc = kwargs.get(document, args[position] if position < len(args) else None)
+            else:
+                doc = None
+            with _instrumentation.span(stage, doc):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_instrumentation() -> Instrumentation:
+    return _instrumentation
+
+
+if os.environ.get(TIMINGS_ENV) or os.environ.get(PROFILE_ENV):
+    configure(os.environ.get(TIMINGS_ENV) or None, os.environ.get(PROFILE_ENV, ""))
+atexit.register(lambda: _instrumentation.close())
+
+
+def summarize_timings(timings_file: str, top: int = 10) -> Dict[str, Any]:
+    """
+    Aggregate a timings file per stage and find the slowest documents
+    
+    Returns:
+        Dictionary with per-stage statistics and the slowest document spans
+    """
+    durations: Dict[str, List[float]] = defaultdict(list)
+    errors: Counter = Counter()
+    documents = []
+    with open(timings_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial last line of an interrupted run
+            if 'duration_ms' not in record:
+                continue
+            durations[record['stage']].append(record['duration_ms'])
+            if record.get('status') == 'error':
+                errors[record['stage']] += 1
+            if record.get('document'):
+                documents.append((record['duration_ms'], record['stage'], record['document']))
+    
+    stages = {}
+    for stage, values in durations.items():
+        values.sort()
+        stages[stage] = {
+            'count': len(values),
+            'total_ms': round(sum(values), 3),
+            'mean_ms': round(statistics.mean(values), 3),
+            'p95_ms': values[min(len(values) - 1, int(len(values) * 0.95))],
+            'max_ms': values[-1],
+            'errors': errors[stage],
+        }
+    documents.sort(reverse=True)
+    return {'stages': stages, 'slowest_documents': documents[:top]}
+
+
+def main():
+    """CLI interface for summarizing timings files"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Summarize JSONL stage timings written by the utilities")
+    parser.add_argument("timings_file", help=f"JSONL file written with {TIMINGS_ENV} set")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest documents to list")
+    
+    args = parser.parse_args()
+    
+    try:
+        summary = summarize_timings(args.timings_file, args.top)
+    except OSError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    print(f"{'Stage':<28} {'Count':>7} {'Total ms':>12} {'Mean ms':>10} {'p95 ms':>10} {'Max ms':>10} {'Errors':>7}")
+    for stage, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['total_ms']):
+        print(f"{stage:<28} {stats['count']:>7} {stats['total_ms']:>12.1f} {stats['mean_ms']:>10.2f} "
+              f"{stats['p95_ms']:>10.2f} {stats['max_ms']:>10.2f} {stats['errors']:>7}")
+    
+    if summary['slowest_documents']:
+        print("\nSlowest documents:")
+        for duration, stage, document in summary['slowest_documents']:
+            print(f"  {duration:10.1f} ms  {stage:<24} {document}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
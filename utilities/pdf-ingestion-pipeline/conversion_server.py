@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+PDF Ingestion Pipeline - Local Conversion Server
+Serves conversions over localhost HTTP from a warm worker pool, so agents no
+longer start two interpreters per conversion
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from convert_pdf import CONVERTED_DIR, get_latest_version_path, get_next_version_path, index_converted_file
+
+CONVERTER_DIR = Path(__file__).resolve().parent.parent / 'pdf-to-md-converter'
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_PORT = 8765
+
+# Per-process converter backend, imported once when a worker starts
+_worker_backend = None
+
+
+def _init_conversion_worker():
+    global _worker_backend
+    if str(CONVERTER_DIR) not in sys.path:
+        sys.path.insert(0, str(CONVERTER_DIR))
+    import convert_pdf_to_md
+    _worker_backend = convert_pdf_to_md
+
+
+def _convert_in_worker(item):
+    pdf_path, output_path = item
+    return _worker_backend.convert_pdf_to_markdown(pdf_path, output_path)
+
+
+def hash_pdf(pdf_path):
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ConversionService:
+    """
+    Converts PDFs on a pool of warm worker processes.
+    
+    Requests are keyed by the PDF's SHA-256: concurrent requests for the
+    same content share one conversion, and content converted earlier is
+    answered with its Markdown path without converting again. Versioned
+    output paths follow convert_pdf.py; conversions of the same PDF path
+    are serialized so version numbers never collide. Only PDFs inside
+    project_root are served, and converted_dir is resolved against it, so
+    results do not depend on the directory the server was started from.
+    """
+    
+    def __init__(self, workers=2, converted_dir=CONVERTED_DIR, project_root=PROJECT_ROOT):
+        self.project_root = Path(project_root).resolve()
+        self.converted_dir = str(self.project_root / converted_dir)
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_conversion_worker)
+        self._lock = threading.Lock()
+        self._in_flight = {}  # PDF hash -> Future of the markdown path
+        self._converted = {}  # PDF hash -> markdown path
+        self._path_locks = {}
+    
+    def resolve_pdf_path(self, pdf_path):
+        """
+        Map a client-supplied PDF path into the project.
+        
+        Args:
+            pdf_path (str): Absolute path, or path relative to the project root
+        
+        Returns:
+            str: PDF path relative to the project root, or None if it lies outside it
+        """
+        resolved = (self.project_root / pdf_path).resolve()
+        try:
+            return str(resolved.relative_to(self.project_root))
+        except ValueError:
+            return None
+    
+    def convert(self, pdf_path, force=False):
+        """
+        Convert a PDF, sharing work with identical concurrent requests.
+        
+        Args:
+            pdf_path (str): PDF path relative to the project root
+            force (bool): Convert even if a conversion already exists
+        
+        Returns:
+            tuple: (markdown_path, pdf_hash, cached)
+        """
+        pdf_hash = hash_pdf(self.project_root / pdf_path)
+        with self._lock:
+            markdown_path = self._converted.get(pdf_hash)
+            if not force and markdown_path and os.path.exists(markdown_path):
+                return markdown_path, pdf_hash, True
+            future = self._in_flight.get(pdf_hash)
+            owner = future is None
+            if owner:
+                future = self._in_flight[pdf_hash] = Future()
+                path_lock = self._path_locks.setdefault(pdf_path, threading.Lock())
+        
+        if not owner:
+            return future.result(), pdf_hash, True
+        
+        try:
+            with path_lock:
+                markdown_path, cached = self._convert_once(pdf_path, force)
+            future.set_result(markdown_path)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[pdf_hash]
+                if future.exception() is None:
+                    self._converted[pdf_hash] = future.result()
+        return markdown_path, pdf_hash, cached
+    
+    def _convert_once(self, pdf_path, force):
+        if not force:
+            existing_path = get_latest_version_path(pdf_path, self.converted_dir)
+            if existing_path and os.path.exists(existing_path):
+                return existing_path, True
+        
+        output_path = get_next_version_path(pdf_path, self.converted_dir)
+        item = (str(self.project_root / pdf_path), output_path)
+        if not self.executor.submit(_convert_in_worker, item).result():
+            raise RuntimeError(f"Conversion failed: {pdf_path}")
+        index_converted_file(output_path)
+        return output_path, False
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of the conversion server.
+    
+    GET /health -> {"status": "ok"}
+    POST /convert {"pdf_path": ..., "force": false, "stream": false}
+        -> {"markdown_path", "pdf_hash", "cached"}, or the Markdown itself
+           (text/markdown) when stream is true
+    """
+    
+    service = None  # ConversionService, set by serve()
+    
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+    
+    def do_POST(self):
+        if self.path != '/convert':
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            pdf_path = request['pdf_path']
+            if not isinstance(pdf_path, str):
+                raise ValueError("pdf_path must be a string")
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {'error': f"Invalid request: {e}"})
+            return
+        
+        pdf_path = self.service.resolve_pdf_path(pdf_path)
+        if pdf_path is None:
+            self._send_json(403, {'error': f"PDF file is outside the project root: {request['pdf_path']}"})
+            return
+        if not (self.service.project_root / pdf_path).is_file():
+            self._send_json(404, {'error': f"PDF file not found: {pdf_path}"})
+            return
+        
+        try:
+            markdown_path, pdf_hash, cached = self.service.convert(pdf_path, bool(request.get('force')))
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        
+        if request.get('stream'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/markdown; charset=utf-8')
+            self.send_header('Content-Length', str(os.path.getsize(markdown_path)))
+            self.send_header('X-Markdown-Path', markdown_path)
+            self.send_header('X-PDF-Hash', pdf_hash)
+            self.end_headers()
+            with open(markdown_path, 'rb') as f:
+                shutil.copyfileobj(f, self.wfile)
+        else:
+            self._send_json(200, {'markdown_path': markdown_path, 'pdf_hash': pdf_hash, 'cached': cached})
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} - {format % args}")
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, workers=2):
+    """Run the conversion server until interrupted"""
+    service = ConversionService(workers)
+    handler = type('BoundConversionRequestHandler', (ConversionRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Conversion server listening on http://{host}:{server.server_address[1]} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping conversion server")
+    finally:
+        server.server_close()
+        service.close()
+
+
+def request_conversion(server_url, pdf_path, force=False, timeout=300):
+    """
+    Ask a running conversion server to convert a PDF.
+    
+    Args:
+        server_url (str): Base URL, e.g. http://127.0.0.1:8765
+        pdf_path (str): Path to PDF file
+        force (bool): Force reconversion
+    
+    Returns:
+        dict: Server response with markdown_path, pdf_hash and cached
+    
+    Raises:
+        OSError: If the server cannot be reached or reports an error
+    """
+    import urllib.request
+    import urllib.error
+    
+    body = json.dumps({'pdf_path': os.path.abspath(pdf_path), 'force': force}).encode('utf-8')
+    request = urllib.request.Request(
+        f"{server_url.rstrip('/')}/convert", data=body, headers={'Content-Type': 'application/json'}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read() or b'{}').get('error', str(e))
+        except (ValueError, AttributeError):
+            # Not a JSON error object, e.g. a proxy's HTML error page
+            message = str(e)
+        raise OSError(message)
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='BMAD PDF Conversion Server')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (localhost only by default)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=2, help='Warm converter processes')
+    
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
+
+if __name__ == "__main__":
+    main()
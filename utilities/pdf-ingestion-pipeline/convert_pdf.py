@@ -11,6 +11,14 @@ import re
 import subprocess
 from pathlib import Path
 
+CONVERTED_DIR = "input-documents-converted-to-md"
+PRD_PROCESSOR_DIR = Path(__file__).resolve().parent.parent / 'prd-template-processor'
+
+UTILITIES_DIR = Path(__file__).resolve().parent.parent
+if str(UTILITIES_DIR) not in sys.path:
+    sys.path.insert(0, str(UTILITIES_DIR))
+from instrumentation import annotate, count, span, timed
+
 def get_next_version_path(base_path, converted_dir):
     """
     Determine the next version path for a converted markdown file.
@@ -108,6 +116,7 @@ def get_latest_version_path(base_path, converted_dir):
     
     return highest_file
 
+@timed('convert_pdf', document='pdf_path')
 def convert_pdf(pdf_path, force_reconvert=False):
     """
     Convert PDF to Markdown using the conversion pipeline.
@@ -119,7 +128,7 @@ def convert_pdf(pdf_path, force_reconvert=False):
     Returns:
         str: Path to converted markdown file, or None if failed
     """
-    converted_dir = "input-documents-converted-to-md"
+    converted_dir = CONVERTED_DIR
     converter_script = "utilities/pdf-to-md-converter/convert_pdf_to_md.py"
     
     if not os.path.exists(pdf_path):
@@ -135,6 +144,8 @@ def convert_pdf(pdf_path, force_reconvert=False):
         existing_path = get_latest_version_path(pdf_path, converted_dir)
         if existing_path and os.path.exists(existing_path):
             print(f"✓ Using existing conversion: {existing_path}")
+            annotate(outcome='reused')
+            count('conversions_reused')
             return existing_path
     
     # Determine output path
@@ -144,21 +155,46 @@ def convert_pdf(pdf_path, force_reconvert=False):
     
     # Run conversion
     try:
-        result = subprocess.run([
-            sys.executable, converter_script, pdf_path, output_path
-        ], capture_output=True, text=True)
+        with span('converter_subprocess', pdf_path):
+            result = subprocess.run([
+                sys.executable, converter_script, pdf_path, output_path
+            ], capture_output=True, text=True)
         
         if result.returncode == 0:
             print(f"✓ Conversion successful: {output_path}")
+            annotate(outcome='converted', pdf_bytes=os.path.getsize(pdf_path),
+                     markdown_bytes=os.path.getsize(output_path))
+            count('conversions')
+            index_converted_file(output_path)
             return output_path
         else:
             print(f"✗ Conversion failed: {result.stderr}")
+            annotate(outcome='failed')
+            count('conversions_failed')
             return None
             
     except Exception as e:
         print(f"✗ Conversion error: {e}")
         return None
 
+def index_converted_file(md_path):
+    """
+    Add a new conversion to the corpus full-text index.
+    
+    Indexing is best effort: a failure is reported but never fails the conversion.
+    
+    Args:
+        md_path (str): Path to the converted markdown file
+    """
+    try:
+        if str(PRD_PROCESSOR_DIR) not in sys.path:
+            sys.path.insert(0, str(PRD_PROCESSOR_DIR))
+        from corpus_index import update_corpus_index
+        with span('index_converted_file', md_path):
+            update_corpus_index([md_path])
+    except Exception as e:
+        print(f"⚠ Corpus index not updated: {e}")
+
 def main():
     import argparse
     
@@ -166,11 +202,12 @@ def main():
     parser.add_argument('pdf_path', help='Path to PDF file')
     parser.add_argument('--force', action='store_true', help='Force reconversion')
     parser.add_argument('--latest', action='store_true', help='Get latest version path only')
+    parser.add_argument('--server', help='Convert through a running conversion server (e.g. http://127.0.0.1:8765)')
     
     args = parser.parse_args()
     
     if args.latest:
-        latest_path = get_latest_version_path(args.pdf_path, "input-documents-converted-to-md")
+        latest_path = get_latest_version_path(args.pdf_path, CONVERTED_DIR)
         if latest_path:
             print(latest_path)
             sys.exit(0)
@@ -178,6 +215,16 @@ def main():
             print(f"No conversion found for: {args.pdf_path}")
             sys.exit(1)
     
+    if args.server:
+        from conversion_server import request_conversion
+        try:
+            response = request_conversion(args.server, args.pdf_path, args.force)
+            status = "Using existing conversion" if response['cached'] else "Conversion successful"
+            print(f"✓ {status}: {response['markdown_path']}")
+            sys.exit(0)
+        except OSError as e:
+            print(f"⚠ Conversion server unavailable ({e}), converting locally")
+    
     result_path = convert_pdf(args.pdf_path, args.force)
     sys.exit(0 if result_path else 1)
 
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+PDF Ingestion Pipeline - Watch Mode
+Monitors input-documents/ and converts PDFs as they arrive, so converted
+Markdown is ready seconds after a file lands
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from convert_pdf import convert_pdf
+
+VALIDATION_SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'validation-scripts'
+if str(VALIDATION_SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(VALIDATION_SCRIPTS_DIR))
+from validate_conversion import validate_markdown_file
+
+INPUT_DIR = "input-documents"
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def is_pdf(path):
+    return str(path).lower().endswith('.pdf')
+
+
+def scan_pdfs(root):
+    """
+    List PDF files below a directory with their (mtime_ns, size).
+    
+    Args:
+        root (str): Directory to scan
+    
+    Returns:
+        dict: Path -> (mtime_ns, size)
+    """
+    found = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if is_pdf(name):
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found[path] = (stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+class InotifyWatcher:
+    """Recursive directory watcher using Linux inotify through ctypes"""
+    
+    def __init__(self, root):
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._watches = {}  # Watch descriptor -> directory
+        self._add_tree(root)
+    
+    def _add_tree(self, directory):
+        """Watch a directory and everything below it; returns PDFs already present"""
+        found = []
+        for dirpath, _, filenames in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                continue
+            self._watches[wd] = dirpath
+            found.extend(os.path.join(dirpath, name) for name in filenames if is_pdf(name))
+        return found
+    
+    def read_events(self, timeout):
+        """
+        Wait up to timeout seconds for PDFs that were written or moved in.
+        
+        Returns:
+            list: Paths of changed PDFs
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        
+        changed = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b'\0'))
+            offset += name_length
+            
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; fall back to a full scan once
+                changed.extend(scan_pdfs(self.root))
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land in a new directory before its watch exists
+                    changed.extend(self._add_tree(path))
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and is_pdf(name):
+                changed.append(path)
+        return changed
+    
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Portable watcher comparing mtime and size between directory scans"""
+    
+    def __init__(self, root, interval=2.0):
+        self.root = root
+        self.interval = interval
+        self._known = scan_pdfs(root)
+    
+    def read_events(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        current = scan_pdfs(self.root)
+        changed = [path for path, stat in current.items() if self._known.get(path) != stat]
+        self._known = current
+        return changed
+    
+    def close(self):
+        pass
+
+
+def create_watcher(root, polling=False, interval=2.0):
+    """
+    Create an inotify watcher, falling back to polling where inotify is unavailable.
+    
+    Args:
+        root (str): Directory to watch
+        polling (bool): Force the polling watcher
+        interval (float): Polling interval in seconds
+    """
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"⚠ inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(root, interval)
+
+
+class PDFWatchDaemon:
+    """
+    Converts PDFs under the input directory as they change.
+    
+    Events for a path are debounced: a PDF is queued once no event arrived
+    for it during debounce seconds, so bursts of writes cause a single
+    conversion. Conversions run on a thread pool (each is a converter
+    subprocess); a PDF whose content hash matches its last conversion is
+    skipped. Every result is checked with validate_markdown_file.
+    """
+    
+    def __init__(self, input_dir=INPUT_DIR, workers=2, debounce=1.0, polling=False, interval=2.0):
+        self.input_dir = input_dir
+        self.debounce = debounce
+        self.watcher = create_watcher(input_dir, polling, interval)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.results = []  # (pdf_path, markdown_path, validation) per completed conversion
+        self._pending = {}  # Path -> monotonic time of its latest event
+        self._in_flight = set()
+        self._converted_hashes = {}
+        self._lock = threading.Lock()
+    
+    def queue(self, paths):
+        now = time.monotonic()
+        for path in paths:
+            self._pending[path] = now
+    
+    def dispatch_ready(self):
+        """Submit debounced PDFs to the worker pool"""
+        now = time.monotonic()
+        for path, last_event in list(self._pending.items()):
+            if now - last_event < self.debounce:
+                continue
+            with self._lock:
+                if path in self._in_flight:
+                    continue  # Picked up again once the running conversion finishes
+                self._in_flight.add(path)
+            del self._pending[path]
+            self.executor.submit(self._process, path)
+    
+    def _process(self, pdf_path):
+        try:
+            try:
+                with open(pdf_path, 'rb') as f:
+                    content_hash = hashlib.sha256(f.read()).hexdigest()
+            except FileNotFoundError:
+                return  # Removed or renamed before it settled
+            
+            if self._converted_hashes.get(pdf_path) == content_hash:
+                return
+            
+            # The event means new content, so an existing conversion is superseded
+            markdown_path = convert_pdf(pdf_path, force_reconvert=True)
+            if not markdown_path:
+                return
+            
+            validation = validate_markdown_file(markdown_path)
+            status = "✓" if validation['valid'] else "✗"
+            print(f"{status} Validated: {markdown_path} (score {validation['score']}/{validation['max_score']})")
+            for issue in validation['issues']:
+                print(f"  - {issue}")
+            
+            with self._lock:
+                self._converted_hashes[pdf_path] = content_hash
+                self.results.append((pdf_path, markdown_path, validation))
+        except Exception as e:
+            print(f"✗ Watch conversion error for {pdf_path}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(pdf_path)
+    
+    def run(self, stop_event=None):
+        """Watch until interrupted or stop_event is set"""
+        print(f"Watching {self.input_dir} for PDFs ({type(self.watcher).__name__})")
+        try:
+            while not (stop_event and stop_event.is_set()):
+                timeout = self.debounce if self._pending else 1.0
+                self.queue(self.watcher.read_events(timeout))
+                self.dispatch_ready()
+        except KeyboardInterrupt:
+            print("\nStopping watch mode")
+        finally:
+            self.close()
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.watcher.close()
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='BMAD PDF Ingestion Pipeline - Watch Mode')
+    parser.add_argument('--input-dir', default=INPUT_DIR, help='Directory to watch for PDFs')
+    parser.add_argument('--workers', type=int, default=2, help='Concurrent conversions')
+    parser.add_argument('--debounce', type=float, default=1.0,
+                       help='Seconds without writes before a PDF is converted')
+    parser.add_argument('--polling', action='store_true', help='Poll instead of using inotify')
+    parser.add_argument('--interval', type=float, default=2.0, help='Polling interval in seconds')
+    parser.add_argument('--initial-scan', action='store_true',
+                       help='Convert PDFs that have no conversion yet before watching')
+    
+    args = parser.parse_args()
+    
+    if not os.path.isdir(args.input_dir):
+        print(f"Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+    
+    # Watch first so PDFs arriving during the initial scan are not missed
+    daemon = PDFWatchDaemon(args.input_dir, args.workers, args.debounce, args.polling, args.interval)
+    if args.initial_scan:
+        for pdf_path in sorted(scan_pdfs(args.input_dir)):
+            convert_pdf(pdf_path)
+    daemon.run()
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
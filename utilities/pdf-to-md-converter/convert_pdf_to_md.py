@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 """
 PDF to Markdown Converter - Reference Implementation
-This is a placeholder for the actual PDF conversion script.
-Replace this with your preferred PDF-to-Markdown conversion logic.
+Converts with pymupdf (fitz) when it is installed, turning tables detected
+from word coordinates into Markdown tables (requires numpy). Without pymupdf
+a placeholder Markdown file is written; replace or extend this script with
+your preferred PDF-to-Markdown conversion logic.
 """
 
 import sys
@@ -10,33 +12,42 @@ import os
 import argparse
 from pathlib import Path
 
-def convert_pdf_to_markdown(pdf_path, output_path):
+from table_extraction import TableExtractor, render_blocks, tables_available
+
+try:
+    import fitz  # pymupdf (install: pip install pymupdf)
+except ImportError:  # Optional; the placeholder conversion is written without it
+    fitz = None
+
+def convert_pdf_to_markdown(pdf_path, output_path, extract_tables=True):
     """
     Convert PDF to Markdown format.
     
     Args:
         pdf_path (str): Path to source PDF file
         output_path (str): Path for output Markdown file
+        extract_tables (bool): Render detected tables as Markdown tables
     
     Returns:
         bool: True if conversion successful, False otherwise
     """
     try:
-        # PLACEHOLDER: Replace with actual PDF conversion logic
-        # Popular options: pymupdf (fitz), pdfplumber, pdfminer, etc.
-        
-        # Example using pymupdf (install: pip install pymupdf)
-        """
-        import fitz
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {Path(pdf_path).stem}\n\n")
-            f.write(text)
-        """
+        if fitz is not None:
+            tables = 0
+            extractor = TableExtractor() if extract_tables and tables_available() else None
+            with fitz.open(pdf_path) as doc, open(output_path, 'w', encoding='utf-8') as f:
+                f.write(f"# {Path(pdf_path).stem}\n\n")
+                for page in doc:
+                    if extractor is None:
+                        f.write(page.get_text())
+                        continue
+                    # Layout-aware: rows and columns are rebuilt from word coordinates
+                    blocks = extractor.extract(page.get_text("words"))
+                    tables += sum(1 for kind, _ in blocks if kind == 'table')
+                    f.write(render_blocks(blocks) + "\n")
+            
+            print(f"✓ Converted: {pdf_path} -> {output_path}" + (f" ({tables} tables)" if tables else ""))
+            return True
         
         # TEMPORARY: Create placeholder Markdown file
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -56,6 +67,8 @@ def main():
     parser = argparse.ArgumentParser(description='Convert PDF to Markdown')
     parser.add_argument('pdf_path', help='Path to PDF file')
     parser.add_argument('output_path', help='Path for output Markdown file')
+    parser.add_argument('--no-tables', action='store_true',
+                        help='Write page text as extracted instead of detecting tables')
     
     args = parser.parse_args()
     
@@ -66,7 +79,7 @@ def main():
     # Create output directory if needed
     os.makedirs(os.path.dirname(args.output_path), exist_ok=True)
     
-    success = convert_pdf_to_markdown(args.pdf_path, args.output_path)
+    success = convert_pdf_to_markdown(args.pdf_path, args.output_path, not args.no_tables)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
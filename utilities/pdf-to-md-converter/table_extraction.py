@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+PDF Table Extraction
+Detects tables from the word coordinates of a PDF page and renders them as
+Markdown tables, so table-heavy documents keep their rows and columns
+instead of being flattened into run-on text.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it pages are converted as plain text
+    np = None
+
+
+def tables_available():
+    """Whether table extraction can run, i.e. NumPy is installed."""
+    return np is not None
+
+
+class TableExtractor:
+    """
+    Layout-aware table detection over the words of one page.
+    
+    Words are grouped into text rows by vertical position, and each row
+    into cells at horizontal gaps wider than gap_ratio line heights. Runs
+    of at least min_rows consecutive rows with two or more cells are table
+    candidates; their columns are the x-ranges between the whitespace gaps
+    that no cell of the run crosses. Candidates with fewer than two columns,
+    or whose cells read like prose (more than max_cell_words words on
+    average, as in two-column layouts), stay text. The geometry of every
+    word on the page is processed in vectorized NumPy batches.
+    """
+    
+    def __init__(self, gap_ratio=1.0, row_tolerance=0.5, max_row_gap=2.5, min_rows=2, max_cell_words=6):
+        self.gap_ratio = gap_ratio
+        self.row_tolerance = row_tolerance
+        self.max_row_gap = max_row_gap
+        self.min_rows = min_rows
+        self.max_cell_words = max_cell_words
+    
+    def extract(self, words):
+        """
+        Split a page into text and table blocks in reading order.
+        
+        Args:
+            words (list): Word tuples (x0, y0, x1, y1, text, ...) as returned
+                by PyMuPDF's page.get_text("words").
+        
+        Returns:
+            list: ('text', [line, ...]) and ('table', [[cell, ...], ...])
+                blocks; text lines are None where a paragraph break belongs.
+        """
+        words = [w for w in words if str(w[4]).strip()]
+        if not words:
+            return []
+        
+        boxes = np.array([w[:4] for w in words], dtype=float)
+        texts = np.array([str(w[4]) for w in words], dtype=object)
+        line_height = max(float(np.median(boxes[:, 3] - boxes[:, 1])), 1.0)
+        
+        # Rows: words whose vertical centres lie within row_tolerance line heights
+        centres = (boxes[:, 1] + boxes[:, 3]) / 2
+        by_centre = np.argsort(centres, kind='stable')
+        row_breaks = np.diff(centres[by_centre]) > self.row_tolerance * line_height
+        row_of = np.empty(len(words), dtype=int)
+        row_of[by_centre] = np.concatenate(([0], np.cumsum(row_breaks)))
+        
+        # Cells: left-to-right within each row, split at wide horizontal gaps
+        order = np.lexsort((boxes[:, 0], row_of))
+        boxes, texts, row_of = boxes[order], texts[order], row_of[order]
+        gaps = boxes[1:, 0] - boxes[:-1, 2]
+        new_cell = np.concatenate(([True], (row_of[1:] != row_of[:-1]) | (gaps > self.gap_ratio * line_height)))
+        cell_starts = np.flatnonzero(new_cell)
+        cell_x0 = np.minimum.reduceat(boxes[:, 0], cell_starts)
+        cell_x1 = np.maximum.reduceat(boxes[:, 2], cell_starts)
+        cell_row = row_of[cell_starts]
+        cell_words = np.diff(np.append(cell_starts, len(words)))
+        cell_text = [' '.join(chunk) for chunk in np.split(texts, cell_starts[1:])]
+        
+        row_count = int(row_of[-1]) + 1
+        row_starts = np.flatnonzero(np.concatenate(([True], row_of[1:] != row_of[:-1])))
+        row_top = np.minimum.reduceat(boxes[:, 1], row_starts)
+        row_bottom = np.maximum.reduceat(boxes[:, 3], row_starts)
+        row_gap = row_top[1:] - row_bottom[:-1]
+        cells_per_row = np.bincount(cell_row, minlength=row_count)
+        cell_bounds = np.append(np.searchsorted(cell_row, np.arange(row_count)), len(cell_row))
+        
+        def row_cells(row):
+            return range(cell_bounds[row], cell_bounds[row + 1])
+        
+        # Candidate tables: maximal runs of adjacent multi-cell rows
+        multi = cells_per_row >= 2
+        linked = multi[:-1] & multi[1:] & (row_gap <= self.max_row_gap * line_height)
+        
+        blocks = []
+        row = 0
+        while row < row_count:
+            end = row + 1
+            while multi[row] and end < row_count and linked[end - 1]:
+                end += 1
+            table = self._build_table(range(cell_bounds[row], cell_bounds[end]), cell_x0, cell_x1,
+                                      cell_row, cell_words, cell_text) if end - row >= self.min_rows else None
+            if table is not None:
+                blocks.append(('table', table))
+            else:
+                end = row + 1
+                line = ' '.join(cell_text[i] for i in row_cells(row))
+                if not blocks or blocks[-1][0] != 'text':
+                    blocks.append(('text', []))
+                elif row_gap[row - 1] > line_height:
+                    blocks[-1][1].append(None)
+                blocks[-1][1].append(line)
+            row = end
+        return blocks
+    
+    def _build_table(self, cells, cell_x0, cell_x1, cell_row, cell_words, cell_text):
+        """Lay the cells of a candidate run out on shared columns, or None if it is not a table."""
+        cells = np.arange(cells.start, cells.stop)
+        if cell_words[cells].mean() > self.max_cell_words:
+            return None
+        
+        # Column gutters: x positions no cell covers; a cell starting past every earlier end opens a column
+        by_x0 = cells[np.argsort(cell_x0[cells], kind='stable')]
+        reach = np.maximum.accumulate(cell_x1[by_x0])
+        opens = np.concatenate(([True], cell_x0[by_x0][1:] > reach[:-1]))
+        column_x0 = cell_x0[by_x0][opens]
+        if len(column_x0) < 2:
+            return None
+        
+        column_of = np.searchsorted(column_x0, cell_x0[cells], side='right') - 1
+        first_row = int(cell_row[cells[0]])
+        rows = [[''] * len(column_x0) for _ in range(int(cell_row[cells[-1]]) - first_row + 1)]
+        for cell, column in zip(cells, column_of):
+            current = rows[cell_row[cell] - first_row]
+            current[column] = f"{current[column]} {cell_text[cell]}".strip()
+        return rows
+
+
+def render_table(rows):
+    """
+    Render table rows as a Markdown table, the first row as header.
+    
+    Args:
+        rows (list): Rows of cell strings, all of the same length.
+    
+    Returns:
+        str: Markdown table.
+    """
+    def format_row(row):
+        return '| ' + ' | '.join(cell.replace('|', '\\|') for cell in row) + ' |'
+    
+    lines = [format_row(rows[0]), '| ' + ' | '.join('---' for _ in rows[0]) + ' |']
+    lines.extend(format_row(row) for row in rows[1:])
+    return '\n'.join(lines)
+
+
+def render_blocks(blocks):
+    """
+    Render the blocks of one page as Markdown.
+    
+    Args:
+        blocks (list): Blocks as returned by TableExtractor.extract.
+    
+    Returns:
+        str: Markdown for the page, paragraphs and tables separated by blank lines.
+    """
+    parts = []
+    for kind, content in blocks:
+        if kind == 'table':
+            parts.append(render_table(content))
+        else:
+            parts.append('\n'.join('' if line is None else line for line in content))
+    return '\n\n'.join(parts) + '\n' if parts else ''
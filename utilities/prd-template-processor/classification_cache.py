@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Classification Result Cache
+Memoizes content classification outcomes across runs, keyed by content hash
+and template model hash
+"""
+
+import json
+import time
+import atexit
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class ClassificationCache:
+    """
+    Two-level LRU cache of classification outcomes
+    
+    Recently used entries live in an in-memory LRU; every entry is also
+    persisted to a SQLite file in cache_dir so repeat runs over an unchanged
+    corpus skip scoring. The on-disk store is bounded by max_disk_entries
+    and evicts least recently used entries. Writes are buffered and flushed
+    in batches.
+    
+    Entries are keyed by the SHA-256 of the result version, the template
+    model hash and the content, so a template change or a change to the
+    caller's scoring rules invalidates every entry implicitly.
+    """
+    
+    DB_FILENAME = "classification-cache.sqlite3"
+    FLUSH_THRESHOLD = 256
+    
+    def __init__(
+        self,
+        model_hash: str,
+        cache_dir: Optional[str] = None,
+        result_version: str = "",
+        max_memory_entries: int = 4096,
+        max_disk_entries: int = 200000
+    ):
+        self.model_hash = model_hash
+        self.result_version = result_version
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending_writes: Dict[str, Tuple[str, int]] = {}
+        self._pending_touches: Dict[str, int] = {}
+        self._clock = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_entries = 0
+        self.hits = 0
+        self.misses = 0
+        
+        if cache_dir:
+            self._open_disk_store(Path(cache_dir) / self.DB_FILENAME)
+        
+        atexit.register(self.flush)
+    
+    def _open_disk_store(self, db_path: Path):
+        """Open the SQLite store; the cache degrades to memory-only on failure"""
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), timeout=30)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+            self._db.commit()
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Warning: classification cache disabled on disk: {e}")
+            self._db = None
+    
+    def key(self, content: str) -> str:
+        """Cache key for content under the current result version and template model"""
+        digest = hashlib.sha256(self.result_version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(self.model_hash.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for key, or None"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self._touch(key)
+            self.hits += 1
+            return entry
+        
+        value = None
+        if key in self._pending_writes:
+            value = self._pending_writes[key][0]
+            self._pending_writes[key] = (value, self._tick())
+        elif self._db is not None:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                value = row[0]
+                self._touch(key)
+        
+        if value is None:
+            self.misses += 1
+            return None
+        
+        entry = json.loads(value)
+        self._remember(key, entry)
+        self.hits += 1
+        return entry
+    
+    def put(self, key: str, entry: Dict):
+        """Store an entry; it is written to disk on the next flush"""
+        self._remember(key, entry)
+        if self._db is not None:
+            self._pending_writes[key] = (json.dumps(entry), self._tick())
+            self._pending_touches.pop(key, None)
+            if len(self._pending_writes) >= self.FLUSH_THRESHOLD:
+                self.flush()
+    
+    def _tick(self) -> int:
+        """Strictly increasing access stamp, so eviction order is well defined"""
+        self._clock = max(time.time_ns(), self._clock + 1)
+        return self._clock
+    
+    def _touch(self, key: str):
+        if self._db is not None and key not in self._pending_writes:
+            self._pending_touches[key] = self._tick()
+    
+    def _remember(self, key: str, entry: Dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def flush(self):
+        """Write buffered entries and access times, then enforce the disk bound"""
+        if self._db is None or not (self._pending_writes or self._pending_touches):
+            return
+        
+        try:
+            with self._db:
+                if self._pending_writes:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO entries (key, value, last_used) VALUES (?, ?, ?)",
+                        [(key, value, used) for key, (value, used) in self._pending_writes.items()]
+                    )
+                    self._disk_entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                if self._pending_touches:
+                    self._db.executemany(
+                        "UPDATE entries SET last_used = ? WHERE key = ?",
+                        [(used, key) for key, used in self._pending_touches.items()]
+                    )
+                
+                excess = self._disk_entries - self.max_disk_entries
+                if excess > 0:
+                    self._db.execute(
+                        "DELETE FROM entries WHERE key IN "
+                        "(SELECT key FROM entries ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                    self._disk_entries -= excess
+        except sqlite3.Error as e:
+            print(f"Warning: failed to flush classification cache: {e}")
+        
+        self._pending_writes.clear()
+        self._pending_touches.clear()
+    
+    def close(self):
+        """Flush and release the disk store; the cache stays usable in memory"""
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        atexit.unregister(self.flush)
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current sizes"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'memory_entries': len(self._memory),
+            'disk_entries': self._disk_entries,
+        }
@@ -4,13 +4,36 @@ PRD Template Classification System
 Maps content to predefined PRD template sections for consistent structure enforcement
 """
 
+import os
 import re
+import sys
 import json
+import heapq
 import yaml
-from typing import Dict, List, Tuple, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple, Optional
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from classification_cache import ClassificationCache
+from template_model import DEFAULT_CACHE_DIR, TemplateModel, load_template_model, parse_template
+from uncategorized_store import UncategorizedStore
+
+UTILITIES_DIR = Path(__file__).resolve().parent.parent
+if str(UTILITIES_DIR) not in sys.path:
+    sys.path.insert(0, str(UTILITIES_DIR))
+from instrumentation import count, timed
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batches fall back to per-item scoring
+    np = None
+
+# Bump when scoring rules change so cached classification results are recomputed
+CLASSIFICATION_RESULT_VERSION = 1
+
 @dataclass
 class TemplateSection:
     """Represents a section in the PRD template"""
@@ -30,6 +53,8 @@ class ClassificationResult:
     matched_keywords: List[str]
     reasoning: str
     content_snippet: str
+    source_file: str = ""
+    source_offsets: Optional[Tuple[int, int]] = None  # Byte range of the content in source_file
 
 @dataclass
 class UncategorizedContent:
@@ -39,170 +64,74 @@ class UncategorizedContent:
     attempted_sections: List[str]
     reasoning: str
     suggestions: List[str]
+    source_offsets: Optional[Tuple[int, int]] = None
+    top_scores: List[Tuple[str, float]] = field(default_factory=list)  # Best (section_id, score) pairs
 
 class PRDTemplateClassificationSystem:
     """Classification system for mapping content to PRD template sections"""
     
-    def __init__(self, template_path: str):
+    # Minimum confidence for content to be assigned to a section
+    CONFIDENCE_THRESHOLD = 0.3
+    
+    # Number of content items scored together by the vectorized batch path
+    BATCH_SIZE = 512
+    
+    # Best-scoring sections kept for each uncategorized item
+    UNCATEGORIZED_TOP_K = 3
+    
+    def __init__(
+        self,
+        template_path: str,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        use_result_cache: bool = True,
+        uncategorized_spill_path: Optional[str] = None
+    ):
         self.template_path = Path(template_path)
+        self.cache_dir = cache_dir
+        self.use_result_cache = use_result_cache
+        self.template_model: Optional[TemplateModel] = None
         self.sections: Dict[str, TemplateSection] = {}
-        self.uncategorized_content: List[UncategorizedContent] = []
+        # Full text of misses is spilled to JSONL; only compact records stay in memory
+        self.uncategorized_content = UncategorizedStore(UncategorizedContent, uncategorized_spill_path)
+        self.result_cache: Optional[ClassificationCache] = None
         self._load_template()
         self._initialize_classification_system()
+        
+        if use_result_cache:
+            # Outcomes are keyed by the template model hash and the scoring rules, so editing either invalidates them
+            result_version = f"{CLASSIFICATION_RESULT_VERSION}:{self.CONFIDENCE_THRESHOLD}:{self.UNCATEGORIZED_TOP_K}"
+            self.result_cache = ClassificationCache(self.template_model.model_hash, cache_dir, result_version)
     
     def _load_template(self):
-        """Load and parse the PRD template structure"""
+        """Load the compiled PRD template model (parsed once, then served from cache)"""
         try:
-            with open(self.template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-            self._parse_template_sections(template_content)
+            self.template_model = load_template_model(str(self.template_path), self.cache_dir)
         except FileNotFoundError:
             raise FileNotFoundError(f"PRD template not found at {self.template_path}")
         except Exception as e:
             raise Exception(f"Error loading PRD template: {e}")
+        self.sections = self._build_sections(self.template_model)
     
     def _parse_template_sections(self, content: str):
         """Parse template content to extract section structure"""
-        # Extract sections based on the specific template format
-        sections_data = {
-            "document_foundation_context": TemplateSection(
-                id="document_foundation_context",
-                title="Document Foundation & Context",
-                content_focus="Document control, definitions, compliance frameworks",
-                keywords=["document", "version", "control", "definitions", "glossary", "compliance", "standards", "framework"],
-                triggers=["FedRAMP", "ICAM", "FGAC", "STIG", "PKI", "STANAG", "UCO", "JSON-LD", "version control"],
-                content_types=["document_control", "definitions", "standards_references", "change_logs"],
-                priority=1
-            ),
-            "executive_summary_strategic_vision": TemplateSection(
-                id="executive_summary_strategic_vision",
-                title="Executive Summary & Strategic Vision",
-                content_focus="Business strategy, value propositions, high-level goals",
-                keywords=["strategy", "vision", "mission", "goals", "objectives", "value", "proposition", "executive"],
-                triggers=["strategic objectives", "business alignment", "value proposition", "mission statement"],
-                content_types=["strategic_objectives", "value_propositions", "success_metrics"],
-                priority=2
-            ),
-            "business_context_market_analysis": TemplateSection(
-                id="business_context_market_analysis",
-                title="Business Context & Market Analysis",
-                content_focus="Market research, competitive landscape, business case",
-                keywords=["market", "competitive", "business", "revenue", "analysis", "competition", "landscape"],
-                triggers=["market segmentation", "competitive analysis", "business case", "revenue strategy"],
-                content_types=["market_research", "competitive_analysis", "business_case", "risk_assessment"],
-                priority=3
-            ),
-            "user_research_experience_design": TemplateSection(
-                id="user_research_experience_design",
-                title="User Research & Experience Design",
-                content_focus="Personas, user journeys, accessibility requirements",
-                keywords=["user", "persona", "journey", "experience", "accessibility", "design", "UX", "UI"],
-                triggers=["user personas", "user journey", "accessibility standards", "user research"],
-                content_types=["user_personas", "user_journeys", "accessibility_requirements", "ux_design"],
-                priority=4
-            ),
-            "functional_requirements_features": TemplateSection(
-                id="functional_requirements_features",
-                title="Functional Requirements & Feature Specifications",
-                content_focus="Feature definitions, user stories, acceptance criteria",
-                keywords=["functional", "requirements", "features", "user stories", "acceptance", "criteria", "specifications"],
-                triggers=["core features", "user stories", "acceptance criteria", "business rules"],
-                content_types=["functional_requirements", "user_stories", "acceptance_criteria", "feature_specs"],
-                priority=5
-            ),
-            "non_functional_requirements": TemplateSection(
-                id="non_functional_requirements",
-                title="Non-Functional Requirements (NFRs)",
-                content_focus="Performance, security, compliance, scalability requirements",
-                keywords=["performance", "security", "scalability", "compliance", "availability", "maintainability"],
-                triggers=["performance requirements", "security requirements", "compliance standards", "scalability"],
-                content_types=["performance_specs", "security_requirements", "compliance_standards", "scalability_requirements"],
-                priority=6
-            ),
-            "aiml_integration_capabilities": TemplateSection(
-                id="aiml_integration_capabilities",
-                title="AI/ML Integration & Advanced Capabilities",
-                content_focus="AI enablement, automation, self-improvement mechanisms",
-                keywords=["AI", "ML", "machine learning", "artificial intelligence", "automation", "algorithm"],
-                triggers=["AI integration", "ML models", "automation", "self-improvement"],
-                content_types=["ai_requirements", "ml_integration", "automation_specs", "intelligent_features"],
-                priority=7
-            ),
-            "technical_architecture_implementation": TemplateSection(
-                id="technical_architecture_implementation",
-                title="Technical Architecture & Implementation",
-                content_focus="System architecture, technology decisions, deployment strategy",
-                keywords=["architecture", "technical", "technology", "implementation", "deployment", "infrastructure"],
-                triggers=["system architecture", "technology stack", "deployment strategy", "integration points"],
-                content_types=["architecture_specs", "technology_decisions", "deployment_requirements", "integration_specs"],
-                priority=8
-            ),
-            "success_metrics_performance": TemplateSection(
-                id="success_metrics_performance",
-                title="Success Metrics & Performance Measurement",
-                content_focus="KPIs, measurement frameworks, analytics strategy",
-                keywords=["metrics", "KPI", "measurement", "analytics", "performance", "success"],
-                triggers=["success metrics", "KPIs", "measurement framework", "analytics"],
-                content_types=["business_metrics", "product_kpis", "performance_metrics", "analytics_requirements"],
-                priority=9
-            ),
-            "development_methodology_planning": TemplateSection(
-                id="development_methodology_planning",
-                title="Development Methodology & Project Planning",
-                content_focus="Agile implementation, resource planning, timeline management",
-                keywords=["development", "methodology", "agile", "planning", "project", "timeline", "resources"],
-                triggers=["development methodology", "project planning", "agile", "resource planning"],
-                content_types=["methodology_specs", "project_plans", "resource_requirements", "timeline_specifications"],
-                priority=10
-            ),
-            "quality_assurance_testing": TemplateSection(
-                id="quality_assurance_testing",
-                title="Quality Assurance & Testing Strategy",
-                content_focus="Testing frameworks, quality gates, acceptance criteria",
-                keywords=["quality", "testing", "QA", "test", "validation", "verification"],
-                triggers=["testing strategy", "quality gates", "test plans", "validation criteria"],
-                content_types=["testing_requirements", "quality_standards", "test_strategies", "validation_criteria"],
-                priority=11
-            ),
-            "launch_strategy_gtm": TemplateSection(
-                id="launch_strategy_gtm",
-                title="Launch Strategy & Go-to-Market",
-                content_focus="Launch planning, market entry, post-launch operations",
-                keywords=["launch", "go-to-market", "GTM", "rollout", "deployment", "market entry"],
-                triggers=["launch strategy", "go-to-market", "rollout plan", "market entry"],
-                content_types=["launch_plans", "gtm_strategy", "rollout_specifications", "market_entry_plans"],
-                priority=12
-            ),
-            "governance_compliance_risk": TemplateSection(
-                id="governance_compliance_risk",
-                title="Governance, Compliance & Risk Management",
-                content_focus="Regulatory compliance, risk mitigation, governance frameworks",
-                keywords=["governance", "compliance", "risk", "regulatory", "mitigation", "framework"],
-                triggers=["regulatory compliance", "risk management", "governance", "compliance framework"],
-                content_types=["compliance_requirements", "risk_assessments", "governance_frameworks", "regulatory_specs"],
-                priority=13
-            ),
-            "dependencies_assumptions_constraints": TemplateSection(
-                id="dependencies_assumptions_constraints",
-                title="Dependencies, Assumptions & Constraints",
-                content_focus="Critical success factors, blockers, external dependencies",
-                keywords=["dependencies", "assumptions", "constraints", "blockers", "external", "limitations"],
-                triggers=["dependencies", "assumptions", "constraints", "external dependencies"],
-                content_types=["dependency_specs", "assumption_documentation", "constraint_definitions", "external_dependencies"],
-                priority=14
-            ),
-            "supporting_documentation_appendices": TemplateSection(
-                id="supporting_documentation_appendices",
-                title="Supporting Documentation & Appendices",
-                content_focus="Reference materials, detailed artifacts, supplementary data",
-                keywords=["documentation", "appendix", "reference", "supplementary", "artifacts", "supporting"],
-                triggers=["reference materials", "supporting documentation", "appendices", "detailed artifacts"],
-                content_types=["reference_materials", "supplementary_documentation", "detailed_artifacts", "appendices"],
-                priority=15
+        self.template_model = parse_template(content, str(self.template_path))
+        self.sections = self._build_sections(self.template_model)
+    
+    @staticmethod
+    def _build_sections(model: TemplateModel) -> Dict[str, TemplateSection]:
+        """Create per-classifier section objects from the shared template model"""
+        return {
+            spec.id: TemplateSection(
+                id=spec.id,
+                title=spec.title,
+                content_focus=spec.content_focus,
+                keywords=list(spec.keywords),
+                triggers=list(spec.triggers),
+                content_types=list(spec.content_types),
+                priority=spec.priority
             )
+            for spec in model.sections
         }
-        
-        self.sections = sections_data
     
     def _initialize_classification_system(self):
         """Initialize the classification system with weighted scoring"""
@@ -212,7 +141,66 @@ class PRDTemplateClassificationSystem:
                                       for kw in section.keywords]
             section.trigger_patterns = [re.compile(r'\b' + re.escape(trigger) + r'\b', re.IGNORECASE) 
                                       for trigger in section.triggers]
+        
+        if np is not None:
+            self._build_term_matrices()
+    
+    def _build_term_matrices(self):
+        """
+        Precompute term->section count matrices for vectorized batch scoring.
+        
+        Each scoring role (keywords, triggers, content types) gets its own
+        column space so that per-section match counts come out of a single
+        matrix product and can be weighted exactly like the per-item path.
+        Single-word terms are matched through the token vocabulary; phrases
+        and hyphenated terms keep their regex so results stay identical.
+        """
+        self._section_ids = list(self.sections.keys())
+        n_sections = len(self._section_ids)
+        
+        roles = {
+            'keywords': lambda s: s.keywords,
+            'triggers': lambda s: s.triggers,
+            'content_types': lambda s: [ct.replace('_', ' ') for ct in s.content_types],
+        }
+        
+        self._term_vocab = {}  # token -> [(role, column)]
+        self._term_roles = {}
+        
+        for role, terms_of in roles.items():
+            columns: Dict[str, int] = {}
+            phrase_terms: List[Tuple[int, object]] = []
+            assignments = []
+            
+            for section_index, section_id in enumerate(self._section_ids):
+                for term in terms_of(self.sections[section_id]):
+                    key = term.lower()
+                    if key not in columns:
+                        columns[key] = len(columns)
+                        if role == 'content_types':
+                            # Content types are plain substring checks on lowercased content
+                            phrase_terms.append((columns[key], key))
+                        elif re.fullmatch(r'\w+', key):
+                            self._term_vocab.setdefault(key, []).append((role, columns[key]))
+                        else:
+                            pattern = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
+                            phrase_terms.append((columns[key], pattern))
+                    assignments.append((columns[key], section_index))
+            
+            weights = np.zeros((len(columns), n_sections), dtype=np.int64)
+            for column, section_index in assignments:
+                weights[column, section_index] += 1
+            
+            self._term_roles[role] = {
+                'weights': weights,
+                'phrases': phrase_terms,
+            }
+        
+        self._priority_boosts = np.array(
+            [1.0 + (1.0 / self.sections[sid].priority) * 0.1 for sid in self._section_ids]
+        )
     
+    @timed('classify_content', document='source_file')
     def classify_content(self, content: str, source_file: str = "") -> Tuple[Optional[ClassificationResult], bool]:
         """
         Classify content to the most appropriate template section
@@ -220,8 +208,15 @@ class PRDTemplateClassificationSystem:
         Returns:
             Tuple of (ClassificationResult or None, is_categorized)
         """
-        best_match = None
-        best_score = 0.0
+        cache_key, entry = self._lookup_cached(content)
+        if entry is not None:
+            return self._classification_from_cache(entry, content, source_file)
+        
+        section_scores = self._score_sections(content)
+        return self._finalize_classification(content, source_file, section_scores, cache_key=cache_key)
+    
+    def _score_sections(self, content: str) -> Dict[str, float]:
+        """Score content against every section"""
         section_scores = {}
         
         # Clean and prepare content for analysis
@@ -229,17 +224,29 @@ class PRDTemplateClassificationSystem:
         content_words = set(re.findall(r'\b\w+\b', content_lower))
         
         for section_id, section in self.sections.items():
-            score = self._calculate_section_score(content, content_lower, content_words, section)
-            section_scores[section_id] = score
-            
+            section_scores[section_id] = self._calculate_section_score(content, content_lower, content_words, section)
+        
+        return section_scores
+    
+    def _finalize_classification(
+        self,
+        content: str,
+        source_file: str,
+        section_scores: Dict[str, float],
+        source_offsets: Optional[Tuple[int, int]] = None,
+        cache_key: Optional[str] = None
+    ) -> Tuple[Optional[ClassificationResult], bool]:
+        """Turn per-section scores into a classification result or an uncategorized entry"""
+        best_match = None
+        best_score = 0.0
+        
+        for section_id, score in section_scores.items():
             if score > best_score:
                 best_score = score
-                best_match = section
+                best_match = self.sections[section_id]
         
         # Determine if content is categorizable
-        threshold = 0.3  # Minimum confidence threshold
-        
-        if best_score >= threshold and best_match:
+        if best_score >= self.CONFIDENCE_THRESHOLD and best_match:
             matched_keywords = self._get_matched_keywords(content, best_match)
             reasoning = self._generate_classification_reasoning(best_match, best_score, matched_keywords)
             
@@ -248,14 +255,58 @@ class PRDTemplateClassificationSystem:
                 confidence=best_score,
                 matched_keywords=matched_keywords,
                 reasoning=reasoning,
-                content_snippet=content[:200] + "..." if len(content) > 200 else content
+                content_snippet=content[:200] + "..." if len(content) > 200 else content,
+                source_file=source_file,
+                source_offsets=source_offsets
             )
+            if cache_key:
+                self.result_cache.put(cache_key, {'result': {
+                    'section_id': result.section_id,
+                    'confidence': result.confidence,
+                    'matched_keywords': result.matched_keywords,
+                    'reasoning': result.reasoning,
+                }})
             return result, True
         else:
             # Content couldn't be categorized with sufficient confidence
-            self._add_uncategorized_content(content, source_file, section_scores)
+            if cache_key:
+                # Scores are kept so a cache hit can rebuild the same suggestions
+                self.result_cache.put(cache_key, {'result': None, 'scores': list(section_scores.values())})
+            self._add_uncategorized_content(content, source_file, section_scores, source_offsets)
             return None, False
     
+    def _lookup_cached(self, content: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Return (cache_key, cached entry or None); the key is None when caching is off"""
+        if self.result_cache is None:
+            return None, None
+        cache_key = self.result_cache.key(content)
+        return cache_key, self.result_cache.get(cache_key)
+    
+    def _classification_from_cache(
+        self,
+        entry: Dict,
+        content: str,
+        source_file: str,
+        source_offsets: Optional[Tuple[int, int]] = None
+    ) -> Tuple[Optional[ClassificationResult], bool]:
+        """Rebuild a classification outcome from a cache entry without rescoring"""
+        cached = entry['result']
+        if cached is None:
+            section_scores = dict(zip(self.sections, entry['scores']))
+            self._add_uncategorized_content(content, source_file, section_scores, source_offsets)
+            return None, False
+        
+        result = ClassificationResult(
+            section_id=cached['section_id'],
+            confidence=cached['confidence'],
+            matched_keywords=list(cached['matched_keywords']),
+            reasoning=cached['reasoning'],
+            content_snippet=content[:200] + "..." if len(content) > 200 else content,
+            source_file=source_file,
+            source_offsets=source_offsets
+        )
+        return result, True
+    
     def _calculate_section_score(self, content: str, content_lower: str, content_words: set, section: TemplateSection) -> float:
         """Calculate matching score for a section"""
         score = 0.0
@@ -296,6 +347,71 @@ class PRDTemplateClassificationSystem:
         
         return min(score, 1.0)  # Cap at 1.0
     
+    def _score_batch(self, contents: List[str]):
+        """
+        Score a batch of content items against all sections in one shot.
+        
+        Builds a document-term matrix per scoring role, multiplies it by the
+        precomputed term->section matrices and applies the same weighting,
+        length normalization and priority boost as _calculate_section_score.
+        
+        Returns:
+            Array of shape (len(contents), len(sections)) with capped scores
+        """
+        n_docs = len(contents)
+        role_counts = {}
+        
+        lowered = [content.lower() for content in contents]
+        
+        # Sparse (row, column, count) triplets for single-token terms
+        triplets = {role: ([], [], []) for role in self._term_roles}
+        vocab = self._term_vocab
+        
+        for row, content_lower in enumerate(lowered):
+            token_counts: Dict[str, int] = {}
+            for token in re.findall(r'\w+', content_lower):
+                if token in vocab:
+                    token_counts[token] = token_counts.get(token, 0) + 1
+            
+            for token, occurrences in token_counts.items():
+                for role, column in vocab[token]:
+                    rows, cols, vals = triplets[role]
+                    rows.append(row)
+                    cols.append(column)
+                    vals.append(occurrences)
+        
+        for role, model in self._term_roles.items():
+            weights = model['weights']
+            doc_terms = np.zeros((n_docs, weights.shape[0]), dtype=np.int64)
+            
+            rows, cols, vals = triplets[role]
+            if rows:
+                doc_terms[rows, cols] = vals
+            
+            for column, matcher in model['phrases']:
+                if isinstance(matcher, str):
+                    doc_terms[:, column] = [matcher in content_lower for content_lower in lowered]
+                else:
+                    doc_terms[:, column] = [len(matcher.findall(content)) for content in contents]
+            
+            if role != 'keywords':
+                # Triggers and content types count once per item, not per occurrence
+                doc_terms = (doc_terms > 0).astype(np.int64)
+            
+            role_counts[role] = doc_terms @ weights
+        
+        scores = (
+            (role_counts['keywords'] * 0.3) +
+            (role_counts['triggers'] * 0.5) +
+            (role_counts['content_types'] * 0.2)
+        )
+        
+        word_counts = np.array([len(content.split()) for content in contents], dtype=np.float64)
+        scores *= np.minimum(1.0, word_counts / 50)[:, None]
+        
+        scores = np.where(scores > 0, scores * self._priority_boosts, scores)
+        return np.minimum(scores, 1.0)
+    
     def _get_matched_keywords(self, content: str, section: TemplateSection) -> List[str]:
         """Get list of keywords that matched in the content"""
         matched = []
@@ -313,13 +429,20 @@ class PRDTemplateClassificationSystem:
         """Generate human-readable reasoning for classification"""
         return f"Classified to '{section.title}' (confidence: {score:.2f}) based on matched terms: {', '.join(keywords[:5])}. Content aligns with section focus: {section.content_focus}"
     
-    def _add_uncategorized_content(self, content: str, source_file: str, section_scores: Dict[str, float]):
-        """Add content to uncategorized list with suggestions"""
-        attempted_sections = [sid for sid, score in sorted(section_scores.items(), key=lambda x: x[1], reverse=True)[:3]]
+    def _add_uncategorized_content(
+        self,
+        content: str,
+        source_file: str,
+        section_scores: Dict[str, float],
+        source_offsets: Optional[Tuple[int, int]] = None
+    ):
+        """Add content to the uncategorized store with suggestions"""
+        top_scores = heapq.nlargest(self.UNCATEGORIZED_TOP_K, section_scores.items(), key=lambda x: x[1])
+        attempted_sections = [sid for sid, score in top_scores]
         
         suggestions = []
-        if section_scores:
-            top_section = max(section_scores.items(), key=lambda x: x[1])
+        if top_scores:
+            top_section = top_scores[0]
             if top_section[1] > 0.1:  # If there's some relevance
                 suggestions.append(f"Consider '{self.sections[top_section[0]].title}' (partial match)")
         
@@ -330,43 +453,161 @@ class PRDTemplateClassificationSystem:
             content=content,
             source_file=source_file,
             attempted_sections=attempted_sections,
-            reasoning=f"No section achieved minimum confidence threshold (0.3). Highest score: {max(section_scores.values()):.2f}",
-            suggestions=suggestions
+            reasoning=f"No section achieved minimum confidence threshold ({self.CONFIDENCE_THRESHOLD}). Highest score: {top_scores[0][1] if top_scores else 0.0:.2f}",
+            suggestions=suggestions,
+            source_offsets=source_offsets,
+            top_scores=top_scores
         )
         
         self.uncategorized_content.append(uncategorized)
     
-    def batch_classify_content(self, content_items: List[Tuple[str, str]]) -> Dict[str, List[ClassificationResult]]:
+    @timed('batch_classify_content')
+    def batch_classify_content(self, content_items: Iterable[Tuple[str, str]]) -> Dict[str, List[ClassificationResult]]:
         """
         Classify multiple content items and group by section
         
+        Items may be (content, source_file) tuples or DocumentChunk objects
+        from document_chunker; chunks carry their byte offsets into the
+        results. The iterable is consumed lazily in batches.
+        
+        When NumPy is available, items are scored in batches through the
+        vectorized term-section matrix; otherwise each item goes through
+        classify_content. Both paths produce identical results. Items found
+        in the result cache are not rescored.
+        
         Args:
-            content_items: List of (content, source_file) tuples
+            content_items: Iterable of (content, source_file) tuples or DocumentChunks
             
         Returns:
             Dictionary mapping section_id to list of ClassificationResults
         """
         classified_by_section = {}
         
-        for content, source_file in content_items:
-            result, is_categorized = self.classify_content(content, source_file)
-            
+        for content, source_file, result, is_categorized in self._iter_classified(content_items):
+            count('classified' if is_categorized else 'uncategorized')
             if is_categorized and result:
                 section_id = result.section_id
                 if section_id not in classified_by_section:
                     classified_by_section[section_id] = []
                 classified_by_section[section_id].append(result)
         
+        if self.result_cache:
+            self.result_cache.flush()
+        
+        return classified_by_section
+    
+    @staticmethod
+    def _unpack_item(item) -> Tuple[str, str, Optional[Tuple[int, int]]]:
+        """Normalize a (content, source_file) pair or DocumentChunk"""
+        if isinstance(item, (tuple, list)):
+            content, source_file = item
+            return content, source_file, None
+        return item.content, item.source_file, (item.start_offset, item.end_offset)
+    
+    def _iter_classified(self, content_items: Iterable):
+        """Yield (content, source_file, result, is_categorized) for each item in order"""
+        if np is None:
+            for item in content_items:
+                content, source_file, offsets = self._unpack_item(item)
+                cache_key, entry = self._lookup_cached(content)
+                if entry is not None:
+                    result, is_categorized = self._classification_from_cache(entry, content, source_file, offsets)
+                else:
+                    section_scores = self._score_sections(content)
+                    result, is_categorized = self._finalize_classification(
+                        content, source_file, section_scores, offsets, cache_key
+                    )
+                yield content, source_file, result, is_categorized
+            return
+        
+        iterator = iter(content_items)
+        while True:
+            batch = [self._unpack_item(item) for item in islice(iterator, self.BATCH_SIZE)]
+            if not batch:
+                break
+            
+            lookups = [self._lookup_cached(content) for content, _, _ in batch]
+            misses = [content for (content, _, _), (_, entry) in zip(batch, lookups) if entry is None]
+            miss_scores = iter(self._score_batch(misses)) if misses else iter(())
+            
+            for (content, source_file, offsets), (cache_key, entry) in zip(batch, lookups):
+                if entry is not None:
+                    result, is_categorized = self._classification_from_cache(entry, content, source_file, offsets)
+                else:
+                    section_scores = dict(zip(self._section_ids, next(miss_scores).tolist()))
+                    result, is_categorized = self._finalize_classification(
+                        content, source_file, section_scores, offsets, cache_key
+                    )
+                yield content, source_file, result, is_categorized
+    
+    def parallel_batch_classify_content(
+        self,
+        content_items: Iterable[Tuple[str, str]],
+        workers: Optional[int] = None,
+        shard_size: int = 256
+    ) -> Dict[str, List[ClassificationResult]]:
+        """
+        Classify content items across a pool of worker processes
+        
+        Items are split into contiguous shards; each worker process holds a
+        single pre-initialized classifier for the same template. Shards are
+        merged back in input order, so grouped results and uncategorized
+        records are identical to batch_classify_content.
+        
+        Args:
+            content_items: Iterable of (content, source_file) tuples or DocumentChunks
+            workers: Number of worker processes (defaults to CPU count)
+            shard_size: Number of items sent to a worker at a time
+            
+        Returns:
+            Dictionary mapping section_id to list of ClassificationResults
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            return self.batch_classify_content(content_items)
+        
+        classified_by_section = {}
+        
+        def merge(shard_results, shard_uncategorized):
+            for result in shard_results:
+                classified_by_section.setdefault(result.section_id, []).append(result)
+            self.uncategorized_content.extend(shard_uncategorized)
+        
+        iterator = iter(content_items)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_classification_worker,
+            initargs=(str(self.template_path), self.cache_dir, self.use_result_cache)
+        ) as executor:
+            # Keep a bounded number of shards in flight so lazy inputs stay lazy
+            pending = deque()
+            while True:
+                shard = list(islice(iterator, shard_size))
+                if shard:
+                    pending.append(executor.submit(_classify_shard, shard))
+                if pending and (not shard or len(pending) >= workers * 2):
+                    merge(*pending.popleft().result())
+                if not shard and not pending:
+                    break
+        
         return classified_by_section
     
     def get_uncategorized_content(self) -> List[UncategorizedContent]:
-        """Get all content that couldn't be categorized"""
-        return self.uncategorized_content
+        """
+        Get all content that couldn't be categorized
+        
+        This loads every spilled item back into memory; iterate
+        uncategorized_content to stream them instead.
+        """
+        return list(self.uncategorized_content)
     
     def generate_classification_report(self) -> Dict:
-        """Generate comprehensive classification report"""
-        total_content = len(self.uncategorized_content)
+        """
+        Generate comprehensive classification report
         
+        Uncategorized items are streamed from the spill file one at a time,
+        so only their snippets are held in memory.
+        """
         # Count classified content by section
         section_counts = {}
         for section_id, section in self.sections.items():
@@ -399,6 +640,7 @@ class PRDTemplateClassificationSystem:
         """Export classification system configuration for reuse"""
         return {
             'template_path': str(self.template_path),
+            'template_hash': self.template_model.template_hash if self.template_model else None,
             'sections': {
                 section_id: {
                     'title': section.title,
@@ -413,6 +655,33 @@ class PRDTemplateClassificationSystem:
         }
 
 
+# Per-process classifier used by parallel_batch_classify_content workers
+_worker_classifier: Optional[PRDTemplateClassificationSystem] = None
+
+
+def _init_classification_worker(template_path: str, cache_dir: Optional[str], use_result_cache: bool = True):
+    """Load the template once when a worker process starts"""
+    global _worker_classifier
+    _worker_classifier = PRDTemplateClassificationSystem(template_path, cache_dir, use_result_cache)
+
+
+def _classify_shard(content_items: List) -> Tuple[List[ClassificationResult], List[UncategorizedContent]]:
+    """Classify one shard in a worker and hand back its results and uncategorized records"""
+    classifier = _worker_classifier
+    results = [
+        result
+        for _, _, result, is_categorized in classifier._iter_classified(content_items)
+        if is_categorized and result
+    ]
+    uncategorized = list(classifier.uncategorized_content)
+    # Pool workers exit without running atexit handlers, so release the spill file
+    # and persist new cache entries per shard
+    classifier.uncategorized_content.close()
+    if classifier.result_cache:
+        classifier.result_cache.flush()
+    return results, uncategorized
+
+
 def main():
     """CLI interface for testing the classification system"""
     import argparse
@@ -420,12 +689,24 @@ def main():
     parser = argparse.ArgumentParser(description="PRD Template Classification System")
     parser.add_argument("--template", required=True, help="Path to PRD template file")
     parser.add_argument("--test-content", help="Test content to classify")
+    parser.add_argument("--input-dir", help="Classify every Markdown file under this directory")
+    parser.add_argument("--chunk-tokens", type=int, default=200, help="Target chunk size for --input-dir")
+    parser.add_argument("--query", help="Classify only sections of --input-dir matching this full-text query")
+    parser.add_argument("--skip-duplicates", action="store_true",
+                        help="Skip sections of --input-dir that near-duplicate content kept elsewhere")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for --input-dir")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the classification result cache")
+    parser.add_argument("--uncategorized-file", help="Keep uncategorized content as JSONL at this path")
     parser.add_argument("--export-config", help="Export classification configuration to file")
     
     args = parser.parse_args()
     
     try:
-        classifier = PRDTemplateClassificationSystem(args.template)
+        classifier = PRDTemplateClassificationSystem(
+            args.template,
+            use_result_cache=not args.no_cache,
+            uncategorized_spill_path=args.uncategorized_file
+        )
         
         if args.test_content:
             result, is_categorized = classifier.classify_content(args.test_content)
@@ -436,9 +717,39 @@ def main():
                 print(f"  Reasoning: {result.reasoning}")
             else:
                 print("Content could not be categorized with sufficient confidence")
-                uncategorized = classifier.get_uncategorized_content()
-                if uncategorized:
-                    print(f"Suggestions: {uncategorized[-1].suggestions}")
+                if classifier.uncategorized_content:
+                    print(f"Suggestions: {classifier.uncategorized_content[-1].suggestions}")
+        
+        if args.input_dir:
+            from document_chunker import iter_corpus_chunks
+            
+            if args.query:
+                from corpus_index import CorpusIndex
+                
+                corpus_index = CorpusIndex()
+                corpus_index.update(args.input_dir)
+                chunks = list(corpus_index.iter_matching_chunks(args.query))
+                corpus_index.close()
+            else:
+                chunks = iter_corpus_chunks(args.input_dir, args.chunk_tokens)
+            if args.skip_duplicates:
+                from near_duplicates import NearDuplicateDetector, is_redundant
+                
+                detector = NearDuplicateDetector()
+                detector.add_corpus([args.input_dir])
+                redundant = detector.redundant_sections()
+                print(f"Skipping {sum(len(r) for r in redundant.values())} near-duplicate sections")
+                chunks = (chunk for chunk in chunks
+                          if not is_redundant(redundant, chunk.source_file, chunk.start_offset))
+            classified = classifier.parallel_batch_classify_content(chunks, workers=args.workers)
+            
+            print(f"Classification of {args.input_dir}:")
+            for section_id, section in classifier.sections.items():
+                print(f"  {section.title}: {len(classified.get(section_id, []))} chunks")
+            print(f"  Uncategorized: {len(classifier.uncategorized_content)} chunks")
+            if classifier.result_cache and args.workers <= 1:
+                stats = classifier.result_cache.stats()
+                print(f"  Result cache: {stats['hits']} hits, {stats['misses']} misses")
         
         if args.export_config:
             config = classifier.export_classification_system()
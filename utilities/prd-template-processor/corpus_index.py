@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Corpus Index
+Incremental SQLite FTS5 index over the converted Markdown corpus, keyed by
+file hash and section anchor
+"""
+
+import os
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from document_chunker import DEFAULT_CORPUS_DIR, DocumentChunk, iter_markdown_files, iter_markdown_sections
+from section_index import read_byte_range
+from template_model import DEFAULT_CACHE_DIR, PROJECT_ROOT
+
+INDEX_FILENAME = "corpus-index.sqlite3"
+
+
+@dataclass
+class SearchHit:
+    """One indexed section matching a query"""
+    source_file: str
+    anchor: str
+    heading: str
+    start_offset: int
+    end_offset: int
+    snippet: str
+    score: float  # bm25 rank; lower is more relevant
+
+
+class CorpusIndex:
+    """
+    Full-text index of converted documents at section granularity
+    
+    Every section (heading up to the next heading) is a row in an FTS5
+    table, located by file path, file hash, anchor and byte offsets. The
+    index is incremental: a file is re-read only when its mtime or size
+    changed, and re-indexed only when its content hash changed.
+    
+    Files are keyed by their resolved path relative to the project root
+    (absolute outside it), so relative and absolute spellings of the same
+    file share one entry.
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.index_path = Path(cache_dir) / INDEX_FILENAME
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.index_path), timeout=30)
+        with self._db:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY, file_hash TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS sections (
+                    id INTEGER PRIMARY KEY, path TEXT NOT NULL, file_hash TEXT NOT NULL,
+                    anchor TEXT NOT NULL, heading TEXT NOT NULL,
+                    start_offset INTEGER NOT NULL, end_offset INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS sections_path ON sections(path);
+                CREATE VIRTUAL TABLE IF NOT EXISTS section_text USING fts5(heading, content);
+            """)
+    
+    def update(self, root_dir: str = DEFAULT_CORPUS_DIR) -> dict:
+        """
+        Bring the index up to date with every Markdown file under root_dir
+        
+        Returns:
+            Counts of indexed, unchanged and removed files
+        """
+        counts = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+        present = set()
+        for file_path in iter_markdown_files(root_dir):
+            present.add(index_key(file_path))
+            counts['indexed' if self.index_file(file_path) else 'unchanged'] += 1
+        
+        root_key = index_key(root_dir)
+        prefix = '' if root_key == '.' else os.path.join(root_key, '')
+        for (path,) in self._db.execute("SELECT path FROM files").fetchall():
+            if path.startswith(prefix) and path not in present:
+                self.remove_file(path)
+                counts['removed'] += 1
+        return counts
+    
+    def index_file(self, file_path) -> bool:
+        """Index one file if it changed since it was last indexed; returns True if re-indexed"""
+        path = index_key(file_path)
+        location = resolve_key(path)
+        stat = os.stat(location)
+        row = self._db.execute("SELECT file_hash, mtime_ns, size FROM files WHERE path = ?", (path,)).fetchone()
+        if row and (row[1], row[2]) == (stat.st_mtime_ns, stat.st_size):
+            return False
+        
+        with open(location, 'rb') as f:
+            file_hash = hashlib.sha256(f.read()).hexdigest()
+        
+        with self._db:
+            if row and row[0] == file_hash:
+                # Touched but unchanged: only refresh the stat key
+                self._db.execute(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (stat.st_mtime_ns, stat.st_size, path)
+                )
+                return False
+            
+            self._delete_sections(path)
+            for section in iter_markdown_sections(location):
+                cursor = self._db.execute(
+                    "INSERT INTO sections (path, file_hash, anchor, heading, start_offset, end_offset) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, file_hash, section.anchor, section.heading, section.start_offset, section.end_offset)
+                )
+                self._db.execute(
+                    "INSERT INTO section_text (rowid, heading, content) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, section.heading, section.content)
+                )
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (path, file_hash, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                (path, file_hash, stat.st_mtime_ns, stat.st_size)
+            )
+        return True
+    
+    def remove_file(self, file_path):
+        path = index_key(file_path)
+        with self._db:
+            self._delete_sections(path)
+            self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+    
+    def _delete_sections(self, path: str):
+        self._db.execute(
+            "DELETE FROM section_text WHERE rowid IN (SELECT id FROM sections WHERE path = ?)", (path,)
+        )
+        self._db.execute("DELETE FROM sections WHERE path = ?", (path,))
+    
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """
+        Find sections matching an FTS5 query, most relevant first
+        
+        Args:
+            query: FTS5 query, e.g. 'encryption AND "data at rest"'
+            limit: Maximum number of hits
+        """
+        rows = self._db.execute(
+            "SELECT s.path, s.anchor, s.heading, s.start_offset, s.end_offset, "
+            "snippet(section_text, 1, '[', ']', '…', 12), bm25(section_text) "
+            "FROM section_text JOIN sections s ON s.id = section_text.rowid "
+            "WHERE section_text MATCH ? ORDER BY bm25(section_text) LIMIT ?",
+            (query, limit)
+        ).fetchall()
+        return [SearchHit(*row) for row in rows]
+    
+    def iter_matching_chunks(self, query: str, limit: int = 1000) -> Iterator[DocumentChunk]:
+        """Yield matching sections as DocumentChunks, e.g. to classify only relevant content"""
+        for hit in self.search(query, limit):
+            content = read_byte_range(resolve_key(hit.source_file), hit.start_offset, hit.end_offset)
+            if content.strip():
+                yield DocumentChunk(content.strip(), hit.source_file, hit.start_offset, hit.end_offset, hit.heading)
+    
+    def stats(self) -> dict:
+        return {
+            'files': self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            'sections': self._db.execute("SELECT COUNT(*) FROM sections").fetchone()[0],
+        }
+    
+    def close(self):
+        self._db.close()
+
+
+def index_key(file_path) -> str:
+    """Canonical index path of a file: relative to the project root, or absolute outside it"""
+    resolved = Path(file_path).resolve()
+    try:
+        return str(resolved.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(resolved)
+
+
+def resolve_key(path: str) -> str:
+    """Filesystem location of an index path, independent of the working directory"""
+    return str(PROJECT_ROOT / path)
+
+
+def update_corpus_index(paths: Optional[Iterable[str]] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+                        root_dir: str = DEFAULT_CORPUS_DIR):
+    """Index the given converted files, or refresh the whole corpus when paths is None"""
+    index = CorpusIndex(cache_dir)
+    try:
+        if paths is None:
+            return index.update(root_dir)
+        return {'indexed': sum(1 for path in paths if index.index_file(path))}
+    finally:
+        index.close()
+
+
+def main():
+    """CLI interface for building and querying the corpus index"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Full-text index over converted Markdown documents")
+    parser.add_argument("--input-dir", default=DEFAULT_CORPUS_DIR, help="Directory of converted Markdown files")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory holding the index database")
+    parser.add_argument("--update", action="store_true", help="Refresh the index before querying")
+    parser.add_argument("--query", help="FTS5 query to run against the index")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of hits")
+    
+    args = parser.parse_args()
+    
+    try:
+        index = CorpusIndex(args.cache_dir)
+        if args.update or not args.query:
+            counts = index.update(args.input_dir)
+            stats = index.stats()
+            print(f"Indexed {counts['indexed']} files ({counts['unchanged']} unchanged, {counts['removed']} removed); "
+                  f"{stats['files']} files, {stats['sections']} sections in {index.index_path}")
+        
+        if args.query:
+            for hit in index.search(args.query, args.limit):
+                print(f"{hit.source_file}#{hit.anchor} [{hit.start_offset}-{hit.end_offset}] {hit.heading}")
+                print(f"    {hit.snippet}")
+        index.close()
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
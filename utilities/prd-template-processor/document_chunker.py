@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Document Chunker
+Streams converted Markdown documents into classifiable content units
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_CORPUS_DIR = "input-documents-converted-to-md"
+
+HEADING_PATTERN = re.compile(r'^#{1,6}\s+\S')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+ANCHOR_STRIP_PATTERN = re.compile(r'[^\w\- ]')
+
+
+@dataclass
+class DocumentChunk:
+    """A contiguous slice of a source document sized for classification"""
+    content: str
+    source_file: str
+    start_offset: int  # Byte offset of the first line in the source file
+    end_offset: int    # Byte offset just past the last line
+    heading: str = ""
+
+
+@dataclass
+class MarkdownSection:
+    """A heading and the text up to the next heading, located by byte offsets"""
+    heading: str
+    level: int  # 0 for text before the first heading
+    heading_path: Tuple[str, ...]  # Enclosing headings from the top level down, ending with this one
+    anchor: str  # GitHub-style slug, unique within the file
+    start_offset: int  # Byte offset of the heading line
+    end_offset: int    # Byte offset of the next heading, or end of file
+    content: str = ""
+
+
+def heading_anchor(heading: str, seen: Dict[str, int]) -> str:
+    """GitHub-style anchor for a heading; repeats get -1, -2, ... suffixes"""
+    slug = ANCHOR_STRIP_PATTERN.sub('', heading.strip().lower()).replace(' ', '-')
+    count = seen.get(slug, 0)
+    seen[slug] = count + 1
+    return f"{slug}-{count}" if count else slug
+
+
+def iter_markdown_sections(file_path: str, include_content: bool = True) -> Iterator[MarkdownSection]:
+    """
+    Split a Markdown file into heading sections, streaming it line by line
+    
+    Headings inside fenced code blocks are ignored. Text before the first
+    heading is yielded as a level-0 section when it is not blank.
+    """
+    stack: List[Tuple[int, str]] = []
+    seen: Dict[str, int] = {}
+    lines: List[str] = []
+    current = MarkdownSection("", 0, (), "", 0, 0)
+    offset = 0
+    in_fence = False
+    
+    def finish(section: MarkdownSection) -> Optional[MarkdownSection]:
+        section.end_offset = offset
+        if include_content:
+            section.content = ''.join(lines)
+        if section.level == 0 and not any(line.strip() for line in lines):
+            return None
+        return section
+    
+    with open(file_path, 'rb') as f:
+        for raw_line in f:
+            line = raw_line.decode('utf-8', errors='replace')
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+            
+            if not in_fence and HEADING_PATTERN.match(line):
+                section = finish(current)
+                if section:
+                    yield section
+                
+                level = len(line) - len(line.lstrip('#'))
+                heading = line.lstrip('#').strip()
+                while stack and stack[-1][0] >= level:
+                    stack.pop()
+                stack.append((level, heading))
+                current = MarkdownSection(
+                    heading, level, tuple(title for _, title in stack), heading_anchor(heading, seen), offset, offset
+                )
+                lines = []
+            
+            if include_content:
+                lines.append(line)
+            elif current.level == 0 and line.strip():
+                lines = [line]  # Only whether the preamble is blank matters
+            offset += len(raw_line)
+    
+    section = finish(current)
+    if section:
+        yield section
+
+
+def iter_markdown_files(root_dir: str = DEFAULT_CORPUS_DIR) -> Iterator[Path]:
+    """Walk a directory tree and yield Markdown files in a stable order"""
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith('.md'):
+                yield Path(dirpath) / filename
+
+
+def chunk_markdown_file(
+    file_path: str,
+    target_tokens: int = 200,
+    max_tokens: Optional[int] = None
+) -> Iterator[DocumentChunk]:
+    """
+    Split a Markdown file into chunks at heading and paragraph boundaries
+    
+    The file is read line by line, so only the chunk being built is held
+    in memory. A heading always starts a new chunk; paragraphs are grouped
+    until the chunk reaches target_tokens. Paragraphs longer than
+    max_tokens (default: twice the target) are split at line boundaries.
+    Tokens are whitespace-separated words, the same unit the classifier
+    uses for length normalization.
+    
+    Args:
+        file_path: Markdown file to chunk
+        target_tokens: Preferred chunk size in tokens
+        max_tokens: Hard upper bound before a paragraph is split
+    
+    Yields:
+        DocumentChunk with byte offsets into the source file
+    """
+    max_tokens = max_tokens or target_tokens * 2
+    source_file = str(file_path)
+    
+    lines: List[str] = []
+    tokens = 0
+    start = 0
+    end = 0
+    offset = 0
+    heading = ""
+    in_fence = False
+    
+    def flush() -> Optional[DocumentChunk]:
+        content = ''.join(lines).strip()
+        if not content:
+            return None
+        return DocumentChunk(content, source_file, start, end, heading)
+    
+    with open(file_path, 'rb') as f:
+        for raw_line in f:
+            line = raw_line.decode('utf-8', errors='replace')
+            line_start = offset
+            offset += len(raw_line)
+            
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+            
+            is_heading = not in_fence and HEADING_PATTERN.match(line) is not None
+            is_blank = not line.strip()
+            
+            # Headings always open a new chunk; paragraph breaks close one once it is big enough
+            if is_heading or (is_blank and tokens >= target_tokens) or tokens >= max_tokens:
+                chunk = flush()
+                if chunk:
+                    yield chunk
+                lines, tokens, start = [], 0, line_start
+                if is_heading:
+                    heading = line.lstrip('#').strip()
+            
+            if not lines and is_blank:
+                start = offset
+                continue
+            
+            lines.append(line)
+            tokens += len(line.split())
+            if not is_blank:
+                end = offset
+    
+    chunk = flush()
+    if chunk:
+        yield chunk
+
+
+def iter_corpus_chunks(
+    root_dir: str = DEFAULT_CORPUS_DIR,
+    target_tokens: int = 200,
+    max_tokens: Optional[int] = None
+) -> Iterator[DocumentChunk]:
+    """Lazily chunk every Markdown file under root_dir"""
+    for file_path in iter_markdown_files(root_dir):
+        yield from chunk_markdown_file(file_path, target_tokens, max_tokens)
+
+
+def main():
+    """CLI interface for inspecting chunker output"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Chunk converted Markdown documents for classification")
+    parser.add_argument("--input-dir", default=DEFAULT_CORPUS_DIR, help="Directory of converted Markdown files")
+    parser.add_argument("--target-tokens", type=int, default=200, help="Preferred chunk size in tokens")
+    parser.add_argument("--max-tokens", type=int, help="Maximum chunk size before splitting a paragraph")
+    
+    args = parser.parse_args()
+    
+    total_chunks = 0
+    for chunk in iter_corpus_chunks(args.input_dir, args.target_tokens, args.max_tokens):
+        total_chunks += 1
+        print(f"{chunk.source_file}:{chunk.start_offset}-{chunk.end_offset} "
+              f"[{chunk.heading[:60]}] {len(chunk.content.split())} tokens")
+    
+    print(f"Total chunks: {total_chunks}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
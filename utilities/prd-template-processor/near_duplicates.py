@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection
+MinHash signatures over section shingles with LSH banding, to flag redundant
+content across converted documents and their versions before it is processed
+"""
+
+import os
+import re
+import random
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from document_chunker import DEFAULT_CORPUS_DIR, iter_markdown_files, iter_markdown_sections
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; signatures fall back to pure Python
+    np = None
+
+MERSENNE_PRIME = (1 << 31) - 1
+WORD_PATTERN = re.compile(r'\w+')
+
+
+@dataclass
+class SectionSignature:
+    """MinHash signature of one section"""
+    source_file: str
+    anchor: str
+    heading: str
+    start_offset: int
+    end_offset: int
+    signature: Tuple[int, ...]
+
+
+@dataclass
+class DuplicatePair:
+    """Two sections whose estimated Jaccard similarity reaches the threshold"""
+    first: SectionSignature
+    second: SectionSignature
+    similarity: float
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-duplicate sections with MinHash and locality-sensitive hashing
+    
+    Each section is reduced to word shingles of shingle_size words, and
+    its MinHash signature estimates Jaccard similarity between shingle
+    sets. Signatures are split into bands; sections sharing any band are
+    candidates, and a candidate pair is reported when the fraction of
+    agreeing signature values reaches threshold. Sections shorter than
+    min_words are ignored.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        min_words: int = 20,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_words = min_words
+        
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._a_array = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_array = np.array(self._b, dtype=np.uint64)[:, None]
+        
+        self.sections: List[SectionSignature] = []
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    
+    def shingle_hashes(self, text: str) -> Set[int]:
+        words = WORD_PATTERN.findall(text.lower())
+        if len(words) < self.min_words:
+            return set()
+        k = min(self.shingle_size, len(words))
+        return {
+            int.from_bytes(hashlib.blake2b(' '.join(words[i:i + k]).encode('utf-8'), digest_size=4).digest(),
+                           'little') % MERSENNE_PRIME
+            for i in range(len(words) - k + 1)
+        }
+    
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of text, or None if it is too short to compare"""
+        hashes = self.shingle_hashes(text)
+        if not hashes:
+            return None
+        if np is not None:
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))[None, :]
+            # a, b and the hashes are below 2**31, so a * h + b cannot overflow 64 bits
+            permuted = (self._a_array * values + self._b_array) % MERSENNE_PRIME
+            return tuple(int(v) for v in permuted.min(axis=1))
+        return tuple(
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+    
+    def add_file(self, file_path: str) -> int:
+        """Add every section of a Markdown file; returns how many were long enough to index"""
+        added = 0
+        for section in iter_markdown_sections(str(file_path)):
+            signature = self.signature(section.content)
+            if signature is None:
+                continue
+            self._add(SectionSignature(
+                str(file_path), section.anchor, section.heading,
+                section.start_offset, section.end_offset, signature
+            ))
+            added += 1
+        return added
+    
+    def add_corpus(self, root_dirs: Iterable[str] = (DEFAULT_CORPUS_DIR,)) -> int:
+        return sum(self.add_file(path) for root_dir in root_dirs for path in iter_markdown_files(root_dir))
+    
+    def _add(self, section: SectionSignature):
+        position = len(self.sections)
+        self.sections.append(section)
+        for band in range(self.bands):
+            chunk = section.signature[band * self.rows:(band + 1) * self.rows]
+            key = b''.join(value.to_bytes(4, 'little') for value in chunk)
+            self._buckets[(band, key)].append(position)
+    
+    def similarity(self, first: SectionSignature, second: SectionSignature) -> float:
+        """Estimated Jaccard similarity of two sections"""
+        agreeing = sum(1 for x, y in zip(first.signature, second.signature) if x == y)
+        return agreeing / self.num_perm
+    
+    def find_duplicates(self) -> List[DuplicatePair]:
+        """All section pairs at or above the similarity threshold, most similar first"""
+        candidates: Set[Tuple[int, int]] = set()
+        for members in self._buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+        
+        pairs = []
+        for i, j in sorted(candidates):
+            similarity = self.similarity(self.sections[i], self.sections[j])
+            if similarity >= self.threshold:
+                pairs.append(DuplicatePair(self.sections[i], self.sections[j], similarity))
+        pairs.sort(key=lambda pair: -pair.similarity)
+        return pairs
+    
+    def clusters(self) -> List[List[SectionSignature]]:
+        """
+        Groups of mutually redundant sections
+        
+        The first member of each group is the one to keep: the section from
+        the most recently modified file, so the latest _vN version wins.
+        """
+        parent = list(range(len(self.sections)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        positions = {id(section): position for position, section in enumerate(self.sections)}
+        for pair in self.find_duplicates():
+            parent[find(positions[id(pair.first)])] = find(positions[id(pair.second)])
+        
+        groups: Dict[int, List[SectionSignature]] = defaultdict(list)
+        for position, section in enumerate(self.sections):
+            groups[find(position)].append(section)
+        
+        mtimes = {}
+        for section in self.sections:
+            if section.source_file not in mtimes:
+                try:
+                    mtimes[section.source_file] = os.stat(section.source_file).st_mtime_ns
+                except OSError:
+                    mtimes[section.source_file] = 0
+        
+        return [
+            sorted(group, key=lambda s: (-mtimes[s.source_file], s.source_file, s.start_offset))
+            for group in groups.values() if len(group) > 1
+        ]
+    
+    def redundant_sections(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Byte ranges, per file, of sections that duplicate a kept section elsewhere"""
+        redundant: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for group in self.clusters():
+            for section in group[1:]:
+                redundant[section.source_file].append((section.start_offset, section.end_offset))
+        return dict(redundant)
+
+
+def is_redundant(redundant: Dict[str, List[Tuple[int, int]]], source_file: str, start_offset: int) -> bool:
+    """Whether a chunk starting at start_offset lies in a redundant section"""
+    return any(start <= start_offset < end for start, end in redundant.get(source_file, ()))
+
+
+def main():
+    """CLI interface for reporting near-duplicate sections"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Report near-duplicate sections across converted documents")
+    parser.add_argument("--input-dir", nargs='+', default=[DEFAULT_CORPUS_DIR],
+                        help="Directories of Markdown files to compare")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Minimum estimated Jaccard similarity")
+    parser.add_argument("--min-words", type=int, default=20, help="Ignore sections shorter than this")
+    
+    args = parser.parse_args()
+    
+    detector = NearDuplicateDetector(threshold=args.threshold, min_words=args.min_words)
+    indexed = detector.add_corpus(args.input_dir)
+    clusters = detector.clusters()
+    
+    print(f"Compared {indexed} sections; {len(clusters)} groups of near-duplicates")
+    for group in clusters:
+        keep = group[0]
+        print(f"\n  keep      {keep.source_file}#{keep.anchor}")
+        for section in group[1:]:
+            print(f"  redundant {section.source_file}#{section.anchor} "
+                  f"({detector.similarity(keep, section):.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
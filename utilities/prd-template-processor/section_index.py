@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Section Index
+Persistent heading/offset index per converted Markdown file, so one section
+can be read without reading the whole document
+"""
+
+import os
+import json
+import mmap
+import hashlib
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from document_chunker import iter_markdown_sections
+from template_model import DEFAULT_CACHE_DIR
+
+# Bump when the index layout changes so stale indexes are rebuilt
+SECTION_INDEX_VERSION = 1
+
+# Per-process indexes: resolved path -> ((mtime_ns, size), entries)
+_loaded_indexes: Dict[str, Tuple[Tuple[int, int], List["SectionIndexEntry"]]] = {}
+
+
+@dataclass
+class SectionIndexEntry:
+    """Location of one section within its file"""
+    heading_path: List[str]
+    anchor: str
+    level: int
+    start_offset: int
+    end_offset: int          # Start of the next heading
+    subtree_end_offset: int  # Start of the next heading at the same or a higher level
+
+
+def load_section_index(doc: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> List[SectionIndexEntry]:
+    """
+    Load the section index for a Markdown file, scanning it at most once
+    
+    The index is memoized per process and stored in cache_dir; it is
+    rebuilt only when the file's mtime or size changed. Pass
+    cache_dir=None to skip the on-disk index.
+    """
+    path = Path(doc).resolve()
+    stat = path.stat()
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    
+    loaded = _loaded_indexes.get(str(path))
+    if loaded and loaded[0] == stat_key:
+        return loaded[1]
+    
+    index_file = _index_file(Path(cache_dir), path) if cache_dir else None
+    entries = None
+    if index_file and index_file.exists():
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == SECTION_INDEX_VERSION and tuple(cached['stat']) == stat_key:
+                entries = [SectionIndexEntry(**entry) for entry in cached['sections']]
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            entries = None
+    
+    if entries is None:
+        entries = _scan_index(path)
+        if index_file:
+            _write_index(index_file, stat_key, entries)
+    
+    _loaded_indexes[str(path)] = (stat_key, entries)
+    return entries
+
+
+def _scan_index(path: Path) -> List[SectionIndexEntry]:
+    entries = [
+        SectionIndexEntry(list(section.heading_path), section.anchor, section.level,
+                          section.start_offset, section.end_offset, section.end_offset)
+        for section in iter_markdown_sections(str(path), include_content=False)
+    ]
+    # A section's subtree runs until the next heading that is not nested inside it
+    open_entries: List[SectionIndexEntry] = []
+    for entry in entries:
+        if entry.level == 0:
+            continue  # Text before the first heading has no subsections
+        while open_entries and open_entries[-1].level >= entry.level:
+            open_entries.pop().subtree_end_offset = entry.start_offset
+        open_entries.append(entry)
+    for entry in open_entries:
+        entry.subtree_end_offset = entries[-1].end_offset
+    return entries
+
+
+def _index_file(cache_dir: Path, path: Path) -> Path:
+    key = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:16]
+    return cache_dir / "section-index" / f"{key}.json"
+
+
+def _write_index(index_file: Path, stat_key: Tuple[int, int], entries: List[SectionIndexEntry]):
+    """Atomically write the index; persisting is best effort"""
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': SECTION_INDEX_VERSION,
+                'stat': list(stat_key),
+                'sections': [asdict(entry) for entry in entries]
+            }, f, ensure_ascii=False)
+        os.replace(tmp_file, index_file)
+    except OSError:
+        pass
+
+
+def find_section(
+    doc: str,
+    heading_path: Union[str, Sequence[str]],
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+) -> Optional[SectionIndexEntry]:
+    """
+    Locate a section by heading path or anchor
+    
+    heading_path is a sequence of headings, a string of headings joined by
+    " > ", or "#anchor". A path may omit leading headings: ("Risks",)
+    matches the first section whose path ends with "Risks".
+    """
+    entries = load_section_index(doc, cache_dir)
+    if isinstance(heading_path, str):
+        if heading_path.startswith('#'):
+            anchor = heading_path[1:]
+            return next((entry for entry in entries if entry.anchor == anchor), None)
+        heading_path = [part.strip() for part in heading_path.split(' > ')]
+    
+    wanted = list(heading_path)
+    exact = next((entry for entry in entries if entry.heading_path == wanted), None)
+    if exact is not None:
+        return exact
+    return next((entry for entry in entries if entry.heading_path[-len(wanted):] == wanted), None)
+
+
+def read_byte_range(doc: str, start: int, end: int) -> str:
+    """Read bytes start:end of a file through mmap, without reading the rest of it"""
+    if end <= start:
+        return ""
+    with open(doc, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[start:end].decode('utf-8', errors='replace')
+
+
+def get_section(
+    doc: str,
+    heading_path: Union[str, Sequence[str]],
+    include_subsections: bool = True,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+) -> Optional[str]:
+    """
+    Read one section of a Markdown file, heading line included
+    
+    Args:
+        doc: Markdown file
+        heading_path: Heading path or "#anchor" (see find_section)
+        include_subsections: Include nested subsections
+        cache_dir: Directory for the persistent index, or None
+    
+    Returns:
+        The section text, or None if no section matches
+    """
+    entry = find_section(doc, heading_path, cache_dir)
+    if entry is None:
+        return None
+    end = entry.subtree_end_offset if include_subsections else entry.end_offset
+    return read_byte_range(doc, entry.start_offset, end)
+
+
+def main():
+    """CLI interface for listing and reading sections"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Read single sections of converted Markdown documents")
+    parser.add_argument("document", help="Markdown file")
+    parser.add_argument("--section", help='Heading path ("Parent > Child") or "#anchor"; lists sections if omitted')
+    parser.add_argument("--no-subsections", action="store_true", help="Stop at the first nested heading")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for the section index")
+    
+    args = parser.parse_args()
+    
+    try:
+        if not args.section:
+            for entry in load_section_index(args.document, args.cache_dir):
+                print(f"{'  ' * max(entry.level - 1, 0)}{' > '.join(entry.heading_path) or '(preamble)'} "
+                      f"#{entry.anchor} [{entry.start_offset}-{entry.subtree_end_offset}]")
+            return 0
+        
+        content = get_section(args.document, args.section, not args.no_subsections, args.cache_dir)
+        if content is None:
+            print(f"Error: section not found: {args.section}")
+            return 1
+        print(content, end='')
+    except OSError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+PRD Template Model
+Compiles templates/PRD-template.md into a cached section model shared by the
+classification system and the template validator
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+
+# Bump when parsing rules change so stale caches are rebuilt
+PARSER_VERSION = 2
+
+# Caches live under the project root, wherever the tools are run from
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_DIR = str(PROJECT_ROOT / ".ai" / "cache")
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+?)\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+NUMBERED_TITLE_PATTERN = re.compile(r'^(\d+)\.\s+(.+)$')
+FOCUS_PATTERN = re.compile(r'^\*\*Content Aggregation Focus\*\*:\s*(.+)$', re.IGNORECASE)
+BULLET_PATTERN = re.compile(r'^\s*[-*]\s+(.+)$')
+BOLD_LABEL_PATTERN = re.compile(r'\*\*(?:\d+(?:\.\d+)*\s+)?([^*]+?)\*\*')
+ACRONYM_PATTERN = re.compile(r'\b[A-Z][A-Za-z0-9]*[A-Z][A-Za-z0-9]*(?:-[A-Z0-9]+)*\b')
+WORD_PATTERN = re.compile(r'\w+(?:-\w+)*')
+
+# Public section IDs by template title; configs and workflows refer to sections by these IDs,
+# so they stay fixed when a title is reworded. Titles not listed get an ID derived from the title.
+SECTION_IDS = {
+    'DOCUMENT FOUNDATION & CONTEXT': 'document_foundation_context',
+    'EXECUTIVE SUMMARY & STRATEGIC VISION': 'executive_summary_strategic_vision',
+    'BUSINESS CONTEXT & MARKET ANALYSIS': 'business_context_market_analysis',
+    'USER RESEARCH & EXPERIENCE DESIGN': 'user_research_experience_design',
+    'FUNCTIONAL REQUIREMENTS & FEATURE SPECIFICATIONS': 'functional_requirements_features',
+    'NON-FUNCTIONAL REQUIREMENTS (NFRS)': 'non_functional_requirements',
+    'AI/ML INTEGRATION & ADVANCED CAPABILITIES': 'aiml_integration_capabilities',
+    'TECHNICAL ARCHITECTURE & IMPLEMENTATION': 'technical_architecture_implementation',
+    'SUCCESS METRICS & PERFORMANCE MEASUREMENT': 'success_metrics_performance',
+    'DEVELOPMENT METHODOLOGY & PROJECT PLANNING': 'development_methodology_planning',
+    'QUALITY ASSURANCE & TESTING STRATEGY': 'quality_assurance_testing',
+    'LAUNCH STRATEGY & GO-TO-MARKET': 'launch_strategy_gtm',
+    'GOVERNANCE, COMPLIANCE & RISK MANAGEMENT': 'governance_compliance_risk',
+    'DEPENDENCIES, ASSUMPTIONS & CONSTRAINTS': 'dependencies_assumptions_constraints',
+    'SUPPORTING DOCUMENTATION & APPENDICES': 'supporting_documentation_appendices',
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into',
+    'is', 'of', 'on', 'or', 'the', 'to', 'vs', 'with', 'within',
+}
+
+
+@dataclass
+class TemplateHeading:
+    """A structural heading the generated PRD must reproduce"""
+    title: str
+    level: int
+    order: int
+    required: bool = True
+
+
+@dataclass
+class TemplateSectionSpec:
+    """A numbered content section with its classification vocabulary"""
+    id: str
+    title: str
+    content_focus: str
+    keywords: List[str] = field(default_factory=list)
+    triggers: List[str] = field(default_factory=list)
+    content_types: List[str] = field(default_factory=list)
+    priority: int = 0
+
+
+@dataclass
+class TemplateModel:
+    """Compiled representation of the PRD template"""
+    template_path: str
+    template_hash: str
+    model_hash: str
+    headings: List[TemplateHeading] = field(default_factory=list)
+    sections: List[TemplateSectionSpec] = field(default_factory=list)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TemplateModel':
+        return cls(
+            template_path=data['template_path'],
+            template_hash=data['template_hash'],
+            model_hash=data['model_hash'],
+            headings=[TemplateHeading(**h) for h in data['headings']],
+            sections=[TemplateSectionSpec(**s) for s in data['sections']]
+        )
+
+
+def _unique(items: List[str]) -> List[str]:
+    """Deduplicate case-insensitively, keeping the first spelling"""
+    seen = set()
+    result = []
+    for item in items:
+        key = item.lower()
+        if item and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def _significant_words(text: str) -> List[str]:
+    """Content words of a title or focus line, hyphenated terms kept whole"""
+    words = []
+    for word in WORD_PATTERN.findall(text.replace('/', ' ')):
+        if word.lower() in STOPWORDS or word.isdigit() or len(word) < 2:
+            continue
+        # Titles are upper case throughout, so only two-letter words ("AI", "ML") stay acronyms
+        words.append(word if len(word) == 2 and word.isupper() else word.lower())
+    return words
+
+
+def _section_id(title: str) -> str:
+    """Section ID from SECTION_IDS, else derived from the title, e.g. 'technical_architecture_implementation'"""
+    known = SECTION_IDS.get(' '.join(title.upper().split()))
+    if known:
+        return known
+    words = re.findall(r'[a-z0-9]+', title.lower())
+    return '_'.join(words)
+
+
+def _compile_section(number: int, title: str, body: List[str]) -> TemplateSectionSpec:
+    """Derive a section's classification vocabulary from its template body"""
+    content_focus = ""
+    bullet_labels = []
+    acronyms = []
+    
+    for line in body:
+        focus_match = FOCUS_PATTERN.match(line.strip())
+        if focus_match:
+            content_focus = focus_match.group(1).strip()
+            continue
+        
+        bullet_match = BULLET_PATTERN.match(line)
+        if not bullet_match:
+            continue
+        bullet = bullet_match.group(1)
+        
+        # "**Performance**: ..." and "Technology stack: ..." both name a topic
+        bold = BOLD_LABEL_PATTERN.match(bullet)
+        if bold:
+            label = bold.group(1)
+        elif ':' in bullet:
+            label = bullet.split(':', 1)[0]
+        else:
+            label = ""
+        label = label.split('(', 1)[0].strip().rstrip(':')
+        if 1 <= len(label.split()) <= 4:
+            bullet_labels.append(label)
+        
+        # Two-letter acronyms ("IT", "EO") would match ordinary words case-insensitively
+        acronyms.extend(a for a in ACRONYM_PATTERN.findall(bullet) if len(a) >= 3)
+    
+    focus_phrases = [phrase.strip() for phrase in content_focus.split(',') if phrase.strip()]
+    
+    keywords = _unique(_significant_words(title) + _significant_words(content_focus))
+    triggers = _unique(
+        [phrase.lower() for phrase in focus_phrases if len(phrase.split()) > 1]
+        + [label.lower() if not label.isupper() else label for label in bullet_labels]
+        + acronyms
+    )
+    content_types = _unique([
+        '_'.join(_significant_words(phrase.lower()))
+        for phrase in focus_phrases
+        if _significant_words(phrase)
+    ])
+    
+    return TemplateSectionSpec(
+        id=_section_id(title),
+        title=title,
+        content_focus=content_focus,
+        keywords=keywords,
+        triggers=triggers,
+        content_types=content_types,
+        priority=number
+    )
+
+
+def parse_template(content: str, template_path: str = "") -> TemplateModel:
+    """
+    Parse PRD template Markdown into a TemplateModel
+    
+    Structural headings are the upper-case headings down to level 3; the
+    numbered level-3 headings ("### 5. FUNCTIONAL REQUIREMENTS ...") are the
+    content sections. Each section's keywords, triggers and content types
+    come from its title, its "Content Aggregation Focus" line and the topic
+    labels and acronyms in its bullets.
+    """
+    template_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    headings: List[TemplateHeading] = []
+    sections: List[TemplateSectionSpec] = []
+    
+    current: Optional[Tuple[int, str]] = None
+    body: List[str] = []
+    in_fence = False
+    
+    def close_section():
+        if current:
+            sections.append(_compile_section(current[0], current[1], body))
+    
+    for line in content.split('\n'):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        heading_match = None if in_fence else HEADING_PATTERN.match(line)
+        
+        if not heading_match:
+            body.append(line)
+            continue
+        
+        level = len(heading_match.group(1))
+        title = heading_match.group(2)
+        
+        if level <= 3:
+            close_section()
+            current, body = None, []
+            
+            if re.search(r'[A-Z]', title) and title == title.upper():
+                headings.append(TemplateHeading(title, level, len(headings) + 1))
+            
+            numbered = NUMBERED_TITLE_PATTERN.match(title)
+            if level == 3 and numbered:
+                current = (int(numbered.group(1)), numbered.group(2).strip())
+        else:
+            body.append(line)
+    
+    close_section()
+    
+    model_hash = hashlib.sha256(f"{PARSER_VERSION}:{template_hash}".encode('utf-8')).hexdigest()
+    return TemplateModel(
+        template_path=str(template_path),
+        template_hash=template_hash,
+        model_hash=model_hash,
+        headings=headings,
+        sections=sections
+    )
+
+
+# In-process cache: resolved template path -> ((mtime_ns, size), TemplateModel)
+_loaded_models: Dict[str, Tuple[Tuple[int, int], TemplateModel]] = {}
+
+
+def _cache_file(cache_dir: Path, template_path: Path) -> Path:
+    key = hashlib.sha1(str(template_path).encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f"template-model-{key}.json"
+
+
+def _write_cache(cache_file: Path, stat_key: Tuple[int, int], model: TemplateModel):
+    """Atomically write the serialized model; caching is best effort"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'parser_version': PARSER_VERSION,
+                'template_mtime_ns': stat_key[0],
+                'template_size': stat_key[1],
+                'model': asdict(model)
+            }, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+
+def load_template_model(template_path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> TemplateModel:
+    """
+    Load the compiled model for a template, parsing it at most once
+    
+    The model is memoized per process and serialized to cache_dir. A cached
+    model is reused while the template's mtime and size are unchanged; if
+    they changed, the content hash decides whether it must be re-parsed.
+    Pass cache_dir=None to skip the on-disk cache.
+    """
+    path = Path(template_path).resolve()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"PRD template not found at {template_path}")
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    
+    loaded = _loaded_models.get(str(path))
+    if loaded and loaded[0] == stat_key:
+        return loaded[1]
+    
+    cache_file = _cache_file(Path(cache_dir), path) if cache_dir else None
+    cached = None
+    if cache_file and cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('parser_version') != PARSER_VERSION:
+                cached = None
+        except (OSError, json.JSONDecodeError):
+            cached = None
+    
+    if cached and (cached['template_mtime_ns'], cached['template_size']) == stat_key:
+        model = TemplateModel.from_dict(cached['model'])
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        template_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        
+        if cached and cached['model']['template_hash'] == template_hash:
+            # Touched but unchanged: keep the model, refresh the stat key
+            model = TemplateModel.from_dict(cached['model'])
+        else:
+            model = parse_template(content, str(template_path))
+        
+        if cache_file:
+            _write_cache(cache_file, stat_key, model)
+    
+    _loaded_models[str(path)] = (stat_key, model)
+    return model
+
+
+def main():
+    """CLI interface for inspecting the compiled template model"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PRD Template Model")
+    parser.add_argument("--template", required=True, help="Path to PRD template file")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for the compiled model cache")
+    
+    args = parser.parse_args()
+    
+    try:
+        model = load_template_model(args.template, args.cache_dir)
+        print(json.dumps(asdict(model), indent=2, ensure_ascii=False))
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,11 +4,27 @@ PRD Template Validator
 Validates PRD files against the mandatory template structure
 """
 
+import os
 import re
 import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple, Optional
+from dataclasses import dataclass, field, asdict
+
+from template_model import DEFAULT_CACHE_DIR, TemplateModel, load_template_model, parse_template
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+# HEADING_PATTERN applied to a whole document; a heading line never spans a newline
+HEADING_LINE_PATTERN = re.compile(r'^#{1,6}[^\S\n]+.+$', re.MULTILINE)
+TABLE_DELIMITER_PATTERN = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)+\|?\s*$')
+LIST_ITEM_PATTERN = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+\S')
+
+VALIDATION_CACHE_FILENAME = "validation-results.json"
+
+# Bump when validation checks or result fields change so cached results are recomputed
+VALIDATION_RESULT_VERSION = 2
 
 @dataclass
 class ValidationResult:
@@ -29,48 +45,59 @@ class TemplateSection:
     required: bool = True
     order: int = 0
 
+@dataclass
+class SectionEntry:
+    """A heading found in the PRD and the content that follows it"""
+    title: str
+    level: int
+    start_offset: int = 0    # Byte offset of the heading line
+    end_offset: int = 0      # Byte offset of the next heading (or end of file)
+    content_length: int = 0  # Bytes of content below the heading
+    content_lines: int = 0   # Non-blank lines before the next heading
+    word_count: int = 0
+    table_count: int = 0
+    list_item_count: int = 0
+
+@dataclass
+class PRDSectionIndex:
+    """Heading index of a PRD, built in a single pass and shared by all checks"""
+    sections: List[SectionEntry]
+    content_lower: str
+
 class PRDTemplateValidator:
     """Validates PRD files against template structure"""
     
-    def __init__(self, template_path: str):
+    def __init__(self, template_path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
         self.template_path = Path(template_path)
+        self.cache_dir = cache_dir
+        self.template_model: Optional[TemplateModel] = None
         self.expected_sections = self._load_template_structure()
+        self._expected_titles = {section.title for section in self.expected_sections}
+        self._expected_order = {section.title: section.order for section in self.expected_sections}
+        
+        # Index of the most recently validated content, reused by validate_template_compliance
+        self._indexed_content: Optional[str] = None
+        self._section_index: Optional[PRDSectionIndex] = None
     
     def _load_template_structure(self) -> List[TemplateSection]:
-        """Load expected section structure from template"""
+        """Load expected section structure from the compiled template model"""
         try:
-            with open(self.template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-            return self._parse_template_structure(template_content)
+            self.template_model = load_template_model(str(self.template_path), self.cache_dir)
         except FileNotFoundError:
             raise FileNotFoundError(f"Template file not found: {self.template_path}")
+        return self._sections_from_model(self.template_model)
     
     def _parse_template_structure(self, content: str) -> List[TemplateSection]:
         """Parse template to extract expected section structure"""
-        # Define expected sections based on the actual PRD template structure
-        expected_sections = [
-            TemplateSection("MASTER PRD CLASSIFICATION GUIDE", 1, True, 1),
-            TemplateSection("OPTIMAL PRD STRUCTURE FOR ATLAS-DS", 2, True, 2),
-            TemplateSection("1. DOCUMENT FOUNDATION & CONTEXT", 3, True, 3),
-            TemplateSection("2. EXECUTIVE SUMMARY & STRATEGIC VISION", 3, True, 4),
-            TemplateSection("3. BUSINESS CONTEXT & MARKET ANALYSIS", 3, True, 5),
-            TemplateSection("4. USER RESEARCH & EXPERIENCE DESIGN", 3, True, 6),
-            TemplateSection("5. FUNCTIONAL REQUIREMENTS & FEATURE SPECIFICATIONS", 3, True, 7),
-            TemplateSection("6. NON-FUNCTIONAL REQUIREMENTS (NFRS)", 3, True, 8),
-            TemplateSection("7. AI/ML INTEGRATION & ADVANCED CAPABILITIES", 3, True, 9),
-            TemplateSection("8. TECHNICAL ARCHITECTURE & IMPLEMENTATION", 3, True, 10),
-            TemplateSection("9. SUCCESS METRICS & PERFORMANCE MEASUREMENT", 3, True, 11),
-            TemplateSection("10. DEVELOPMENT METHODOLOGY & PROJECT PLANNING", 3, True, 12),
-            TemplateSection("11. QUALITY ASSURANCE & TESTING STRATEGY", 3, True, 13),
-            TemplateSection("12. LAUNCH STRATEGY & GO-TO-MARKET", 3, True, 14),
-            TemplateSection("13. GOVERNANCE, COMPLIANCE & RISK MANAGEMENT", 3, True, 15),
-            TemplateSection("14. DEPENDENCIES, ASSUMPTIONS & CONSTRAINTS", 3, True, 16),
-            TemplateSection("15. SUPPORTING DOCUMENTATION & APPENDICES", 3, True, 17),
-            TemplateSection("DOCUMENT PROCESSING WORKFLOW FOR ATLAS-DS", 2, True, 18),
-            TemplateSection("ATLAS-DS SPECIFIC CONSIDERATIONS", 2, True, 19),
+        return self._sections_from_model(parse_template(content, str(self.template_path)))
+    
+    @staticmethod
+    def _sections_from_model(model: TemplateModel) -> List[TemplateSection]:
+        """Expected sections are the template's structural (upper-case) headings"""
+        return [
+            TemplateSection(heading.title, heading.level, heading.required, heading.order)
+            for heading in model.headings
         ]
-        
-        return expected_sections
     
     def validate_prd_file(self, prd_file_path: str) -> ValidationResult:
         """
@@ -103,18 +130,130 @@ class PRDTemplateValidator:
         
         return self._perform_validation(prd_content, str(prd_path))
     
+    def validate_prd_files(
+        self,
+        prd_file_paths: List[str],
+        workers: Optional[int] = None,
+        read_file: Optional[Callable[[str], bytes]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Validate several PRD files, reusing cached results for unchanged files
+        
+        Results are cached in cache_dir by SHA-256 of the file content and
+        the template model hash, so a file is only re-validated when it or
+        the template changes. Files that need validation are spread over a
+        process pool when workers > 1.
+        
+        Args:
+            prd_file_paths: PRD files to validate
+            workers: Number of worker processes (defaults to CPU count)
+            read_file: Returns a path's content; defaults to reading the file
+            
+        Returns:
+            Dictionary mapping each path to {'file_hash', 'cached', 'result'}
+        """
+        cache = self._load_validation_cache()
+        outcomes: Dict[str, Dict] = {}
+        pending: List[Tuple[str, str, str]] = []  # (path, file_hash, content)
+        
+        for prd_file_path in prd_file_paths:
+            try:
+                raw = read_file(prd_file_path) if read_file else self._read_bytes(prd_file_path)
+            except OSError as e:
+                outcomes[prd_file_path] = {
+                    'file_hash': None,
+                    'cached': False,
+                    'result': validation_result_to_dict(ValidationResult(
+                        is_valid=False,
+                        score=0.0,
+                        errors=[f"PRD file not found: {prd_file_path}" if isinstance(e, FileNotFoundError)
+                                else f"Error reading PRD file: {e}"]
+                    ))
+                }
+                continue
+            
+            file_hash = hashlib.sha256(raw).hexdigest()
+            cached = cache.get(self._validation_cache_key(file_hash))
+            if cached is not None:
+                outcomes[prd_file_path] = {'file_hash': file_hash, 'cached': True, 'result': cached}
+            else:
+                pending.append((prd_file_path, file_hash, raw.decode('utf-8', errors='replace')))
+        
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(pending)),
+                initializer=_init_validation_worker,
+                initargs=(str(self.template_path), self.cache_dir)
+            ) as executor:
+                results = list(executor.map(_validate_in_worker, [(content, path) for path, _, content in pending]))
+        else:
+            results = [
+                validation_result_to_dict(self._perform_validation(content, path))
+                for path, _, content in pending
+            ]
+        
+        for (path, file_hash, _), result in zip(pending, results):
+            cache[self._validation_cache_key(file_hash)] = result
+            outcomes[path] = {'file_hash': file_hash, 'cached': False, 'result': result}
+        
+        if pending:
+            self._save_validation_cache(cache)
+        
+        # Keep the caller's order
+        return {path: outcomes[path] for path in prd_file_paths}
+    
+    @staticmethod
+    def _read_bytes(path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    def _validation_cache_key(self, file_hash: str) -> str:
+        return f"{VALIDATION_RESULT_VERSION}:{self.template_model.model_hash}:{file_hash}"
+    
+    def _validation_cache_file(self) -> Optional[Path]:
+        return Path(self.cache_dir) / VALIDATION_CACHE_FILENAME if self.cache_dir else None
+    
+    def _load_validation_cache(self) -> Dict[str, Dict]:
+        """Load cached results for the current template model"""
+        cache_file = self._validation_cache_file()
+        if not cache_file or not cache_file.exists():
+            return {}
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        # Results computed against another template or validator version are never valid again
+        prefix = f"{VALIDATION_RESULT_VERSION}:{self.template_model.model_hash}:"
+        return {key: value for key, value in cache.items() if key.startswith(prefix)}
+    
+    def _save_validation_cache(self, cache: Dict[str, Dict]):
+        """Atomically write the result cache; caching is best effort"""
+        cache_file = self._validation_cache_file()
+        if not cache_file:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+    
     def _perform_validation(self, content: str, file_path: str) -> ValidationResult:
         """Perform comprehensive validation of PRD content"""
         result = ValidationResult(is_valid=True, score=0.0)
         
-        # Extract sections from PRD content
-        actual_sections = self._extract_sections(content)
+        # Index headings and section content in one pass
+        index = self._index_sections(content)
         
         # Validate structure
-        self._validate_structure(actual_sections, result)
+        self._validate_structure(index.sections, result)
         
         # Validate content
-        self._validate_content(content, result)
+        self._validate_content(index, result)
         
         # Validate metadata
         self._validate_metadata(content, result)
@@ -125,24 +264,66 @@ class PRDTemplateValidator:
         
         return result
     
-    def _extract_sections(self, content: str) -> List[Tuple[str, int]]:
-        """Extract section headings and their levels from content"""
-        sections = []
+    def _index_sections(self, content: str) -> PRDSectionIndex:
+        """
+        Index headings and per-section content in a single pass
         
-        # Find all markdown headings
-        heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+        The index of the last content seen is kept, so validating and then
+        compliance-checking the same PRD reads it only once.
+        """
+        if self._section_index is not None and content == self._indexed_content:
+            return self._section_index
         
-        for match in heading_pattern.finditer(content):
-            level = len(match.group(1))
-            title = match.group(2).strip()
-            sections.append((title, level))
+        self._indexed_content = content
+        self._section_index = PRDSectionIndex(self._scan_sections(content), content.lower())
+        return self._section_index
+    
+    def _scan_sections(self, content: str) -> List[SectionEntry]:
+        """Walk the content line by line, measuring each section below its heading"""
+        sections: List[SectionEntry] = []
+        current: Optional[SectionEntry] = None
+        ascii_only = content.isascii()
+        offset = 0
+        
+        for line in content.split('\n'):
+            line_start = offset
+            offset += (len(line) if ascii_only else len(line.encode('utf-8'))) + 1
+            
+            match = HEADING_PATTERN.match(line) if line.startswith('#') else None
+            if match:
+                if current:
+                    current.end_offset = line_start
+                current = SectionEntry(match.group(2).strip(), len(match.group(1)), start_offset=line_start)
+                sections.append(current)
+                continue
+            if not current:
+                continue
+            
+            current.content_length += offset - line_start
+            if line.strip():
+                current.content_lines += 1
+                current.word_count += len(line.split())
+                # Each table has exactly one delimiter row ("|---|---|")
+                if '-' in line and TABLE_DELIMITER_PATTERN.match(line):
+                    current.table_count += 1
+                elif LIST_ITEM_PATTERN.match(line):
+                    current.list_item_count += 1
+        
+        if current:
+            # The last line has no trailing newline of its own
+            current.end_offset = offset - 1
+            current.content_length = max(0, current.content_length - 1)
         
         return sections
     
-    def _validate_structure(self, actual_sections: List[Tuple[str, int]], result: ValidationResult):
+    def _extract_sections(self, content: str) -> List[Tuple[str, int]]:
+        """Extract section headings and their levels from content"""
+        return [(section.title, section.level) for section in self._index_sections(content).sections]
+    
+    def _validate_structure(self, actual_sections: List[SectionEntry], result: ValidationResult):
         """Validate section structure against template"""
-        actual_titles = [section[0] for section in actual_sections]
-        expected_titles = [section.title for section in self.expected_sections]
+        actual_titles = {section.title for section in actual_sections}
+        expected_titles = self._expected_titles
         
         # Check for missing required sections
         for expected in self.expected_sections:
@@ -151,66 +332,49 @@ class PRDTemplateValidator:
                 result.errors.append(f"Missing required section: {expected.title}")
         
         # Check for unexpected sections
-        for actual_title, level in actual_sections:
-            if actual_title not in expected_titles and level <= 3:  # Only flag high-level unexpected sections
-                result.extra_sections.append(actual_title)
-                result.warnings.append(f"Unexpected section found: {actual_title}")
+        for section in actual_sections:
+            if section.title not in expected_titles and section.level <= 3:  # Only flag high-level unexpected sections
+                result.extra_sections.append(section.title)
+                result.warnings.append(f"Unexpected section found: {section.title}")
         
         # Analyze section order
         self._validate_section_order(actual_sections, result)
         
         # Analyze individual sections
-        for actual_title, level in actual_sections:
-            result.section_analysis[actual_title] = {
-                'level': level,
-                'expected': actual_title in expected_titles,
-                'content_length': 0  # Would be populated by content analysis
+        for section in actual_sections:
+            result.section_analysis[section.title] = {
+                'level': section.level,
+                'expected': section.title in expected_titles,
+                'content_length': section.content_length,
+                'word_count': section.word_count,
+                'table_count': section.table_count,
+                'list_item_count': section.list_item_count
             }
     
-    def _validate_section_order(self, actual_sections: List[Tuple[str, int]], result: ValidationResult):
+    def _validate_section_order(self, actual_sections: List[SectionEntry], result: ValidationResult):
         """Validate that sections appear in expected order"""
-        expected_order = {section.title: section.order for section in self.expected_sections}
+        expected_order = self._expected_order
         
         previous_order = 0
-        for title, level in actual_sections:
-            if title in expected_order:
-                current_order = expected_order[title]
+        for section in actual_sections:
+            if section.title in expected_order:
+                current_order = expected_order[section.title]
                 if current_order < previous_order:
-                    result.warnings.append(f"Section '{title}' appears out of expected order")
+                    result.warnings.append(f"Section '{section.title}' appears out of expected order")
                 previous_order = current_order
     
-    def _validate_content(self, content: str, result: ValidationResult):
+    def _validate_content(self, index: PRDSectionIndex, result: ValidationResult):
         """Validate content quality and completeness"""
-        lines = content.split('\n')
-        
         # Check for empty sections
-        current_section = None
-        section_content = []
-        
-        for line in lines:
-            if re.match(r'^#{1,6}\s+', line):
-                # Process previous section
-                if current_section and len(section_content) < 3:
-                    result.warnings.append(f"Section '{current_section}' appears to have minimal content")
-                
-                # Start new section
-                current_section = line.strip('#').strip()
-                section_content = []
-            else:
-                if line.strip():  # Non-empty line
-                    section_content.append(line)
-        
-        # Check final section
-        if current_section and len(section_content) < 3:
-            result.warnings.append(f"Section '{current_section}' appears to have minimal content")
+        for section in index.sections:
+            if section.content_lines < 3:
+                result.warnings.append(f"Section '{section.title}' appears to have minimal content")
         
         # Validate specific content requirements
-        self._validate_specific_requirements(content, result)
+        self._validate_specific_requirements(index.content_lower, result)
     
-    def _validate_specific_requirements(self, content: str, result: ValidationResult):
+    def _validate_specific_requirements(self, content_lower: str, result: ValidationResult):
         """Validate specific content requirements for PRD sections"""
-        content_lower = content.lower()
-        
         # Check for classification guide indicators
         if "content aggregation focus" not in content_lower:
             result.warnings.append("Missing 'Content Aggregation Focus' indicators in sections")
@@ -272,7 +436,8 @@ class PRDTemplateValidator:
             'has_atlas_context': True
         }
         
-        content_lower = prd_content.lower()
+        index = self._index_sections(prd_content)
+        content_lower = index.content_lower
         
         # Check required sections
         required_section_indicators = [
@@ -290,7 +455,7 @@ class PRDTemplateValidator:
                 break
         
         # Check structure
-        heading_count = len(re.findall(r'^#{1,6}\s+', prd_content, re.MULTILINE))
+        heading_count = len(index.sections)
         if heading_count < 15:  # Should have at least 15 major sections
             compliance['follows_structure'] = False
         
@@ -358,7 +523,11 @@ class PRDTemplateValidator:
             report.append("## Section Analysis")
             for section, analysis in validation_result.section_analysis.items():
                 expected_icon = "✅" if analysis['expected'] else "❓"
-                report.append(f"- {expected_icon} **{section}** (Level {analysis['level']})")
+                report.append(
+                    f"- {expected_icon} **{section}** (Level {analysis['level']}, "
+                    f"{analysis['word_count']} words, {analysis['table_count']} tables, "
+                    f"{analysis['list_item_count']} list items)"
+                )
             report.append("")
         
         # Recommendations
@@ -377,33 +546,164 @@ class PRDTemplateValidator:
         return "\n".join(report)
 
 
+class IncrementalPRDValidator(PRDTemplateValidator):
+    """
+    Validator for edit/save loops that re-scans only changed sections
+    
+    The PRD is split at heading lines and each section's text is hashed.
+    Sections whose hash was seen in the previous validation reuse their
+    recorded metrics; only new or edited sections are scanned line by
+    line. Document-level checks run on every validation and are cheap.
+    
+    With state_file, section hashes and metrics persist between runs.
+    """
+    
+    def __init__(
+        self,
+        template_path: str,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        state_file: Optional[str] = None
+    ):
+        super().__init__(template_path, cache_dir)
+        self.state_file = Path(state_file) if state_file else None
+        self._section_state: Dict[str, SectionEntry] = self._load_section_state()
+        self.sections_reused = 0
+        self.sections_scanned = 0
+    
+    def _load_section_state(self) -> Dict[str, SectionEntry]:
+        if not self.state_file or not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('model_hash') != self.template_model.model_hash:
+                return {}
+            return {digest: SectionEntry(**entry) for digest, entry in data['sections'].items()}
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return {}
+    
+    def _save_section_state(self):
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'model_hash': self.template_model.model_hash,
+                    'sections': {digest: asdict(entry) for digest, entry in self._section_state.items()}
+                }, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except OSError:
+            pass
+    
+    def _scan_sections(self, content: str) -> List[SectionEntry]:
+        """Reuse metrics of unchanged sections; scan only sections whose hash changed"""
+        starts = [match.start() for match in HEADING_LINE_PATTERN.finditer(content)]
+        if not starts:
+            return []
+        
+        sections: List[SectionEntry] = []
+        state: Dict[str, SectionEntry] = {}
+        byte_offset = len(content[:starts[0]].encode('utf-8'))
+        self.sections_reused = self.sections_scanned = 0
+        
+        for position, start in enumerate(starts):
+            end = starts[position + 1] if position + 1 < len(starts) else len(content)
+            text = content[start:end]
+            raw = text.encode('utf-8')
+            digest = hashlib.sha256(raw).hexdigest()
+            
+            # Metrics are stored relative to the section start
+            entry = self._section_state.get(digest)
+            if entry is not None:
+                self.sections_reused += 1
+            else:
+                entry = super()._scan_sections(text)[0]
+                self.sections_scanned += 1
+            state[digest] = entry
+            
+            # Built directly; dataclasses.replace dominates the cost on large PRDs
+            sections.append(SectionEntry(
+                entry.title, entry.level,
+                byte_offset + entry.start_offset, byte_offset + entry.end_offset,
+                entry.content_length, entry.content_lines,
+                entry.word_count, entry.table_count, entry.list_item_count
+            ))
+            byte_offset += len(raw)
+        
+        # Only the previous validation's sections are kept, so the state stays bounded
+        self._section_state = state
+        if self.state_file:
+            self._save_section_state()
+        return sections
+
+
+def validation_result_to_dict(result: ValidationResult) -> Dict:
+    """Convert a ValidationResult to a JSON-serializable dict"""
+    return asdict(result)
+
+
+# Per-process validator used by validate_prd_files workers
+_worker_validator: Optional[PRDTemplateValidator] = None
+
+
+def _init_validation_worker(template_path: str, cache_dir: Optional[str]):
+    """Load the template once when a worker process starts"""
+    global _worker_validator
+    _worker_validator = PRDTemplateValidator(template_path, cache_dir)
+
+
+def _validate_in_worker(item: Tuple[str, str]) -> Dict:
+    content, file_path = item
+    return validation_result_to_dict(_worker_validator._perform_validation(content, file_path))
+
+
 def main():
     """CLI interface for template validation"""
     import argparse
     
     parser = argparse.ArgumentParser(description="PRD Template Validator")
     parser.add_argument("--template", required=True, help="Path to PRD template file")
-    parser.add_argument("--prd-file", required=True, help="PRD file to validate")
+    parser.add_argument("--prd-file", help="PRD file to validate")
+    parser.add_argument("--all-versions", action='store_true',
+                       help="Validate every PRD version in version_metadata.json")
+    parser.add_argument("--project-root", default=".", help="Project root for --all-versions")
+    parser.add_argument("--workers", type=int, help="Worker processes for --all-versions")
+    parser.add_argument("--incremental-state",
+                       help="Section hash state file; unchanged sections are not re-scanned")
     parser.add_argument("--output-report", help="Output validation report to file")
     parser.add_argument("--json-output", action='store_true', help="Output results as JSON")
     
     args = parser.parse_args()
     
+    if not args.prd_file and not args.all_versions:
+        parser.error("one of --prd-file or --all-versions is required")
+    
     try:
-        validator = PRDTemplateValidator(args.template)
+        if args.all_versions:
+            from version_manager import PRDVersionManager
+            
+            manager = PRDVersionManager(args.project_root, args.template)
+            report = manager.validate_all_versions(workers=args.workers)
+            output = json.dumps(report, indent=2, ensure_ascii=False)
+            
+            if args.output_report:
+                with open(args.output_report, 'w', encoding='utf-8') as f:
+                    f.write(output)
+                print(f"Validation report written to: {args.output_report}")
+            else:
+                print(output)
+            
+            return 0 if report['summary']['invalid'] == 0 else 1
+        
+        if args.incremental_state:
+            validator = IncrementalPRDValidator(args.template, state_file=args.incremental_state)
+        else:
+            validator = PRDTemplateValidator(args.template)
         result = validator.validate_prd_file(args.prd_file)
         
         if args.json_output:
             # Convert dataclass to dict for JSON output
-            output = {
-                'is_valid': result.is_valid,
-                'score': result.score,
-                'errors': result.errors,
-                'warnings': result.warnings,
-                'missing_sections': result.missing_sections,
-                'extra_sections': result.extra_sections,
-                'section_analysis': result.section_analysis
-            }
+            output = validation_result_to_dict(result)
             print(json.dumps(output, indent=2))
         else:
             report = validator.generate_validation_report(result, args.prd_file)
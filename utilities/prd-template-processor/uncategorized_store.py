@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Uncategorized Content Store
+Keeps compact in-memory records of unclassified content and spills the full
+text to a JSONL file on disk
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import tempfile
+from dataclasses import dataclass, asdict
+from typing import Iterator, List, Optional, Tuple
+
+
+@dataclass
+class UncategorizedRecord:
+    """Compact in-memory handle for one spilled uncategorized item"""
+    content_hash: str
+    source_file: str
+    source_offsets: Optional[Tuple[int, int]]
+    top_scores: List[Tuple[str, float]]
+    spill_offset: int  # Byte offset of the item's line in the spill file
+
+
+class UncategorizedStore:
+    """
+    Append-only store of UncategorizedContent items
+    
+    Only an UncategorizedRecord (content hash, source, offsets and the top
+    section scores) is held per item; the full item is written as one JSON
+    line to the spill file and read back lazily. Iteration streams items
+    from disk in insertion order, so memory use does not grow with the
+    amount of uncategorized text.
+    
+    item_type rebuilds items from their JSON fields. Without spill_path
+    the store spills to a temporary file that is removed, with its records,
+    on close. A given spill_path is truncated on the first write to an
+    empty store and kept; closing it only releases the file handle, which
+    is reopened without truncation on the next read or append.
+    """
+    
+    def __init__(self, item_type: type, spill_path: Optional[str] = None):
+        self.item_type = item_type
+        self.spill_path = spill_path
+        self.records: List[UncategorizedRecord] = []
+        self._file = None
+        self._temporary = spill_path is None
+    
+    def _open_spill_file(self):
+        if self._temporary:
+            fd, self.spill_path = tempfile.mkstemp(prefix="uncategorized-", suffix=".jsonl")
+            self._file = os.fdopen(fd, 'w+b')
+        elif self.records:
+            # Reopened after close: existing records hold offsets into the file
+            self._file = open(self.spill_path, 'r+b')
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+            self._file = open(self.spill_path, 'w+b')
+        atexit.register(self.close)
+    
+    def append(self, item):
+        """Spill an UncategorizedContent item and keep its compact record"""
+        if self._file is None:
+            self._open_spill_file()
+        
+        data = asdict(item)
+        line = (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+        self._file.seek(0, os.SEEK_END)
+        spill_offset = self._file.tell()
+        self._file.write(line)
+        
+        self.records.append(UncategorizedRecord(
+            content_hash=hashlib.sha256(item.content.encode('utf-8')).hexdigest(),
+            source_file=item.source_file,
+            source_offsets=item.source_offsets,
+            top_scores=list(item.top_scores),
+            spill_offset=spill_offset
+        ))
+    
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+    
+    def clear(self):
+        """Drop all items; the spill file is truncated and reused"""
+        self.records = []
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+        # A closed spill file is truncated when it is next opened
+    
+    def _load(self, data: dict):
+        if data.get('source_offsets') is not None:
+            data['source_offsets'] = tuple(data['source_offsets'])
+        data['top_scores'] = [tuple(score) for score in data.get('top_scores', [])]
+        return self.item_type(**data)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __getitem__(self, index: int):
+        """Read a single item back from the spill file"""
+        record = self.records[index]
+        if self._file is None:
+            self._open_spill_file()
+        self._file.seek(record.spill_offset)
+        return self._load(json.loads(self._file.readline()))
+    
+    def __iter__(self) -> Iterator:
+        """Stream items from the spill file in insertion order"""
+        if not self.records:
+            return
+        if self._file is not None:
+            self._file.flush()
+        with open(self.spill_path, 'rb') as f:
+            for _ in range(len(self.records)):
+                yield self._load(json.loads(f.readline()))
+    
+    def close(self):
+        """Close the spill file; a temporary spill file is removed along with its records"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        atexit.unregister(self.close)
+        if self._temporary:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
+            self.records = []
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Version Delta Store
+Keeps superseded PRD versions as compressed reverse deltas against the next
+version, with periodic full snapshots bounding reconstruction chains
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import difflib
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+
+class VersionDeltaStore:
+    """
+    Compressed storage for PRD versions older than the latest
+    
+    When version N+1 is created, version N is stored either as a reverse
+    delta (the line edits that turn N+1 back into N) or, for every
+    snapshot_every-th version, as a full compressed copy. Reconstructing a
+    version walks forward to the nearest full copy - a snapshot or the
+    latest version on disk - and applies deltas backwards, so at most
+    snapshot_every - 1 deltas are applied. Each delta records the sha256 of
+    the text it was computed against; reconstruction refuses to apply it to
+    any other text, e.g. after the latest PRD file was edited by hand.
+    """
+    
+    def __init__(self, store_dir: Path, snapshot_every: int = 10):
+        self.store_dir = Path(store_dir)
+        self.snapshot_every = snapshot_every
+    
+    def _path(self, version: int, kind: str) -> Path:
+        return self.store_dir / f"prd-v{version}.{kind}.z"
+    
+    def has(self, version: int) -> bool:
+        return self._path(version, "full").exists() or self._path(version, "delta").exists()
+    
+    def store(self, version: int, text: str, next_text: str) -> Path:
+        """Store version's text, given the text of the version that supersedes it"""
+        if version % self.snapshot_every == 0:
+            path, payload = self._path(version, "full"), text
+        else:
+            path = self._path(version, "delta")
+            payload = json.dumps({
+                'base_sha256': self.text_hash(next_text),
+                'ops': self.compute_delta(next_text, text)
+            }, ensure_ascii=False)
+        
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(zlib.compress(payload.encode('utf-8'), 9))
+        os.replace(tmp_file, path)
+        return path
+    
+    def reconstruct(self, version: int, load_full: Callable[[int], Optional[str]]) -> Optional[str]:
+        """
+        Rebuild a stored version's text
+        
+        Args:
+            version: Version number to rebuild
+            load_full: Returns the full text of a version kept outside the
+                store (the latest PRD file), or None
+        
+        Returns:
+            The version's text, or None if the chain is broken
+        
+        Raises:
+            ValueError: If a delta's base text no longer matches the text it
+                was computed against
+        """
+        deltas: List[Tuple[int, dict]] = []
+        current = version
+        while True:
+            full_path = self._path(current, "full")
+            delta_path = self._path(current, "delta")
+            if full_path.exists():
+                text = self._read(full_path)
+                break
+            if delta_path.exists():
+                deltas.append((current, json.loads(self._read(delta_path))))
+                current += 1
+                continue
+            text = load_full(current) if current != version else None
+            if text is None:
+                return None
+            break
+        
+        for number, delta in reversed(deltas):
+            if self.text_hash(text) != delta['base_sha256']:
+                raise ValueError(f"Cannot rebuild v{version}: v{number + 1}, the base of the stored "
+                                 f"delta for v{number}, changed after the delta was written")
+            text = self.apply_delta(text, delta['ops'])
+        return text
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _read(path: Path) -> str:
+        with open(path, 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8')
+    
+    @staticmethod
+    def compute_delta(source: str, target: str) -> list:
+        """
+        Line edits turning source into target
+        
+        Each op is either [start, end], copying source lines start:end, or
+        {'lines': [...]}, inserting literal lines.
+        """
+        source_lines = source.splitlines(keepends=True)
+        target_lines = target.splitlines(keepends=True)
+        ops = []
+        matcher = difflib.SequenceMatcher(None, source_lines, target_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                ops.append([i1, i2])
+            elif j2 > j1:
+                ops.append({'lines': target_lines[j1:j2]})
+        return ops
+    
+    @staticmethod
+    def apply_delta(source: str, delta: list) -> str:
+        source_lines = source.splitlines(keepends=True)
+        parts = []
+        for op in delta:
+            if isinstance(op, dict):
+                parts.extend(op['lines'])
+            else:
+                parts.extend(source_lines[op[0]:op[1]])
+        return ''.join(parts)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+PRD Version Diff
+Section-level comparison of two PRD texts: unchanged sections are skipped by
+hash and line diffs run only inside changed sections
+"""
+
+import difflib
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from template_validator import HEADING_PATTERN, HEADING_LINE_PATTERN
+
+PREAMBLE_TITLE = "(preamble)"
+
+
+@dataclass
+class PRDSection:
+    """One section of a PRD, keyed by its path in the heading tree"""
+    path: str  # Heading titles from the top level down, joined by " > "
+    level: int
+    text: str
+    content_hash: str
+
+
+@dataclass
+class SectionChange:
+    """How one section differs between two PRD versions"""
+    path: str
+    level: int
+    status: str  # 'added', 'removed', 'modified'
+    lines_added: int = 0
+    lines_removed: int = 0
+    diff: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PRDDiff:
+    """Section-level change report between two PRD versions"""
+    from_version: str
+    to_version: str
+    summary: Dict[str, int]
+    changes: List[SectionChange]
+
+
+def split_sections(content: str) -> List[PRDSection]:
+    """
+    Split a PRD at its heading lines into sections keyed by heading path
+    
+    Text before the first heading becomes a preamble section. A repeated
+    path gets an occurrence suffix ("Risks #2") so every key is unique.
+    """
+    starts = [match.start() for match in HEADING_LINE_PATTERN.finditer(content)]
+    bounds: List[Tuple[int, int]] = []
+    if not starts or starts[0] > 0:
+        bounds.append((0, starts[0] if starts else len(content)))
+    bounds.extend(zip(starts, starts[1:] + [len(content)]))
+    
+    sections: List[PRDSection] = []
+    stack: List[Tuple[int, str]] = []  # (level, title) of the enclosing headings
+    seen: Dict[str, int] = {}
+    for start, end in bounds:
+        text = content[start:end]
+        match = HEADING_PATTERN.match(text[:text.find('\n')] if '\n' in text else text)
+        if match:
+            level, title = len(match.group(1)), match.group(2).strip()
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, title))
+            path = " > ".join(title for _, title in stack)
+        else:
+            level, path = 0, PREAMBLE_TITLE
+        
+        seen[path] = seen.get(path, 0) + 1
+        if seen[path] > 1:
+            path = f"{path} #{seen[path]}"
+        sections.append(PRDSection(path, level, text, hashlib.sha256(text.encode('utf-8')).hexdigest()))
+    
+    return sections
+
+
+def diff_prd_content(
+    old_content: str,
+    new_content: str,
+    from_version: str = "old",
+    to_version: str = "new",
+    context_lines: int = 3
+) -> PRDDiff:
+    """
+    Compare two PRD texts section by section
+    
+    Sections are matched by heading path. Matching sections with equal
+    hashes are counted as unchanged without being diffed; a unified line
+    diff is computed only for sections whose hash differs.
+    """
+    old_sections = {section.path: section for section in split_sections(old_content)}
+    new_sections = split_sections(new_content)
+    new_paths = {section.path for section in new_sections}
+    
+    changes: List[SectionChange] = []
+    unchanged = 0
+    for section in new_sections:
+        old = old_sections.get(section.path)
+        if old is None:
+            changes.append(_section_change(section.path, section.level, 'added', "", section.text, context_lines))
+        elif old.content_hash == section.content_hash:
+            unchanged += 1
+        else:
+            changes.append(_section_change(section.path, section.level, 'modified', old.text, section.text, context_lines))
+    
+    for section in old_sections.values():
+        if section.path not in new_paths:
+            changes.append(_section_change(section.path, section.level, 'removed', section.text, "", context_lines))
+    
+    summary = {'unchanged': unchanged, 'added': 0, 'removed': 0, 'modified': 0}
+    for change in changes:
+        summary[change.status] += 1
+    summary['lines_added'] = sum(change.lines_added for change in changes)
+    summary['lines_removed'] = sum(change.lines_removed for change in changes)
+    
+    return PRDDiff(from_version, to_version, summary, changes)
+
+
+def _section_change(path: str, level: int, status: str, old_text: str, new_text: str,
+                    context_lines: int) -> SectionChange:
+    diff = [
+        line.rstrip('\n')
+        for line in difflib.unified_diff(
+            old_text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+            fromfile=path, tofile=path, n=context_lines
+        )
+    ]
+    # Skip the ---/+++ file header lines when counting
+    lines_added = sum(1 for line in diff[2:] if line.startswith('+'))
+    lines_removed = sum(1 for line in diff[2:] if line.startswith('-'))
+    return SectionChange(path, level, status, lines_added, lines_removed, diff)
+
+
+def format_diff_report(prd_diff: PRDDiff) -> str:
+    """Render a diff as Markdown with one block per changed section"""
+    summary = prd_diff.summary
+    lines = [
+        f"# PRD Diff: {prd_diff.from_version} → {prd_diff.to_version}",
+        "",
+        f"- **Unchanged sections**: {summary['unchanged']}",
+        f"- **Modified sections**: {summary['modified']}",
+        f"- **Added sections**: {summary['added']}",
+        f"- **Removed sections**: {summary['removed']}",
+        f"- **Lines**: +{summary['lines_added']} / -{summary['lines_removed']}",
+    ]
+    for change in prd_diff.changes:
+        lines.extend([
+            "",
+            f"## {change.path} ({change.status}, +{change.lines_added} / -{change.lines_removed})",
+            "",
+            "```diff",
+            *change.diff[2:],
+            "```",
+        ])
+    return "\n".join(lines) + "\n"
@@ -6,13 +6,26 @@ Handles versioning of generated PRD files while keeping templates read-only
 
 import os
 import re
+import sys
 import json
 import shutil
+import hashlib
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 
+from template_validator import PRDTemplateValidator
+from version_metadata_store import VersionMetadataStore
+from version_delta_store import VersionDeltaStore
+from version_diff import PRDDiff, diff_prd_content, format_diff_report
+
+UTILITIES_DIR = Path(__file__).resolve().parent.parent
+if str(UTILITIES_DIR) not in sys.path:
+    sys.path.insert(0, str(UTILITIES_DIR))
+from instrumentation import annotate, timed
+
 @dataclass
 class PRDVersion:
     """Represents a PRD version with metadata"""
@@ -33,24 +46,58 @@ class VersionMetadata:
     template_file: str
     project_name: str
     last_updated: str
+    storage_mode: Optional[str] = None  # Recorded with the first version; None for projects without versions
 
 class PRDVersionManager:
-    """Manages versioning of PRD files and maintains template integrity"""
+    """
+    Manages versioning of PRD files and maintains template integrity
+    
+    With storage_mode='full' every version stays in docs/ as a complete
+    file. With storage_mode='delta' only the latest version does; each
+    superseded version moves into a compressed delta store and is rebuilt
+    on demand by get_version_content. The mode is recorded in the project's
+    metadata with its first version; storage_mode=None uses the recorded
+    mode, and a conflicting mode is rejected.
+    """
+    
+    STORAGE_MODES = ('full', 'delta')
     
-    def __init__(self, project_root: str, template_path: str):
+    def __init__(self, project_root: str, template_path: str, storage_mode: Optional[str] = None,
+                 snapshot_every: int = 10):
+        if storage_mode is not None and storage_mode not in self.STORAGE_MODES:
+            raise ValueError(f"Invalid storage mode. Must be one of: {list(self.STORAGE_MODES)}")
+        
         self.project_root = Path(project_root)
         self.template_path = Path(template_path)
         self.docs_dir = self.project_root / "docs"
         self.ai_dir = self.project_root / ".ai"
         self.prd_generation_dir = self.ai_dir / "prd-generation"
         self.archive_dir = self.docs_dir / "prd-archive"
+        self.version_store = VersionDeltaStore(self.prd_generation_dir / "version-store", snapshot_every)
         
         # Ensure directories exist
         self._ensure_directories()
         
         # Load or initialize metadata
         self.metadata_file = self.prd_generation_dir / "version_metadata.json"
+        self.metadata_store = VersionMetadataStore(self.metadata_file)
+        
+        # Lookup indexes, rebuilt at load and kept current by _apply_event
+        self._versions_by_number: Dict[str, PRDVersion] = {}
+        self._versions_by_status: Dict[str, Dict[str, PRDVersion]] = {}
+        self._max_version = 0
+        
         self.metadata = self._load_metadata()
+        
+        recorded_mode = self._recorded_storage_mode()
+        if storage_mode is not None and recorded_mode is not None and storage_mode != recorded_mode:
+            raise ValueError(f"Project stores versions in '{recorded_mode}' mode, not '{storage_mode}'")
+        self.storage_mode = storage_mode or recorded_mode or 'full'
+        
+        # Template version and hash, keyed by the template's mtime and size
+        self.template_state_file = self.prd_generation_dir / "template_state.json"
+        self._template_baseline = self._load_template_baseline()
+        self._template_state_cache = self._template_baseline
     
     def _ensure_directories(self):
         """Create necessary directories if they don't exist"""
@@ -65,25 +112,32 @@ class PRDVersionManager:
             directory.mkdir(parents=True, exist_ok=True)
     
     def _load_metadata(self) -> VersionMetadata:
-        """Load version metadata or create new if doesn't exist"""
-        if self.metadata_file.exists():
-            try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Convert dict back to dataclass instances
-                versions = [PRDVersion(**v) for v in data['versions']]
-                return VersionMetadata(
-                    current_version=data['current_version'],
-                    versions=versions,
-                    template_file=data['template_file'],
-                    project_name=data['project_name'],
-                    last_updated=data['last_updated']
-                )
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Warning: Invalid metadata file, creating new: {e}")
-        
-        # Create new metadata
+        """Load version metadata from the snapshot and event log, or create new if neither exists"""
+        try:
+            with self.metadata_store.locked(exclusive=False):
+                _, snapshot, events = self.metadata_store.read_changes()
+        except json.JSONDecodeError as e:
+            print(f"Warning: Invalid metadata file, creating new: {e}")
+            self.metadata = self._new_metadata()
+            self._rebuild_indexes()
+            return self.metadata
+        
+        self.metadata = self._metadata_from_snapshot(snapshot)
+        self._rebuild_indexes()
+        for event in events:
+            self._apply_event(event)
+        return self.metadata
+    
+    def _recorded_storage_mode(self) -> Optional[str]:
+        """Storage mode of the existing versions, inferred for projects that predate recording it"""
+        if self.metadata.storage_mode is not None:
+            return self.metadata.storage_mode
+        if not self.metadata.versions:
+            return None
+        store_dir = self.version_store.store_dir
+        return 'delta' if store_dir.is_dir() and any(store_dir.glob("*.z")) else 'full'
+    
+    def _new_metadata(self) -> VersionMetadata:
         return VersionMetadata(
             current_version="v0",
             versions=[],
@@ -92,45 +146,179 @@ class PRDVersionManager:
             last_updated=datetime.now().isoformat()
         )
     
+    def _metadata_from_snapshot(self, data: Optional[Dict]) -> VersionMetadata:
+        """Convert the snapshot dict back to dataclass instances"""
+        if data is None:
+            return self._new_metadata()
+        try:
+            versions = [PRDVersion(**v) for v in data['versions']]
+            return VersionMetadata(
+                current_version=data['current_version'],
+                versions=versions,
+                template_file=data['template_file'],
+                project_name=data['project_name'],
+                last_updated=data['last_updated'],
+                storage_mode=data.get('storage_mode')
+            )
+        except KeyError as e:
+            print(f"Warning: Invalid metadata file, creating new: {e}")
+            return self._new_metadata()
+    
+    def _rebuild_indexes(self):
+        """Index versions by number and status and find the highest version number"""
+        self._versions_by_number = {}
+        self._versions_by_status = {}
+        self._max_version = 0
+        for v in self.metadata.versions:
+            self._index_version(v)
+    
+    def _index_version(self, prd_version: PRDVersion):
+        previous = self._versions_by_number.get(prd_version.version)
+        if previous is not None:
+            self._versions_by_status.get(previous.status, {}).pop(prd_version.version, None)
+        self._versions_by_number[prd_version.version] = prd_version
+        self._versions_by_status.setdefault(prd_version.status, {})[prd_version.version] = prd_version
+        self._max_version = max(self._max_version, self._version_number(prd_version.version))
+    
+    def _apply_event(self, event: Dict):
+        """Apply one metadata event; replaying an event twice has no further effect"""
+        metadata = self.metadata
+        if event['op'] == 'create':
+            prd_version = PRDVersion(**event['version'])
+            existing = self._versions_by_number.get(prd_version.version)
+            if existing is not None:
+                metadata.versions[metadata.versions.index(existing)] = prd_version
+            else:
+                metadata.versions.append(prd_version)
+            self._index_version(prd_version)
+            metadata.current_version = event['current_version']
+            if metadata.storage_mode is None:
+                metadata.storage_mode = event.get('storage_mode')
+        elif event['op'] == 'status':
+            prd_version = self._versions_by_number.get(event['version'])
+            if prd_version is not None:
+                self._versions_by_status.get(prd_version.status, {}).pop(prd_version.version, None)
+                prd_version.status = event['status']
+                self._versions_by_status.setdefault(prd_version.status, {})[prd_version.version] = prd_version
+        
+        if 'last_updated' in event:
+            metadata.last_updated = event['last_updated']
+    
+    @contextmanager
+    def _metadata_transaction(self):
+        """Hold the metadata lock and catch up on other writers' changes first"""
+        with self.metadata_store.locked():
+            reset, snapshot, events = self.metadata_store.read_changes()
+            if reset:
+                self.metadata = self._metadata_from_snapshot(snapshot)
+                self._rebuild_indexes()
+            for event in events:
+                self._apply_event(event)
+            yield
+    
+    def _record_event(self, event: Dict):
+        """Apply an event and append it to the log; call inside _metadata_transaction"""
+        self._apply_event(event)
+        self.metadata_store.append(event)
+        if self.metadata_store.needs_compaction():
+            self._save_metadata()
+    
     def _save_metadata(self):
-        """Save metadata to file"""
+        """Compact the event log into a full metadata snapshot"""
         # Convert dataclass instances to dict for JSON serialization
         data = {
             'current_version': self.metadata.current_version,
             'versions': [asdict(v) for v in self.metadata.versions],
             'template_file': self.metadata.template_file,
             'project_name': self.metadata.project_name,
-            'last_updated': self.metadata.last_updated
+            'last_updated': self.metadata.last_updated,
+            'storage_mode': self.metadata.storage_mode
         }
         
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with self.metadata_store.locked():
+            self.metadata_store.compact(data)
     
     def _get_next_version(self) -> str:
         """Calculate the next version number"""
-        if not self.metadata.versions:
-            return "v1"
-        
-        # Find highest version number
-        max_version = 0
-        version_pattern = re.compile(r'v(\d+)')
-        
-        for version_obj in self.metadata.versions:
-            match = version_pattern.match(version_obj.version)
-            if match:
-                version_num = int(match.group(1))
-                max_version = max(max_version, version_num)
-        
-        return f"v{max_version + 1}"
+        return f"v{self._max_version + 1}"
     
     def validate_template_readonly(self) -> bool:
-        """Ensure template file hasn't been modified inappropriately"""
+        """
+        Ensure template file hasn't been modified inappropriately
+        
+        The template's content hash is compared with the baseline recorded
+        in template_state.json the first time the project used it. The file
+        is only re-read when its mtime or size changed since the last check.
+        Use accept_template_change() after a deliberate template update.
+        """
         if not self.template_path.exists():
             raise FileNotFoundError(f"Template file not found: {self.template_path}")
         
-        # Check if template is writable (should be read-only in production)
-        return self.template_path.exists()
+        state = self._template_state()
+        baseline = self._template_baseline
+        if baseline is None:
+            self._save_template_baseline(state)
+            return True
+        
+        if state['hash'] != baseline['hash']:
+            print(f"Warning: Template {self.template_path} was modified since its baseline was recorded")
+            return False
+        
+        if state['stat'] != baseline['stat']:
+            # Touched but unchanged: refresh the stat key so the next check skips the read
+            self._save_template_baseline(state)
+        return True
+    
+    def accept_template_change(self) -> Dict:
+        """Record the template's current content as the integrity baseline"""
+        state = self._template_state()
+        self._save_template_baseline(state)
+        return state
+    
+    def _template_state(self) -> Dict:
+        """Template version and content hash, re-read only when the file's mtime or size changed"""
+        stat = self.template_path.stat()
+        stat_key = [stat.st_mtime_ns, stat.st_size]
+        cached = self._template_state_cache
+        if cached is not None and cached['stat'] == stat_key:
+            return cached
+        
+        with open(self.template_path, 'rb') as f:
+            raw = f.read()
+        
+        # Look for version in template content, falling back to the file modification time
+        version_match = re.search(r'Created:\s*([0-9-]+)', raw.decode('utf-8', errors='replace'))
+        if version_match:
+            template_version = version_match.group(1)
+        else:
+            template_version = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
+        
+        self._template_state_cache = {
+            'template_file': str(self.template_path),
+            'stat': stat_key,
+            'hash': hashlib.sha256(raw).hexdigest(),
+            'version': template_version
+        }
+        return self._template_state_cache
+    
+    def _load_template_baseline(self) -> Optional[Dict]:
+        try:
+            with open(self.template_state_file, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if baseline.get('template_file') != str(self.template_path):
+            return None
+        return baseline
     
+    def _save_template_baseline(self, state: Dict):
+        tmp_file = self.template_state_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_file, self.template_state_file)
+        self._template_baseline = state
+    
+    @timed('create_prd_version')
     def create_new_version(
         self,
         content: str,
@@ -149,33 +337,48 @@ class PRDVersionManager:
         if not self.validate_template_readonly():
             raise RuntimeError("Template file validation failed")
         
-        # Get next version
-        next_version = self._get_next_version()
-        
-        # Create PRD filename
-        prd_filename = f"prd-{next_version}.md"
-        prd_filepath = self.docs_dir / prd_filename
-        
-        # Write PRD content
-        self._write_prd_file(prd_filepath, content, next_version, source_documents)
-        
-        # Create version metadata
-        prd_version = PRDVersion(
-            version=next_version,
-            file_path=str(prd_filepath),
-            created_date=datetime.now().isoformat(),
-            created_by=created_by,
-            source_documents=source_documents,
-            classification_report=classification_report_path,
-            template_version=self._get_template_version(),
-            status=status
-        )
-        
-        # Update metadata
-        self.metadata.versions.append(prd_version)
-        self.metadata.current_version = next_version
-        self.metadata.last_updated = datetime.now().isoformat()
-        self._save_metadata()
+        # Version numbers are allocated under the metadata lock so concurrent writers never collide
+        with self._metadata_transaction():
+            # Another writer may have created the first version in a different mode meanwhile
+            recorded_mode = self._recorded_storage_mode()
+            if recorded_mode is not None and recorded_mode != self.storage_mode:
+                raise ValueError(f"Project stores versions in '{recorded_mode}' mode, not '{self.storage_mode}'")
+            
+            # Get next version
+            previous_version = self._versions_by_number.get(f"v{self._max_version}")
+            next_version = self._get_next_version()
+            
+            # Create PRD filename
+            prd_filename = f"prd-{next_version}.md"
+            prd_filepath = self.docs_dir / prd_filename
+            
+            # Write PRD content
+            self._write_prd_file(prd_filepath, content, next_version, source_documents)
+            annotate(version=next_version, storage_mode=self.storage_mode, content_bytes=len(content.encode('utf-8')))
+            
+            if self.storage_mode == 'delta' and previous_version is not None:
+                self._move_to_version_store(previous_version, prd_filepath)
+            
+            # Create version metadata
+            prd_version = PRDVersion(
+                version=next_version,
+                file_path=str(prd_filepath),
+                created_date=datetime.now().isoformat(),
+                created_by=created_by,
+                source_documents=source_documents,
+                classification_report=classification_report_path,
+                template_version=self._get_template_version(),
+                status=status
+            )
+            
+            # Update metadata
+            self._record_event({
+                'op': 'create',
+                'version': asdict(prd_version),
+                'current_version': next_version,
+                'storage_mode': self.storage_mode,
+                'last_updated': datetime.now().isoformat()
+            })
         
         # Create supporting files
         self._create_supporting_files(next_version, source_documents, classification_report_path)
@@ -191,6 +394,20 @@ class PRDVersionManager:
             f.write("\n")
             f.write(content)
     
+    def _move_to_version_store(self, prd_version: PRDVersion, next_filepath: Path):
+        """Replace a superseded version's file with its compressed delta against the next version"""
+        filepath = Path(prd_version.file_path)
+        if not filepath.exists():
+            return
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            text = f.read()
+        with open(next_filepath, 'r', encoding='utf-8') as f:
+            next_text = f.read()
+        
+        self.version_store.store(self._version_number(prd_version.version), text, next_text)
+        filepath.unlink()
+    
     def _generate_prd_header(self, version: str, source_documents: List[str]) -> str:
         """Generate PRD file header with metadata"""
         header = f"""<!--
@@ -211,18 +428,7 @@ For structural changes, update the template and regenerate
     def _get_template_version(self) -> str:
         """Extract template version from template file"""
         try:
-            with open(self.template_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Look for version in template content
-            version_match = re.search(r'Created:\s*([0-9-]+)', content)
-            if version_match:
-                return version_match.group(1)
-            
-            # Fall back to file modification time
-            mod_time = datetime.fromtimestamp(self.template_path.stat().st_mtime)
-            return mod_time.strftime("%Y-%m-%d")
-            
+            return self._template_state()['version']
         except Exception:
             return "unknown"
     
@@ -274,7 +480,7 @@ For structural changes, update the template and regenerate
 ✓ Content properly classified and placed
 ✓ Version control metadata included
 """
-        
+
         with open(log_file, 'w', encoding='utf-8') as f:
             f.write(log_content)
     
@@ -297,7 +503,7 @@ For structural changes, update the template and regenerate
 - No deviations from template structure
 - All sections populated according to classification system
 """
-        
+
         with open(attribution_file, 'w', encoding='utf-8') as f:
             f.write(attribution_content)
     
@@ -306,12 +512,12 @@ For structural changes, update the template and regenerate
         if not self.metadata.versions:
             return None
         
-        for version in self.metadata.versions:
-            if version.version == self.metadata.current_version:
-                return version
+        current = self._versions_by_number.get(self.metadata.current_version)
+        if current is not None:
+            return current
         
         # Fall back to latest version
-        return self.metadata.versions[-1] if self.metadata.versions else None
+        return self.metadata.versions[-1]
     
     def get_version_history(self) -> List[PRDVersion]:
         """Get complete version history"""
@@ -319,27 +525,69 @@ For structural changes, update the template and regenerate
     
     def get_version_by_number(self, version: str) -> Optional[PRDVersion]:
         """Get specific version by version number"""
-        for v in self.metadata.versions:
-            if v.version == version:
-                return v
-        return None
+        return self._versions_by_number.get(version)
     
-    def archive_version(self, version: str) -> bool:
-        """Archive a specific version"""
+    def get_versions_by_status(self, status: str) -> List[PRDVersion]:
+        """Get all versions with a given status, in the order they reached it"""
+        return list(self._versions_by_status.get(status, {}).values())
+    
+    def get_version_content(self, version: str) -> Optional[str]:
+        """Get the full text of a version, rebuilding it from the delta store if needed"""
         version_obj = self.get_version_by_number(version)
         if not version_obj:
-            return False
+            return None
         
-        # Copy to archive directory
-        source_file = Path(version_obj.file_path)
-        if source_file.exists():
-            archive_file = self.archive_dir / source_file.name
-            shutil.copy2(source_file, archive_file)
+        text = self._read_version_file(version_obj)
+        if text is not None:
+            return text
+        return self.version_store.reconstruct(self._version_number(version), self._read_version_number)
+    
+    def _read_version_number(self, number: int) -> Optional[str]:
+        version_obj = self.get_version_by_number(f"v{number}")
+        return self._read_version_file(version_obj) if version_obj else None
+    
+    @staticmethod
+    def _read_version_file(version_obj: PRDVersion) -> Optional[str]:
+        try:
+            with open(version_obj.file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def diff(self, version_a: str, version_b: str, context_lines: int = 3) -> PRDDiff:
+        """
+        Compare two versions section by section
+        
+        Returns:
+            PRDDiff listing added, removed and modified sections with line
+            diffs of the modified ones
+        """
+        contents = []
+        for version in (version_a, version_b):
+            content = self.get_version_content(version)
+            if content is None:
+                raise ValueError(f"Version not found: {version}")
+            contents.append(content)
+        return diff_prd_content(contents[0], contents[1], version_a, version_b, context_lines)
+    
+    def archive_version(self, version: str) -> bool:
+        """Archive a specific version"""
+        with self._metadata_transaction():
+            version_obj = self.get_version_by_number(version)
+            if not version_obj:
+                return False
             
-            # Update status
-            version_obj.status = "archived"
-            self._save_metadata()
-            return True
+            source_file = Path(version_obj.file_path)
+            in_version_store = self.version_store.has(self._version_number(version))
+            if source_file.exists() or in_version_store:
+                # Delta storage already retains every version, so only full storage keeps a copy
+                if self.storage_mode == 'full' and source_file.exists():
+                    archive_file = self.archive_dir / source_file.name
+                    shutil.copy2(source_file, archive_file)
+                
+                # Update status
+                self._record_event({'op': 'status', 'version': version, 'status': 'archived'})
+                return True
         
         return False
     
@@ -349,13 +597,16 @@ For structural changes, update the template and regenerate
         if status not in valid_statuses:
             raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
         
-        version_obj = self.get_version_by_number(version)
-        if not version_obj:
-            return False
-        
-        version_obj.status = status
-        self.metadata.last_updated = datetime.now().isoformat()
-        self._save_metadata()
+        with self._metadata_transaction():
+            if not self.get_version_by_number(version):
+                return False
+            
+            self._record_event({
+                'op': 'status',
+                'version': version,
+                'status': status,
+                'last_updated': datetime.now().isoformat()
+            })
         return True
     
     def validate_version_file(self, version: str) -> Dict[str, bool]:
@@ -364,8 +615,12 @@ For structural changes, update the template and regenerate
         if not version_obj:
             return {"exists": False}
         
-        filepath = Path(version_obj.file_path)
-        if not filepath.exists():
+        try:
+            content = self.get_version_content(version)
+        except ValueError as e:
+            # The version could not be rebuilt from the delta store
+            return {"exists": True, "file_found": False, "error": str(e)}
+        if content is None:
             return {"exists": False, "file_found": False}
         
         validation_results = {
@@ -377,9 +632,6 @@ For structural changes, update the template and regenerate
         }
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Check for metadata header
             validation_results["has_header"] = content.startswith("<!--")
             
@@ -388,12 +640,70 @@ For structural changes, update the template and regenerate
             
             # Basic structure validation (could be enhanced)
             validation_results["structure_intact"] = "# MASTER PRD CLASSIFICATION GUIDE" in content or len([line for line in content.split('\n') if line.startswith('##')]) >= 10
-            
+        
         except Exception as e:
             validation_results["error"] = str(e)
         
         return validation_results
     
+    def validate_all_versions(self, workers: Optional[int] = None) -> Dict:
+        """
+        Validate every PRD version against the template in one batch
+        
+        Versions are validated on a worker pool by PRDTemplateValidator;
+        results are cached in .ai/cache by file hash, so unchanged versions
+        are not re-validated on later runs.
+        
+        Returns:
+            Combined JSON-serializable report with a per-version entry and a summary
+        """
+        validator = PRDTemplateValidator(str(self.template_path), str(self.ai_dir / "cache"))
+        versions = sorted(self.metadata.versions, key=lambda v: self._version_number(v.version))
+        versions_by_path = {v.file_path: v for v in versions}
+        
+        def read_version(path: str) -> bytes:
+            try:
+                content = self.get_version_content(versions_by_path[path].version)
+            except ValueError as e:
+                # A delta base edited by hand: report this version, keep validating the others
+                raise OSError(str(e)) from e
+            if content is None:
+                raise FileNotFoundError(path)
+            return content.encode('utf-8')
+        
+        outcomes = validator.validate_prd_files(list(versions_by_path), workers=workers, read_file=read_version)
+        
+        entries = []
+        for v in versions:
+            outcome = outcomes[v.file_path]
+            entries.append({
+                "version": v.version,
+                "status": v.status,
+                "file_path": v.file_path,
+                "file_hash": outcome['file_hash'],
+                "cached": outcome['cached'],
+                **outcome['result']
+            })
+        
+        return {
+            "project": self.metadata.project_name,
+            "template_file": str(self.template_path),
+            "validated_at": datetime.now().isoformat(),
+            "summary": {
+                "total": len(entries),
+                "valid": sum(1 for e in entries if e['is_valid']),
+                "invalid": sum(1 for e in entries if not e['is_valid']),
+                "missing": sum(1 for e in entries if e['file_hash'] is None),
+                "cached": sum(1 for e in entries if e['cached'])
+            },
+            "versions": entries
+        }
+    
+    @staticmethod
+    def _version_number(version: str) -> int:
+        match = re.match(r'v(\d+)', version)
+        return int(match.group(1)) if match else 0
+    
     def export_version_report(self) -> Dict:
         """Export comprehensive version report"""
         return {
@@ -430,17 +740,25 @@ def main():
     parser = argparse.ArgumentParser(description="PRD Version Manager")
     parser.add_argument("--project-root", default=".", help="Project root directory")
     parser.add_argument("--template", required=True, help="Path to PRD template file")
-    parser.add_argument("--action", choices=['list', 'create', 'archive', 'validate', 'report'], 
+    parser.add_argument("--action", choices=['list', 'create', 'archive', 'validate', 'report', 'compact',
+                                             'show', 'diff', 'accept-template'], 
                        required=True, help="Action to perform")
     parser.add_argument("--content-file", help="Content file for new version creation")
     parser.add_argument("--source-docs", nargs='+', help="Source documents for version creation")
     parser.add_argument("--version", help="Specific version number")
     parser.add_argument("--status", help="Status for version update")
+    parser.add_argument("--compare-to", help="Version to compare --version against (defaults to the current version)")
+    parser.add_argument("--format", choices=['markdown', 'json'], default='markdown', help="Output format for diff")
+    parser.add_argument("--all-versions", action='store_true', help="Validate every version (with --action validate)")
+    parser.add_argument("--workers", type=int, help="Worker processes for --all-versions")
+    parser.add_argument("--storage-mode", choices=PRDVersionManager.STORAGE_MODES,
+                       help="Keep superseded versions as full files or as compressed deltas "
+                            "(defaults to the project's recorded mode, or full for a new project)")
     
     args = parser.parse_args()
     
     try:
-        manager = PRDVersionManager(args.project_root, args.template)
+        manager = PRDVersionManager(args.project_root, args.template, storage_mode=args.storage_mode)
         
         if args.action == 'list':
             versions = manager.get_version_history()
@@ -465,7 +783,10 @@ def main():
             print(f"Created new PRD version: {filepath}")
         
         elif args.action == 'validate':
-            if args.version:
+            if args.all_versions:
+                report = manager.validate_all_versions(workers=args.workers)
+                print(json.dumps(report, indent=2, ensure_ascii=False))
+            elif args.version:
                 result = manager.validate_version_file(args.version)
                 print(f"Validation results for {args.version}: {result}")
             else:
@@ -478,6 +799,34 @@ def main():
             report = manager.export_version_report()
             print(json.dumps(report, indent=2))
         
+        elif args.action == 'show':
+            version = args.version or manager.metadata.current_version
+            content = manager.get_version_content(version)
+            if content is None:
+                print(f"Error: version {version} not found")
+                return 1
+            print(content, end='')
+        
+        elif args.action == 'diff':
+            if not args.version:
+                print("Error: --version required for diff")
+                return 1
+            
+            prd_diff = manager.diff(args.version, args.compare_to or manager.metadata.current_version)
+            if args.format == 'json':
+                print(json.dumps(asdict(prd_diff), indent=2, ensure_ascii=False))
+            else:
+                print(format_diff_report(prd_diff), end='')
+        
+        elif args.action == 'accept-template':
+            state = manager.accept_template_change()
+            print(f"Template baseline recorded: {state['hash']} (version {state['version']})")
+        
+        elif args.action == 'compact':
+            with manager._metadata_transaction():
+                manager._save_metadata()
+            print(f"Version metadata compacted into {manager.metadata_file}")
+        
         elif args.action == 'archive':
             if not args.version:
                 print("Error: --version required for archiving")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Version Metadata Store
+Append-only, file-locked event log for PRD version metadata with periodic
+compaction into the version_metadata.json snapshot
+"""
+
+import os
+import json
+import uuid
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; locking is skipped there
+    fcntl = None
+
+
+class VersionMetadataStore:
+    """
+    Event-sourced storage for version metadata
+    
+    The snapshot file keeps the existing version_metadata.json format.
+    Every change is appended as one JSON line to an event log next to it,
+    so a write costs O(1) regardless of how many versions exist. Readers
+    rebuild state from the snapshot plus the events appended since.
+    
+    Writers hold an exclusive flock on a lock file while they catch up on
+    other writers' events and append their own, so concurrent agents
+    never lose updates. Once the log holds compact_every events it is
+    folded into a new snapshot and replaced by an empty log; readers
+    notice the new log id and reload the snapshot.
+    """
+    
+    def __init__(self, snapshot_file: Path, compact_every: int = 256):
+        self.snapshot_file = Path(snapshot_file)
+        self.log_file = self.snapshot_file.with_name(self.snapshot_file.stem + ".events.jsonl")
+        self.lock_file = self.snapshot_file.with_name(self.snapshot_file.stem + ".lock")
+        self.compact_every = compact_every
+        self.log_events = 0  # Events in the current log, as of the last read
+        self._loaded = False
+        self._log_id: Optional[str] = None
+        self._log_offset = 0
+        self._lock_depth = 0
+        self._lock_handle = None
+    
+    @contextmanager
+    def locked(self, exclusive: bool = True):
+        """Hold the store lock; re-entrant within a process"""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_handle = open(self.lock_file, 'a+')
+        if fcntl:
+            fcntl.flock(self._lock_handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        self._lock_depth = 1
+        try:
+            yield
+        finally:
+            self._lock_depth = 0
+            if fcntl:
+                fcntl.flock(self._lock_handle, fcntl.LOCK_UN)
+            self._lock_handle.close()
+            self._lock_handle = None
+    
+    def read_changes(self) -> Tuple[bool, Optional[Dict], List[Dict]]:
+        """
+        Read what changed since the previous call
+        
+        Returns:
+            Tuple of (reset, snapshot, events). When reset is True the log
+            was read from the start (first read or after a compaction) and
+            state must be rebuilt from snapshot (None if there is none)
+            followed by events; otherwise events apply to the current state.
+        """
+        events = []
+        try:
+            f = open(self.log_file, 'rb')
+        except FileNotFoundError:
+            f = None
+        
+        with f if f else nullcontext():
+            log_id = self._read_log_id(f) if f else None
+            reset = not self._loaded or log_id != self._log_id
+            snapshot = None
+            if reset:
+                snapshot = self._read_snapshot()
+                self._loaded = True
+                self._log_id = log_id
+                self._log_offset = 0
+                self.log_events = 0
+            
+            # A crash between writing the snapshot and starting a new log leaves
+            # a log whose events the snapshot already contains
+            skip_events = bool(reset and snapshot and log_id and snapshot.get('compacted_log_id') == log_id)
+            
+            if f:
+                f.seek(self._log_offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Torn write from a crashed writer; ignored until completed
+                    # The header line at offset 0 is not an event
+                    if self._log_offset and line.strip() and not skip_events:
+                        events.append(json.loads(line))
+                    self._log_offset += len(line)
+                self.log_events += len(events)
+        
+        return reset, snapshot, events
+    
+    @staticmethod
+    def _read_log_id(f) -> Optional[str]:
+        """Each log starts with a header line naming it, so a replaced log is always detected"""
+        header = f.readline()
+        if not header.endswith(b'\n'):
+            return None
+        return json.loads(header).get('log_id')
+    
+    def _read_snapshot(self) -> Optional[Dict]:
+        if not self.snapshot_file.exists():
+            return None
+        with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def append(self, event: Dict):
+        """Durably append one event; call with the exclusive lock held after read_changes"""
+        if self._log_id is None:
+            self._start_log()
+        
+        line = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.log_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            self._log_offset = f.tell()
+        self.log_events += 1
+    
+    def _start_log(self):
+        """Replace the log with an empty one carrying a fresh identifier"""
+        self._log_id = uuid.uuid4().hex
+        self._atomic_write(self.log_file, json.dumps({'log_id': self._log_id}) + '\n')
+        self._log_offset = self.log_file.stat().st_size
+        self.log_events = 0
+    
+    def needs_compaction(self) -> bool:
+        return self.log_events >= self.compact_every
+    
+    def compact(self, snapshot: Dict):
+        """Write snapshot as the new base state and start an empty log; call with the exclusive lock held"""
+        snapshot = dict(snapshot, compacted_log_id=self._log_id)
+        self._atomic_write(self.snapshot_file, json.dumps(snapshot, indent=2, ensure_ascii=False))
+        self._start_log()
+    
+    @staticmethod
+    def _atomic_write(path: Path, text: str):
+        tmp_file = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark Suite
+Times the ingestion, extraction and classification hot paths on synthetic
+corpora, stores results as a JSON baseline and flags regressions against it
+"""
+
+import os
+import io
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import platform
+import tempfile
+import datetime
+import statistics
+import contextlib
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+UTILITIES_DIR = project_root / 'utilities'
+for module_dir in ('pdf-ingestion-pipeline', 'pdf-to-md-converter', 'prd-template-processor',
+                   'extraction-pipeline', 'validation-scripts', ''):
+    if str(UTILITIES_DIR / module_dir) not in sys.path:
+        sys.path.insert(0, str(UTILITIES_DIR / module_dir))
+
+TEMPLATE_PATH = project_root / 'templates' / 'PRD-template.md'
+BASELINE_FILE = ".ai/benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+# Corpus sizes per scale: PDFs, rows per control CSV, plan operations, PRD paragraphs per section
+SCALES = {
+    'small': {'pdfs': 20, 'csv_rows': 500, 'plan_operations': 50, 'prd_paragraphs': 5},
+    'medium': {'pdfs': 100, 'csv_rows': 5000, 'plan_operations': 250, 'prd_paragraphs': 25},
+    'large': {'pdfs': 500, 'csv_rows': 20000, 'plan_operations': 1000, 'prd_paragraphs': 100},
+}
+
+WORDS = ("data platform security requirement user access control encryption pipeline ingest "
+         "catalog metadata analytics dashboard deployment account network audit policy risk "
+         "stakeholder milestone budget performance latency storage compliance review").split()
+
+
+def random_sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+# --- Synthetic corpus generators ---
+
+def generate_pdf(pdf_path, pages, rng):
+    """
+    Write a small but well-formed PDF with one line of text per page.
+    
+    Args:
+        pdf_path (str): Output path
+        pages (int): Number of pages
+        rng (random.Random): Source of filler text
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for _ in range(pages):
+        text = random_sentence(rng).replace('(', '').replace(')', '')
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    out += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    with open(pdf_path, 'wb') as f:
+        f.write(out)
+
+
+def generate_pdfs(input_dir, count, rng, pages=3):
+    """Write count PDFs spread over a few subdirectories; returns their paths"""
+    paths = []
+    for i in range(count):
+        directory = os.path.join(input_dir, f"group-{i % 5}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"document-{i:05d}.pdf")
+        generate_pdf(path, pages, rng)
+        paths.append(path)
+    return paths
+
+
+def generate_control_csv(csv_path, rows, rng):
+    """Write a security controls CSV shaped like the NIST 800-53 scope analysis export"""
+    families = ['AC', 'AU', 'CM', 'IA', 'SC', 'SI']
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Control Identifier', 'Control (or Control Enhancement) Name', 'Control Type',
+                         'In Scope', 'MVP Requirement and Acceptance Criteria', 'Control Text', 'Discussion',
+                         'Related Controls', 'Security Control Baseline - Low',
+                         'Security Control Baseline - Moderate', 'Security Control Baseline - High'])
+        for i in range(rows):
+            writer.writerow([
+                f"{families[i % len(families)]}-{i + 1}", random_sentence(rng, 4), '',
+                rng.choice(['Yes', 'No', '']), random_sentence(rng, 20) if i % 3 else '',
+                random_sentence(rng, 60), random_sentence(rng, 80), '',
+                'x', rng.choice(['x', '']), 'x'
+            ])
+
+
+def generate_extraction_plan(plan_path, operations, target_dir, rng):
+    """Write an extraction plan in the generator's format with operations safe CREATE/ADD operations"""
+    lines = [
+        f"# {Path(plan_path).stem} Extraction Plan", "",
+        "## Source Document Analysis",
+        "- **Document Type**: Requirements Document",
+        "- **Content Summary**: Synthetic benchmark plan", "",
+        "## Proposed Extractions", "",
+        "### SAFE OPERATIONS (Auto-Approved)",
+        "#### Information Aggregations",
+    ]
+    for i in range(1, operations + 1):
+        target = os.path.join(target_dir, f"extracted-{i % 50:03d}.md")
+        body = '\n   '.join(random_sentence(rng) for _ in range(5))
+        lines += [
+            "",
+            f"{i}. **Target Location**: {target}",
+            f"   **Operation**: {'CREATE' if i <= 50 else 'ADD'}",
+            "   **Content to Add**:",
+            "   ```",
+            f"   {body}",
+            "   ```",
+            "   **Rationale**: Benchmark operation",
+            "   **Dependencies**: None",
+        ]
+    lines += [
+        "", "### REQUIRES USER APPROVAL", "#### Information Modifications", "",
+        "## Execution Summary",
+        f"- **Safe Operations**: {operations} additions/aggregations",
+        "- **Approval Required**: 0 modifications/deletions",
+    ]
+    with open(plan_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def generate_prd(prd_path, template_path, paragraphs, rng):
+    """Write a PRD that follows the template's headings with paragraphs of filler per section"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        headings = [line.rstrip() for line in f if line.startswith('#')]
+    with open(prd_path, 'w', encoding='utf-8') as f:
+        f.write("**Version:** 1.0\n**Status:** Draft\n\n")
+        for heading in headings:
+            f.write(f"{heading}\n\n")
+            for _ in range(paragraphs):
+                f.write(' '.join(random_sentence(rng) for _ in range(4)) + "\n\n")
+
+
+# --- Benchmarks ---
+
+class BenchmarkCorpus:
+    """
+    Synthetic corpus shared by all benchmarks of a run.
+    
+    Everything lives under a temporary work directory, which is also the
+    working directory while benchmarks run, so executors that write to
+    relative .ai/ paths never touch the project.
+    """
+    
+    def __init__(self, work_dir, scale, seed=42):
+        rng = random.Random(seed)
+        self.work_dir = work_dir
+        self.scale = scale
+        # Relative to the work directory, as convert_pdf expects project-relative paths
+        self.input_dir = 'input-documents'
+        self.converted_dir = 'input-documents-converted-to-md'
+        self.pdfs = generate_pdfs(self.input_dir, scale['pdfs'], rng)
+        
+        self.csv_path = os.path.join(work_dir, 'controls.csv')
+        generate_control_csv(self.csv_path, scale['csv_rows'], rng)
+        
+        self.plan_path = os.path.join(work_dir, 'benchmark-extraction-plan.md')
+        self.plan_target_dir = os.path.join(work_dir, 'extracted')
+        generate_extraction_plan(self.plan_path, scale['plan_operations'], self.plan_target_dir, rng)
+        
+        self.prd_path = os.path.join(work_dir, 'prd.md')
+        generate_prd(self.prd_path, TEMPLATE_PATH, scale['prd_paragraphs'], rng)
+        
+        # Existing conversions with several versions each, for version resolution
+        for pdf_path in self.pdfs:
+            relative = Path(pdf_path).relative_to(self.input_dir)
+            target_dir = Path(self.converted_dir) / relative.parent
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for version in range(1, 4):
+                suffix = '' if version == 1 else f"_v{version}"
+                (target_dir / f"{relative.stem}{suffix}.md").write_text(
+                    f"# {relative.stem}\n\n## Overview\n\n{random_sentence(rng, 40)}\n\n"
+                    f"## Details\n\n{random_sentence(rng, 80)}\n", encoding='utf-8'
+                )
+
+
+def bench_conversion(corpus):
+    """In-process PDF conversion backend over every PDF"""
+    from convert_pdf_to_md import convert_pdf_to_markdown
+    output_dir = os.path.join(corpus.work_dir, 'conversion-output')
+    os.makedirs(output_dir, exist_ok=True)
+    
+    def run():
+        for i, pdf_path in enumerate(corpus.pdfs):
+            convert_pdf_to_markdown(pdf_path, os.path.join(output_dir, f"{i}.md"))
+    return run, len(corpus.pdfs)
+
+
+def bench_csv_conversion(corpus):
+    """Security controls CSV to Markdown"""
+    from convert_security_csv import convert_csv_to_markdown
+    output_path = os.path.join(corpus.work_dir, 'controls.md')
+    return (lambda: convert_csv_to_markdown(corpus.csv_path, output_path)), corpus.scale['csv_rows']
+
+
+def bench_version_resolution(corpus):
+    """Next and latest conversion version lookup for every PDF"""
+    from convert_pdf import get_latest_version_path, get_next_version_path
+    
+    def run():
+        for pdf_path in corpus.pdfs:
+            get_latest_version_path(pdf_path, corpus.converted_dir)
+            get_next_version_path(pdf_path, corpus.converted_dir)
+    return run, len(corpus.pdfs)
+
+
+def bench_markdown_validation(corpus):
+    """Conversion quality checks over every converted Markdown file"""
+    from validate_conversion import validate_markdown_file
+    files = sorted(str(path) for path in Path(corpus.converted_dir).rglob('*.md'))
+    
+    def run():
+        for md_path in files:
+            validate_markdown_file(md_path)
+    return run, len(files)
+
+
+def bench_prd_validation(corpus):
+    """Template validation of one large PRD, without the validation cache"""
+    from template_validator import PRDTemplateValidator
+    validator = PRDTemplateValidator(str(TEMPLATE_PATH), cache_dir=None)
+    return (lambda: validator.validate_prd_file(corpus.prd_path)), 1
+
+
+def bench_plan_parsing(corpus):
+    """Parsing a K-operation extraction plan"""
+    from execute_extraction_plan import ExtractionPlanExecutor
+    executor = ExtractionPlanExecutor(corpus.plan_path)
+    return executor.parse_plan_file, corpus.scale['plan_operations']
+
+
+def bench_plan_execution(corpus):
+    """Full execution of a K-operation extraction plan, including backups and the log"""
+    from execute_extraction_plan import ExtractionPlanExecutor
+    
+    def reset():
+        # Each run starts without targets, so ADD operations never grow files across repeats
+        shutil.rmtree(corpus.plan_target_dir, ignore_errors=True)
+        shutil.rmtree(os.path.join('.ai', 'backups'), ignore_errors=True)
+    
+    def run():
+        ExtractionPlanExecutor(corpus.plan_path).execute_plan()
+    return run, corpus.scale['plan_operations'], reset
+
+
+def bench_classification(corpus):
+    """Batch classification of the converted corpus, without the result cache"""
+    from classification_system import PRDTemplateClassificationSystem
+    from document_chunker import iter_corpus_chunks
+    chunks = list(iter_corpus_chunks(corpus.converted_dir))
+    
+    def run():
+        classifier = PRDTemplateClassificationSystem(str(TEMPLATE_PATH), cache_dir=None, use_result_cache=False)
+        classifier.batch_classify_content(chunks)
+    return run, len(chunks)
+
+
+BENCHMARKS = {
+    'conversion': bench_conversion,
+    'csv_conversion': bench_csv_conversion,
+    'version_resolution': bench_version_resolution,
+    'markdown_validation': bench_markdown_validation,
+    'prd_validation': bench_prd_validation,
+    'plan_parsing': bench_plan_parsing,
+    'plan_execution': bench_plan_execution,
+    'classification': bench_classification,
+}
+
+
+def time_benchmark(run, repeat, setup=None):
+    """
+    Time a benchmark, discarding its output.
+    
+    Args:
+        run (callable): The timed workload
+        repeat (int): Timed runs
+        setup (callable): Untimed reset before each run, so repeats measure the same workload
+    
+    Returns:
+        dict: Median and minimum seconds over repeat runs
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return {'median': statistics.median(timings), 'min': min(timings), 'repeat': repeat}
+
+
+def run_benchmarks(scale_name='small', names=None, repeat=3, seed=42):
+    """
+    Build a synthetic corpus and time the selected benchmarks on it.
+    
+    Args:
+        scale_name (str): Key of SCALES
+        names (list): Benchmarks to run, all when None
+        repeat (int): Timed runs per benchmark
+        seed (int): Seed for the corpus generators
+    
+    Returns:
+        dict: Run metadata and per-benchmark results
+    """
+    scale = SCALES[scale_name]
+    results = {}
+    original_cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix='bmad-benchmark-')
+    try:
+        os.chdir(work_dir)
+        corpus = BenchmarkCorpus(work_dir, scale, seed)
+        for name in names or BENCHMARKS:
+            run, items, *setup = BENCHMARKS[name](corpus)
+            result = time_benchmark(run, repeat, *setup)
+            result['items'] = items
+            result['per_item_ms'] = result['median'] / items * 1000 if items else 0.0
+            results[name] = result
+            print(f"  {name:<20} {result['median']:9.4f}s  ({items} items, {result['per_item_ms']:.3f} ms/item)")
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale_name,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare_to_baseline(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare median timings against a baseline run.
+    
+    Args:
+        current (dict): Output of run_benchmarks
+        baseline (dict): Earlier output of run_benchmarks
+        threshold (float): Allowed slowdown, e.g. 0.25 for 25%
+    
+    Returns:
+        list: (name, baseline_seconds, current_seconds, ratio) for each regression
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or previous['median'] <= 0:
+            continue
+        ratio = result['median'] / previous['median']
+        if ratio > 1 + threshold:
+            regressions.append((name, previous['median'], result['median'], ratio))
+    return regressions
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Benchmark the BMAD ingestion, extraction and classification paths')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Synthetic corpus size')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (median is reported)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--output', help='Also write this run as JSON to this path')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help='Slowdown ratio above the baseline that counts as a regression')
+    
+    args = parser.parse_args()
+    
+    print(f"Running benchmarks at scale '{args.scale}' ({args.repeat} runs each)...")
+    current = run_benchmarks(args.scale, args.only, args.repeat)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+    
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    
+    exit_code = 0
+    if baseline and baseline.get('scale') != args.scale:
+        print(f"⚠ Baseline was recorded at scale '{baseline.get('scale')}'; not comparing")
+    elif baseline:
+        regressions = compare_to_baseline(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regressions beyond {args.threshold:.0%} of {args.baseline}:")
+            for name, before, after, ratio in regressions:
+                print(f"  - {name}: {before:.4f}s -> {after:.4f}s ({ratio:.2f}x)")
+            exit_code = 1
+        else:
+            print(f"\n✓ No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    
+    if args.save_baseline:
+        if baseline and baseline.get('scale') == args.scale:
+            # Keep results of benchmarks that were not part of this run
+            current['results'] = {**baseline.get('results', {}), **current['results']}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"✓ Baseline saved: {args.baseline}")
+    
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
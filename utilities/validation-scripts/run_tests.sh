@@ -196,6 +196,19 @@ else
     echo -e "Unit tests: ${YELLOW}NOT FOUND${NC}"
 fi
 
+TOTAL_TESTS=$((TOTAL_TESTS + 1))
+if [ -f "utilities/validation-scripts/test_prd_processor.py" ]; then
+    echo "Running PRD template processor unit tests..."
+    if python3 utilities/validation-scripts/test_prd_processor.py; then
+        echo -e "PRD processor tests: ${GREEN}PASSED${NC}"
+        PASSED_TESTS=$((PASSED_TESTS + 1))
+    else
+        echo -e "PRD processor tests: ${RED}FAILED${NC}"
+    fi
+else
+    echo -e "PRD processor tests: ${YELLOW}NOT FOUND${NC}"
+fi
+
 # Test 9: Sample workflow test (if input files exist)
 print_section "Workflow Tests"
 
@@ -0,0 +1,821 @@
+#!/usr/bin/env python3
+"""
+PRD Template Processor Test Suite
+Tests for classification, validation and versioning of template-based PRDs
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import tempfile
+import shutil
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root and the processor directory to Python path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+processor_dir = os.path.join(project_root, 'utilities', 'prd-template-processor')
+for path in (project_root, processor_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import classification_system
+import instrumentation
+from classification_cache import ClassificationCache
+from classification_system import PRDTemplateClassificationSystem
+from corpus_index import CorpusIndex
+import section_index
+from section_index import get_section
+from document_chunker import chunk_markdown_file, iter_corpus_chunks, iter_markdown_sections
+import near_duplicates
+from near_duplicates import NearDuplicateDetector, is_redundant
+import template_model
+from template_model import load_template_model
+from template_validator import IncrementalPRDValidator, PRDTemplateValidator
+from version_manager import PRDVersionManager
+
+TEMPLATE_PATH = os.path.join(project_root, 'templates', 'PRD-template.md')
+
+
+def sample_content_items():
+    """Small mixed corpus of classifiable and unclassifiable paragraphs"""
+    return [
+        ("The system architecture uses a microservices technology stack with a deployment strategy "
+         "based on containers. Infrastructure and implementation details cover integration points "
+         "with the technology decisions for each architecture layer. " * 3, "architecture.md"),
+        ("Performance requirements and security requirements define scalability targets. "
+         "Compliance standards and availability requirements are non-negotiable for security. " * 3, "nfrs.md"),
+        ("Lunch menu for Friday includes sandwiches and soup.", "misc.md"),
+        ("User personas and user journey maps inform accessibility standards. Each persona has a "
+         "journey through the experience design with UX research findings. " * 3, "ux.md"),
+    ]
+
+
+class ClassificationSystemTests(unittest.TestCase):
+    """Tests for PRDTemplateClassificationSystem"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+        self.classifier = PRDTemplateClassificationSystem(TEMPLATE_PATH, self.cache_dir)
+    
+    def tearDown(self):
+        self.classifier.result_cache.close()
+        shutil.rmtree(self.test_dir)
+    
+    def test_classify_single_item(self):
+        """Test that architecture content maps to the architecture section"""
+        content, source = sample_content_items()[0]
+        result, is_categorized = self.classifier.classify_content(content, source)
+        self.assertTrue(is_categorized)
+        self.assertEqual(result.section_id, 'technical_architecture_implementation')
+    
+    def test_uncategorized_content_recorded(self):
+        """Test that low-confidence content is tracked as uncategorized"""
+        result, is_categorized = self.classifier.classify_content("Lunch menu for Friday.", "misc.md")
+        self.assertFalse(is_categorized)
+        self.assertIsNone(result)
+        self.assertEqual(len(self.classifier.get_uncategorized_content()), 1)
+    
+    @unittest.skipIf(classification_system.np is None, "NumPy not installed")
+    def test_vectorized_scores_match_per_item_scores(self):
+        """Test that batch matrix scoring reproduces the per-item scores exactly"""
+        items = sample_content_items()
+        batch_scores = self.classifier._score_batch([content for content, _ in items])
+        
+        for row, (content, _) in enumerate(items):
+            content_lower = content.lower()
+            expected = [
+                self.classifier._calculate_section_score(content, content_lower, set(), section)
+                for section in self.classifier.sections.values()
+            ]
+            self.assertEqual(batch_scores[row].tolist(), expected)
+    
+    def test_batch_matches_individual_classification(self):
+        """Test that batch classification groups the same results as single calls"""
+        items = sample_content_items()
+        batch_result = self.classifier.batch_classify_content(items)
+        
+        # Without the result cache, so the reference really re-scores every item
+        reference = PRDTemplateClassificationSystem(TEMPLATE_PATH, self.cache_dir, use_result_cache=False)
+        expected = {}
+        for content, source in items:
+            result, is_categorized = reference.classify_content(content, source)
+            if is_categorized:
+                expected.setdefault(result.section_id, []).append(result)
+        
+        self.assertEqual(batch_result, expected)
+        self.assertEqual(
+            len(self.classifier.get_uncategorized_content()),
+            len(reference.get_uncategorized_content())
+        )
+    
+    def test_list_pairs_classified_like_tuples(self):
+        """Test that [content, source_file] lists, as loaded from JSON, are accepted"""
+        items = sample_content_items()
+        expected = self.classifier.batch_classify_content(items)
+        
+        reference = PRDTemplateClassificationSystem(TEMPLATE_PATH, self.cache_dir, use_result_cache=False)
+        self.assertEqual(reference.batch_classify_content(json.loads(json.dumps(items))), expected)
+    
+    def test_uncategorized_content_spilled_to_disk(self):
+        """Test that misses keep compact records in memory and full text on disk"""
+        spill_path = os.path.join(self.test_dir, 'uncategorized.jsonl')
+        classifier = PRDTemplateClassificationSystem(TEMPLATE_PATH, self.cache_dir, uncategorized_spill_path=spill_path)
+        
+        misses = [(f"Lunch menu {i}: soup and a deployment sandwich.", f"menu-{i}.md") for i in range(5)]
+        classifier.batch_classify_content(misses)
+        
+        store = classifier.uncategorized_content
+        self.assertEqual(len(store), 5)
+        self.assertFalse(hasattr(store.records[0], 'content'))
+        self.assertEqual(store.records[2].source_file, 'menu-2.md')
+        self.assertEqual(len(store.records[0].top_scores), classifier.UNCATEGORIZED_TOP_K)
+        self.assertEqual(store[2].content, misses[2][0])
+        self.assertEqual(store[2].attempted_sections, [sid for sid, _ in store.records[2].top_scores])
+        
+        report = classifier.generate_classification_report()
+        self.assertEqual(report['uncategorized_count'], 5)
+        self.assertEqual([item['source_file'] for item in report['uncategorized_items']],
+                         [source for _, source in misses])
+        
+        store.close()
+        with open(spill_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 5)
+        
+        # A closed store reopens its spill file without truncating it
+        self.assertEqual(store[2].content, misses[2][0])
+        classifier.classify_content("Lunch menu 5: more soup.", "menu-5.md")
+        self.assertEqual(store[0].content, misses[0][0])
+        self.assertEqual([item.source_file for item in store][-2:], ['menu-4.md', 'menu-5.md'])
+        store.close()
+        classifier.result_cache.close()
+        with open(spill_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 6)
+    
+    def test_parallel_matches_serial_classification(self):
+        """Test that sharded multi-process classification merges deterministically"""
+        items = sample_content_items() * 5
+        serial = self.classifier.batch_classify_content(items)
+        
+        parallel_classifier = PRDTemplateClassificationSystem(TEMPLATE_PATH, self.cache_dir, use_result_cache=False)
+        parallel = parallel_classifier.parallel_batch_classify_content(iter(items), workers=2, shard_size=3)
+        
+        self.assertEqual(parallel, serial)
+        self.assertEqual(
+            parallel_classifier.get_uncategorized_content(),
+            self.classifier.get_uncategorized_content()
+        )
+
+
+class ClassificationCacheTests(unittest.TestCase):
+    """Tests for the persistent classification result cache"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def test_repeat_run_served_from_cache(self):
+        """Test that a second run reproduces results from the on-disk cache"""
+        items = sample_content_items()
+        first = PRDTemplateClassificationSystem(TEMPLATE_PATH, self.cache_dir)
+        expected = first.batch_classify_content(items)
+        
+        second = PRDTemplateClassificationSystem(TEMPLATE_PATH, self.cache_dir)
+        self.assertEqual(second.batch_classify_content(items), expected)
+        self.assertEqual(second.get_uncategorized_content(), first.get_uncategorized_content())
+        self.assertEqual(second.result_cache.stats()['hits'], len(items))
+        self.assertEqual(second.result_cache.stats()['misses'], 0)
+        first.result_cache.close()
+        second.result_cache.close()
+    
+    def test_least_recently_used_entries_evicted(self):
+        """Test that memory and disk tiers stay within their bounds"""
+        cache = ClassificationCache('model', self.cache_dir, max_memory_entries=2, max_disk_entries=3)
+        for i in range(4):
+            cache.put(cache.key(str(i)), {'result': None, 'scores': [i]})
+        cache.get(cache.key('0'))
+        cache.put(cache.key('4'), {'result': None, 'scores': [4]})
+        cache.flush()
+        
+        self.assertEqual(cache.stats()['memory_entries'], 2)
+        self.assertEqual(cache.stats()['disk_entries'], 3)
+        
+        reopened = ClassificationCache('model', self.cache_dir)
+        self.assertEqual(reopened.get(reopened.key('0')), {'result': None, 'scores': [0]})
+        self.assertIsNone(reopened.get(reopened.key('1')))
+        
+        other_model = ClassificationCache('other-model', self.cache_dir)
+        self.assertIsNone(other_model.get(other_model.key('4')))
+        for opened in (cache, reopened, other_model):
+            opened.close()
+
+
+class TemplateModelTests(unittest.TestCase):
+    """Tests for the compiled, cached template model"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+        self.template = Path(self.test_dir) / 'PRD-template.md'
+        shutil.copy(TEMPLATE_PATH, self.template)
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def test_model_matches_template_structure(self):
+        """Test that structural headings and numbered sections come from the template"""
+        model = load_template_model(str(self.template), self.cache_dir)
+        
+        self.assertEqual(len(model.headings), 19)
+        self.assertEqual(model.headings[0].title, 'MASTER PRD CLASSIFICATION GUIDE')
+        self.assertEqual(len(model.sections), 15)
+        self.assertIn('FedRAMP', model.sections[0].triggers)
+        
+        # Section IDs are public: the classification config still refers to sections by them
+        with open(os.path.join(project_root, '.ai', 'test-classification-config.yaml'), encoding='utf-8') as f:
+            config_ids = re.findall(r'^  (\w+):$', f.read(), re.MULTILINE)
+        self.assertEqual(sorted(s.id for s in model.sections), sorted(config_ids))
+        
+        validator = PRDTemplateValidator(str(self.template), self.cache_dir)
+        classifier = PRDTemplateClassificationSystem(str(self.template), self.cache_dir)
+        self.assertEqual([s.title for s in validator.expected_sections], [h.title for h in model.headings])
+        self.assertEqual(list(classifier.sections), [s.id for s in model.sections])
+    
+    def test_cache_reused_until_template_changes(self):
+        """Test that the serialized model is reused for an unchanged template"""
+        first = load_template_model(str(self.template), self.cache_dir)
+        template_model._loaded_models.clear()
+        
+        # Touching the file without changing content keeps the cached model
+        os.utime(self.template, ns=(1, 1))
+        touched = load_template_model(str(self.template), self.cache_dir)
+        self.assertEqual(touched.model_hash, first.model_hash)
+        
+        with open(self.template, 'a', encoding='utf-8') as f:
+            f.write("\n### 16. NEW SECTION\n**Content Aggregation Focus**: Extra material\n")
+        changed = load_template_model(str(self.template), self.cache_dir)
+        self.assertNotEqual(changed.model_hash, first.model_hash)
+        self.assertEqual(changed.sections[-1].id, 'new_section')
+
+
+class TemplateValidatorTests(unittest.TestCase):
+    """Tests for PRDTemplateValidator"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+        self.validator = PRDTemplateValidator(TEMPLATE_PATH, self.cache_dir)
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def build_prd(self, skip_title=None, extra_title=None):
+        """PRD text with every template heading and three lines of content each"""
+        lines = ["<!-- PRD Version: 1 | Generated: 2025-01-01 | templates/PRD-template.md -->"]
+        for section in self.validator.expected_sections:
+            if section.title == skip_title:
+                continue
+            lines.append('#' * section.level + ' ' + section.title)
+            lines.extend(["Content aggregation focus line.", "Atlas data science detail.", "More detail."])
+        if extra_title:
+            lines.extend([f"## {extra_title}", "Only one line."])
+        return "\n".join(lines) + "\n"
+    
+    def test_structure_checks_from_section_index(self):
+        """Test missing, unexpected and thin sections are all found in one pass"""
+        skipped = self.validator.expected_sections[3].title
+        result = self.validator._perform_validation(self.build_prd(skipped, "EXTRA NOTES"), "prd.md")
+        
+        self.assertEqual(result.missing_sections, [skipped])
+        self.assertEqual(result.extra_sections, ["EXTRA NOTES"])
+        self.assertIn("Section 'EXTRA NOTES' appears to have minimal content", result.warnings)
+        self.assertEqual(result.section_analysis["EXTRA NOTES"]['level'], 2)
+        self.assertFalse(result.section_analysis["EXTRA NOTES"]['expected'])
+    
+    def test_section_metrics_from_byte_offsets(self):
+        """Test per-section length, word, table and list metrics"""
+        content = (
+            "# Übersicht\nZwei Wörter.\n\n"
+            "## Requirements\n| ID | Need |\n|----|:----:|\n| 1 | Fast |\n\n- one\n- two\n1. three\n"
+            "## Empty"
+        )
+        index = self.validator._index_sections(content)
+        raw = content.encode('utf-8')
+        
+        for section in index.sections:
+            heading_line = raw[section.start_offset:section.end_offset].split(b'\n', 1)[0]
+            self.assertEqual(heading_line.decode('utf-8').lstrip('#').strip(), section.title)
+            body = raw[section.start_offset + len(heading_line) + 1:section.end_offset]
+            self.assertEqual(section.content_length, len(body))
+        
+        overview, requirements, empty = index.sections
+        self.assertEqual(overview.word_count, 2)
+        self.assertEqual((requirements.table_count, requirements.list_item_count), (1, 3))
+        self.assertEqual((empty.content_length, empty.end_offset), (0, len(raw)))
+        
+        result = self.validator._perform_validation(content, "prd.md")
+        self.assertEqual(result.section_analysis['Requirements']['content_length'], requirements.content_length)
+    
+    def test_incremental_validation_rescans_changed_sections_only(self):
+        """Test that edits re-scan only their section and match a full validation"""
+        state_file = os.path.join(self.test_dir, 'state.json')
+        prd = self.build_prd(extra_title="EXTRA NOTES")
+        incremental = IncrementalPRDValidator(TEMPLATE_PATH, self.cache_dir, state_file=state_file)
+        incremental._perform_validation(prd, "prd.md")
+        total = incremental.sections_scanned
+        
+        edited = prd.replace("Only one line.", "Only one line.\n- now\n- a list")
+        result = incremental._perform_validation(edited, "prd.md")
+        self.assertEqual((incremental.sections_reused, incremental.sections_scanned), (total - 1, 1))
+        self.assertEqual(result, self.validator._perform_validation(edited, "prd.md"))
+        
+        # Section state survives a restart
+        restarted = IncrementalPRDValidator(TEMPLATE_PATH, self.cache_dir, state_file=state_file)
+        restarted._perform_validation(edited, "prd.md")
+        self.assertEqual(restarted.sections_scanned, 0)
+    
+    def test_compliance_check_reuses_index(self):
+        """Test that a compliance check after validation does not re-index the PRD"""
+        path = Path(self.test_dir) / 'prd-v1.md'
+        path.write_text(self.build_prd(), encoding='utf-8')
+        
+        result = self.validator.validate_prd_file(str(path))
+        self.assertEqual(result.missing_sections, [])
+        index = self.validator._section_index
+        
+        compliance = self.validator.validate_template_compliance(path.read_text(encoding='utf-8'))
+        self.assertIs(self.validator._section_index, index)
+        self.assertTrue(compliance['follows_structure'])
+
+
+class VersionManagerTests(unittest.TestCase):
+    """Tests for PRDVersionManager"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.manager = PRDVersionManager(self.test_dir, TEMPLATE_PATH)
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def create_versions(self, count):
+        template_text = Path(TEMPLATE_PATH).read_text(encoding='utf-8')
+        return [
+            self.manager.create_new_version(template_text + f"\nRevision {i}\n", ["source.md"], "")
+            for i in range(count)
+        ]
+    
+    def test_batch_validation_cached_by_file_hash(self):
+        """Test that all versions are validated and unchanged files come from the cache"""
+        paths = self.create_versions(3)
+        
+        first = self.manager.validate_all_versions(workers=2)
+        self.assertEqual([entry['version'] for entry in first['versions']], ['v1', 'v2', 'v3'])
+        self.assertEqual(first['summary']['total'], 3)
+        self.assertEqual(first['summary']['cached'], 0)
+        
+        with open(paths[1], 'a', encoding='utf-8') as f:
+            f.write("\nEdited\n")
+        second = self.manager.validate_all_versions(workers=1)
+        self.assertEqual([entry['cached'] for entry in second['versions']], [True, False, True])
+        self.assertEqual(second['versions'][0]['score'], first['versions'][0]['score'])
+        self.assertEqual(second['versions'][0]['warnings'], first['versions'][0]['warnings'])
+    
+    def test_batch_validation_reports_missing_files(self):
+        """Test that a version whose file is gone is reported invalid"""
+        paths = self.create_versions(2)
+        os.remove(paths[0])
+        
+        report = self.manager.validate_all_versions(workers=1)
+        self.assertEqual(report['summary']['missing'], 1)
+        self.assertFalse(report['versions'][0]['is_valid'])
+        self.assertIn("PRD file not found", report['versions'][0]['errors'][0])
+    
+    
+    def test_concurrent_managers_do_not_lose_updates(self):
+        """Test that a stale manager catches up before allocating a version"""
+        other = PRDVersionManager(self.test_dir, TEMPLATE_PATH)
+        self.create_versions(1)
+        other_path = other.create_new_version("Other agent", ["other.md"], "")
+        
+        self.assertTrue(other_path.endswith('prd-v2.md'))
+        self.assertTrue(self.manager.update_version_status('v2', 'review'))
+        self.assertTrue(other.update_version_status('v1', 'approved'))
+        
+        reloaded = PRDVersionManager(self.test_dir, TEMPLATE_PATH)
+        self.assertEqual([(v.version, v.status) for v in reloaded.metadata.versions],
+                         [('v1', 'approved'), ('v2', 'review')])
+        self.assertEqual(reloaded.metadata.current_version, 'v2')
+    
+    def test_version_indexes_follow_mutations(self):
+        """Test lookups by number and status and next-version allocation"""
+        self.create_versions(3)
+        self.manager.update_version_status('v2', 'approved')
+        
+        self.assertEqual(self.manager.get_version_by_number('v2').status, 'approved')
+        self.assertIsNone(self.manager.get_version_by_number('v9'))
+        self.assertEqual([v.version for v in self.manager.get_versions_by_status('draft')], ['v1', 'v3'])
+        self.assertEqual([v.version for v in self.manager.get_versions_by_status('approved')], ['v2'])
+        self.assertEqual(self.manager.get_current_version().version, 'v3')
+        self.assertEqual(self.manager._get_next_version(), 'v4')
+        
+        reloaded = PRDVersionManager(self.test_dir, TEMPLATE_PATH)
+        self.assertEqual([v.version for v in reloaded.get_versions_by_status('approved')], ['v2'])
+        self.assertEqual(reloaded._get_next_version(), 'v4')
+    
+    def test_event_log_compacted_into_snapshot(self):
+        """Test that periodic compaction folds the log into version_metadata.json"""
+        self.manager.metadata_store.compact_every = 2
+        self.create_versions(3)
+        
+        with open(self.manager.metadata_file, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        self.assertEqual([v['version'] for v in snapshot['versions']], ['v1', 'v2'])
+        self.assertEqual(self.manager.metadata_store.log_events, 1)
+        
+        reloaded = PRDVersionManager(self.test_dir, TEMPLATE_PATH)
+        self.assertEqual([v.version for v in reloaded.metadata.versions], ['v1', 'v2', 'v3'])
+    
+    def test_delta_storage_reconstructs_every_version(self):
+        """Test that delta mode keeps only the latest file and rebuilds older versions"""
+        self.manager = PRDVersionManager(self.test_dir, TEMPLATE_PATH, storage_mode='delta', snapshot_every=3)
+        paths = self.create_versions(5)
+        
+        self.assertEqual([os.path.exists(p) for p in paths], [False, False, False, False, True])
+        stored = sorted(p.name for p in self.manager.version_store.store_dir.iterdir())
+        self.assertEqual(stored, ['prd-v1.delta.z', 'prd-v2.delta.z', 'prd-v3.full.z', 'prd-v4.delta.z'])
+        
+        for i, path in enumerate(paths):
+            content = self.manager.get_version_content(f"v{i + 1}")
+            self.assertIn(f"PRD Version: v{i + 1}\n", content)
+            self.assertTrue(content.endswith(f"\nRevision {i}\n"))
+        self.assertIsNone(self.manager.get_version_content('v9'))
+        
+        self.assertTrue(self.manager.archive_version('v2'))
+        self.assertEqual(os.listdir(self.manager.archive_dir), [])
+        self.assertEqual(self.manager.validate_version_file('v2')['file_found'], True)
+        report = self.manager.validate_all_versions(workers=1)
+        self.assertEqual(report['summary']['missing'], 0)
+    
+    def test_delta_storage_detects_edited_base(self):
+        """Test that an edited latest file fails reconstruction instead of corrupting older versions"""
+        self.manager = PRDVersionManager(self.test_dir, TEMPLATE_PATH, storage_mode='delta')
+        paths = self.create_versions(2)
+        
+        with open(paths[1], 'r+', encoding='utf-8') as f:
+            lines = f.readlines()
+            lines.insert(3, "Inserted by hand\n")
+            f.seek(0)
+            f.writelines(lines)
+        self.assertRaises(ValueError, self.manager.get_version_content, 'v1')
+        
+        validation = self.manager.validate_version_file('v1')
+        self.assertEqual((validation['exists'], validation['file_found']), (True, False))
+        self.assertIn("Cannot rebuild v1", validation['error'])
+    
+    def test_batch_validation_reports_unrebuildable_version(self):
+        """Test that a version failing delta reconstruction is reported without aborting the batch"""
+        self.manager = PRDVersionManager(self.test_dir, TEMPLATE_PATH, storage_mode='delta')
+        paths = self.create_versions(2)
+        with open(paths[1], 'a', encoding='utf-8') as f:
+            f.write("Appended by hand\n")
+        
+        report = self.manager.validate_all_versions(workers=1)
+        entries = {entry['version']: entry for entry in report['versions']}
+        self.assertEqual(sorted(entries), ['v1', 'v2'])
+        self.assertIsNone(entries['v1']['file_hash'])
+        self.assertFalse(entries['v1']['is_valid'])
+        self.assertIn("Cannot rebuild v1", entries['v1']['errors'][0])
+        self.assertIsNotNone(entries['v2']['file_hash'])
+    
+    def test_storage_mode_recorded_per_project(self):
+        """Test that later managers default to the project's mode and reject a different one"""
+        self.manager = PRDVersionManager(self.test_dir, TEMPLATE_PATH, storage_mode='delta')
+        self.create_versions(1)
+        
+        self.assertEqual(PRDVersionManager(self.test_dir, TEMPLATE_PATH).storage_mode, 'delta')
+        self.assertRaises(ValueError, PRDVersionManager, self.test_dir, TEMPLATE_PATH, storage_mode='full')
+    
+    def test_diff_reports_changed_sections_only(self):
+        """Test that unchanged sections are skipped and changed ones carry line diffs"""
+        base = "# Product\n\n## Goals\n\nShip it.\n\n## Risks\n\nNone.\n\n### Legal\n\nTBD\n"
+        self.manager.create_new_version(base, ["a.md"], "")
+        self.manager.create_new_version(
+            base.replace("None.", "Scope creep.").replace("### Legal\n\nTBD\n", "") + "\n## Timeline\n\nQ3\n",
+            ["a.md"], ""
+        )
+        
+        prd_diff = self.manager.diff('v1', 'v2')
+        changes = {change.path: change for change in prd_diff.changes}
+        self.assertEqual(changes['Product > Risks'].status, 'modified')
+        self.assertIn('+Scope creep.', changes['Product > Risks'].diff)
+        self.assertEqual(changes['Product > Timeline'].status, 'added')
+        self.assertEqual(changes['Product > Risks > Legal'].status, 'removed')
+        self.assertNotIn('Product > Goals', changes)
+        self.assertEqual(prd_diff.summary['unchanged'], 2)
+        self.assertRaises(ValueError, self.manager.diff, 'v1', 'v9')
+    
+    def test_template_integrity_checked_against_stored_hash(self):
+        """Test that template edits are detected and unchanged stats skip the read"""
+        template = Path(self.test_dir) / "PRD-template.md"
+        shutil.copy(TEMPLATE_PATH, template)
+        manager = PRDVersionManager(self.test_dir, str(template))
+        self.assertTrue(manager.validate_template_readonly())
+        version = manager._get_template_version()
+        
+        reloaded = PRDVersionManager(self.test_dir, str(template))
+        with mock.patch('builtins.open', side_effect=AssertionError("template re-read")):
+            self.assertTrue(reloaded.validate_template_readonly())
+            self.assertEqual(reloaded._get_template_version(), version)
+        
+        os.utime(template, ns=(0, 0))
+        self.assertTrue(reloaded.validate_template_readonly())
+        
+        with open(template, 'a', encoding='utf-8') as f:
+            f.write("\n## Unreviewed Section\n")
+        self.assertFalse(reloaded.validate_template_readonly())
+        self.assertRaises(RuntimeError, reloaded.create_new_version, "content", ["a.md"], "")
+        
+        reloaded.accept_template_change()
+        self.assertTrue(PRDVersionManager(self.test_dir, str(template)).validate_template_readonly())
+
+
+class DocumentChunkerTests(unittest.TestCase):
+    """Tests for the streaming Markdown chunker"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def write_markdown(self, name, content):
+        path = Path(self.test_dir) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        return path
+    
+    def test_chunks_split_at_headings_with_byte_offsets(self):
+        """Test that headings start new chunks and offsets map back to the source"""
+        path = self.write_markdown('doc.md', (
+            "# Überblick\n\nIntro paragraph with enough words.\n\n"
+            "## Architecture\n\nThe system architecture section.\n\n"
+            "```\n# not a heading\n```\n"
+        ))
+        chunks = list(chunk_markdown_file(path, target_tokens=50))
+        
+        self.assertEqual([chunk.heading for chunk in chunks], ['Überblick', 'Architecture'])
+        raw = path.read_bytes()
+        for chunk in chunks:
+            self.assertEqual(raw[chunk.start_offset:chunk.end_offset].decode('utf-8').strip(), chunk.content)
+    
+    def test_paragraphs_grouped_to_target_size(self):
+        """Test that paragraphs are grouped until the target token count is reached"""
+        paragraph = " ".join(["word"] * 10)
+        path = self.write_markdown('long.md', "\n\n".join([paragraph] * 10))
+        chunks = list(chunk_markdown_file(path, target_tokens=30))
+        
+        self.assertEqual(len(chunks), 4)
+        self.assertTrue(all(len(chunk.content.split()) >= 30 for chunk in chunks[:-1]))
+    
+    def test_chunks_feed_batch_classification(self):
+        """Test that lazily produced chunks classify with their source offsets"""
+        content, _ = sample_content_items()[0]
+        self.write_markdown('nested/arch.md', "# Architecture\n\n" + content + "\n")
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        classifier = PRDTemplateClassificationSystem(TEMPLATE_PATH, cache_dir)
+        self.addCleanup(classifier.result_cache.close)
+        
+        classified = classifier.batch_classify_content(iter_corpus_chunks(self.test_dir))
+        
+        result = classified['technical_architecture_implementation'][0]
+        self.assertTrue(result.source_file.endswith('arch.md'))
+        self.assertEqual(result.source_offsets[0], 0)
+    
+    def test_sections_carry_heading_paths_and_anchors(self):
+        """Test that sections nest under their headings and offsets cover the file"""
+        path = self.write_markdown('doc.md', (
+            "Preamble\n# Überblick\n\n## Risks\n\nText\n\n```\n# not a heading\n```\n"
+            "# Appendix\n\n## Risks\n\nMore\n"
+        ))
+        sections = list(iter_markdown_sections(path))
+        
+        self.assertEqual([s.heading_path for s in sections],
+                         [(), ('Überblick',), ('Überblick', 'Risks'), ('Appendix',), ('Appendix', 'Risks')])
+        self.assertEqual([s.anchor for s in sections], ['', 'überblick', 'risks', 'appendix', 'risks-1'])
+        raw = path.read_bytes()
+        self.assertEqual(sections[-1].end_offset, len(raw))
+        for section in sections:
+            self.assertEqual(raw[section.start_offset:section.end_offset].decode('utf-8'), section.content)
+
+
+class SectionIndexTests(unittest.TestCase):
+    """Tests for section-anchored retrieval"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+        self.doc = Path(self.test_dir) / 'doc.md'
+        self.doc.write_text(
+            "# Spec\n\nIntro\n\n## Risks\n\nRisk text\n\n### Legal\n\nLegal text\n\n## Timeline\n\nQ3\n",
+            encoding='utf-8'
+        )
+    
+    def tearDown(self):
+        section_index._loaded_indexes.clear()
+        shutil.rmtree(self.test_dir)
+    
+    def test_get_section_by_path_suffix_and_anchor(self):
+        """Test that sections are found by full path, trailing headings or anchor"""
+        risks = get_section(str(self.doc), ('Spec', 'Risks'), cache_dir=self.cache_dir)
+        self.assertEqual(risks, "## Risks\n\nRisk text\n\n### Legal\n\nLegal text\n\n")
+        self.assertEqual(get_section(str(self.doc), 'Risks', include_subsections=False, cache_dir=self.cache_dir),
+                         "## Risks\n\nRisk text\n\n")
+        self.assertEqual(get_section(str(self.doc), '#timeline', cache_dir=self.cache_dir), "## Timeline\n\nQ3\n")
+        self.assertIsNone(get_section(str(self.doc), 'Spec > Budget', cache_dir=self.cache_dir))
+    
+    def test_index_persisted_until_file_changes(self):
+        """Test that a stored index is reused and rebuilt after an edit"""
+        get_section(str(self.doc), 'Legal', cache_dir=self.cache_dir)
+        section_index._loaded_indexes.clear()
+        with mock.patch('section_index._scan_index', side_effect=AssertionError("index rebuilt")):
+            self.assertEqual(get_section(str(self.doc), 'Legal', cache_dir=self.cache_dir), "### Legal\n\nLegal text\n\n")
+        
+        with open(self.doc, 'a', encoding='utf-8') as f:
+            f.write("\n## Budget\n\nTBD\n")
+        self.assertEqual(get_section(str(self.doc), 'Budget', cache_dir=self.cache_dir), "## Budget\n\nTBD\n")
+
+
+class CorpusIndexTests(unittest.TestCase):
+    """Tests for the full-text corpus index"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.corpus_dir = os.path.join(self.test_dir, 'converted')
+        try:
+            self.index = CorpusIndex(os.path.join(self.test_dir, 'cache'))
+        except sqlite3.OperationalError as e:
+            shutil.rmtree(self.test_dir)
+            self.skipTest(f"SQLite FTS5 unavailable: {e}")
+    
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.test_dir)
+    
+    def write_markdown(self, name, content):
+        path = Path(self.corpus_dir) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        return path
+    
+    def test_search_returns_section_offsets(self):
+        """Test that hits point at the matching section of the source file"""
+        path = self.write_markdown('security.md', "# Security\n\n## Encryption\n\nData at rest uses AES.\n\n## Audit\n\nLogs.\n")
+        self.write_markdown('other.md', "# Other\n\nNothing relevant.\n")
+        self.assertEqual(self.index.update(self.corpus_dir), {'indexed': 2, 'unchanged': 0, 'removed': 0})
+        
+        hits = self.index.search('"data at rest"')
+        self.assertEqual([(hit.source_file, hit.anchor) for hit in hits], [(str(path), 'encryption')])
+        section = path.read_bytes()[hits[0].start_offset:hits[0].end_offset].decode('utf-8')
+        self.assertTrue(section.startswith("## Encryption"))
+        self.assertEqual([chunk.heading for chunk in self.index.iter_matching_chunks('AES')], ['Encryption'])
+    
+    def test_update_reindexes_only_changed_files(self):
+        """Test that unchanged or touched files are skipped and removed files dropped"""
+        path = self.write_markdown('a.md', "# A\n\nalpha\n")
+        removed = self.write_markdown('b.md', "# B\n\nbeta\n")
+        self.index.update(self.corpus_dir)
+        
+        os.utime(path, ns=(1, 1))
+        self.assertEqual(self.index.update(self.corpus_dir), {'indexed': 0, 'unchanged': 2, 'removed': 0})
+        
+        path.write_text("# A\n\ngamma\n", encoding='utf-8')
+        os.remove(removed)
+        self.assertEqual(self.index.update(self.corpus_dir), {'indexed': 1, 'unchanged': 0, 'removed': 1})
+        self.assertEqual(self.index.search('alpha OR beta'), [])
+        self.assertEqual(len(self.index.search('gamma')), 1)
+        self.assertEqual(self.index.stats(), {'files': 1, 'sections': 1})
+    
+    def test_relative_and_absolute_paths_share_one_entry(self):
+        """Test that both spellings of a file index once and are pruned together"""
+        path = self.write_markdown('quokka.md', "# Quokka\n\nquokka facts\n")
+        self.assertTrue(self.index.index_file(os.path.relpath(path)))
+        self.assertFalse(self.index.index_file(path.resolve()))
+        self.assertEqual(len(self.index.search('quokka')), 1)
+        
+        os.remove(path)
+        self.assertEqual(self.index.update(os.path.relpath(self.corpus_dir))['removed'], 1)
+        self.assertEqual(self.index.search('quokka'), [])
+        self.assertEqual(self.index.stats(), {'files': 0, 'sections': 0})
+
+
+class NearDuplicateTests(unittest.TestCase):
+    """Tests for MinHash near-duplicate detection"""
+    
+    SHARED = ("The ingest service validates every message against the schema registry, "
+              "enriches records with catalog metadata, and publishes accepted records to the "
+              "dissemination topic while rejected records are written to a quarantine bucket "
+              "for later review by the data stewards.")
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def write_markdown(self, name, content, mtime_ns):
+        path = Path(self.test_dir) / name
+        path.write_text(content, encoding='utf-8')
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return str(path)
+    
+    def test_redundant_sections_keep_newest_copy(self):
+        """Test that a lightly edited section is flagged in the older file only"""
+        old = self.write_markdown('plan_v1.md', f"# Plan\n\n## Ingest\n\n{self.SHARED}\n", 1_000)
+        new = self.write_markdown('plan_v2.md', f"# Plan\n\n## Data Ingest\n\n{self.SHARED} Updated.\n", 2_000)
+        self.write_markdown('other.md', "# Other\n\n## Budget\n\n" + "Costs are tracked per account and reviewed monthly by finance. " * 3, 1_500)
+        
+        detector = NearDuplicateDetector(threshold=0.7)
+        self.assertEqual(detector.add_corpus([self.test_dir]), 3)
+        clusters = detector.clusters()
+        self.assertEqual([[s.source_file for s in group] for group in clusters], [[new, old]])
+        
+        redundant = detector.redundant_sections()
+        self.assertEqual(list(redundant), [old])
+        start = redundant[old][0][0]
+        self.assertTrue(is_redundant(redundant, old, start))
+        self.assertFalse(is_redundant(redundant, new, start))
+    
+    def test_signatures_match_without_numpy(self):
+        """Test that the pure-Python fallback computes the same signatures"""
+        expected = NearDuplicateDetector().signature(self.SHARED)
+        with mock.patch.object(near_duplicates, 'np', None):
+            self.assertEqual(NearDuplicateDetector().signature(self.SHARED), expected)
+        self.assertIsNone(NearDuplicateDetector().signature("too short"))
+
+
+class InstrumentationTests(unittest.TestCase):
+    """Tests for the shared span and counter instrumentation"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.timings_file = os.path.join(self.test_dir, 'timings.jsonl')
+        instrumentation.configure(self.timings_file)
+    
+    def tearDown(self):
+        instrumentation.configure(None)
+        shutil.rmtree(self.test_dir)
+    
+    def read_records(self):
+        instrumentation.get_instrumentation().close()
+        with open(self.timings_file) as f:
+            return [json.loads(line) for line in f]
+    
+    def test_nested_spans_record_parent_counters_and_fields(self):
+        """Test that spans record their parent stage, counters, fields and errors"""
+        @instrumentation.timed('load', document='path')
+        def load(path):
+            instrumentation.count('files')
+            instrumentation.annotate(bytes_read=10)
+        
+        with instrumentation.span('run', 'plan.md'):
+            load('a.md')
+            load(path='b.md')
+        with self.assertRaises(ValueError):
+            with instrumentation.span('fail'):
+                raise ValueError("boom")
+        
+        records = self.read_records()
+        self.assertEqual([(r['stage'], r.get('document'), r.get('parent')) for r in records], [
+            ('load', 'a.md', 'run'), ('load', 'b.md', 'run'), ('run', 'plan.md', None),
+            ('fail', None, None), ('process_counters', None, None)
+        ])
+        self.assertEqual(records[0]['counters'], {'files': 1})
+        self.assertEqual(records[0]['bytes_read'], 10)
+        self.assertEqual(records[3]['status'], 'error')
+        self.assertEqual(records[-1]['counters'], {'files': 2})
+        
+        summary = instrumentation.summarize_timings(self.timings_file)
+        self.assertEqual(summary['stages']['load']['count'], 2)
+        self.assertEqual(summary['stages']['fail']['errors'], 1)
+    
+    def test_disabled_instrumentation_writes_nothing(self):
+        """Test that spans and counters are no-ops until configured"""
+        instrumentation.configure(None)
+        with instrumentation.span('run') as stage:
+            stage.set(ignored=True)
+            instrumentation.count('files')
+        self.assertFalse(os.path.exists(self.timings_file))
+        self.assertEqual(instrumentation.get_instrumentation().counters, {})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
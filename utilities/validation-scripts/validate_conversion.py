@@ -9,6 +9,12 @@ import sys
 import argparse
 from pathlib import Path
 
+UTILITIES_DIR = Path(__file__).resolve().parent.parent
+if str(UTILITIES_DIR) not in sys.path:
+    sys.path.insert(0, str(UTILITIES_DIR))
+from instrumentation import annotate, timed
+
+@timed('validate_markdown', document='md_path')
 def validate_markdown_file(md_path):
     """
     Validate a converted markdown file.
@@ -83,6 +89,7 @@ def validate_markdown_file(md_path):
         results['issues'].append('Encoding issues detected')
     
     results['score'] = score
+    annotate(score=score, markdown_bytes=len(content.encode('utf-8')))
     
     # Consider it invalid if score is too low
     if score < 40: